@@ -1,43 +1,400 @@
 """AirControl - Hand gesture-based mouse control."""
-from typing import Optional
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields
+from contextlib import nullcontext
+from typing import AsyncIterator, ContextManager, Dict, List, Optional
 
 import cv2
 
-from .config import AirControlConfig
-from .core.camera import Camera
-from .core.hand_tracker import HandTracker
+from .config import AirControlConfig, QualityLevel
+from .core.camera import Camera, ResilientCamera
+from .core.governor import QualityGovernor
+from .core.hand_tracker import HandTracker, create_hand_tracker
 from .core.mouse import MouseController
+from .core.resources import ResourceGovernor
+from .core.timing import FrameTimeline
+from .events import Event, EventBuffer, EventTranslator, GestureEvent, GestureState
+from .utils.history import LandmarkHistory
+from .utils.landmarks import landmarks_to_array
+from .ipc import LandmarkPublisher
+from .utils.memprofile import MemoryProfiler
+from .utils.tracing import TraceRecorder
 from .gestures.click import ClickGesture
 from .gestures.drag import DragGesture
-from .utils.coordinates import CoordinateTransformer
+from .gestures.knn import KNNGestureClassifier
+from .gestures.motion import CircleScrollGesture, SwipeGesture
+from .gestures.predictive import PredictiveClick
+from .gestures.rules import GestureRules
+from .utils.config_watcher import ConfigWatcher
+from .utils.coordinates import CoordinateTransformer, RegionTransformer, detect_monitors
+
+logger = logging.getLogger(__name__)
 
 class AirControl:
     """Main class for hand gesture-based mouse control."""
     
-    def __init__(self, config: Optional[AirControlConfig] = None):
+    def __init__(self, config: Optional[AirControlConfig] = None, camera=None):
         """Initialize AirControl.
         
         Args:
             config: Configuration for AirControl components
+            camera: Frame source used instead of opening the configured camera;
+                must provide read_timestamped(), read_frame() and release()
         """
         self.config = config or AirControlConfig()
         
+        # Apply thread counts before the components start their threads
+        self.resources = self._create_resources(self.config)
+        if self.resources:
+            self.resources.start()
+        
         # Initialize components
-        self.camera = Camera(self.config.camera)
-        self.hand_tracker = HandTracker(self.config.hand_tracking)
+        self._owns_camera = camera is None
+        self.camera = camera or self._open_camera(self.config)
+        self.hand_tracker = create_hand_tracker(self.config.hand_tracking)
         self.mouse = MouseController(self.config.mouse)
         
-        # Initialize gestures
-        self.click_gesture = ClickGesture(self.config.mouse.click_threshold)
-        self.drag_gesture = DragGesture(self.config.mouse.fist_detection_threshold)
+        # Propagate per-frame timestamps through the pipeline stages
+        self.timeline = FrameTimeline()
+        self.hand_tracker.timeline = self.timeline
+        self.mouse.timeline = self.timeline
+        self.last_frame = None
+        self.config_watcher = None
+        
+        self._set(self._create_gestures(self.config))
+        self._set(self._create_motion(self.config))
+        self._set(self._create_transformer(self.config, self.mouse))
+        self.hand_tracker.active_region = self.active_region
+        
+        # Initialize adaptive quality governor
+        self.preview_interval = 1
+        self._frame_count = 0
+        self.governor = None
+        self._install_governor(self._create_governor(self.config))
+        
+        self.publisher = None
+        self.memory_profiler = None
+        self.tracer = None
+        self._build_publisher()
+        self._build_memory_profiler()
+        self._build_tracer()
+        
+    def _set(self, attributes: Dict[str, object]) -> None:
+        """Assign created components to their attributes."""
+        for name, value in attributes.items():
+            setattr(self, name, value)
+            
+    def _open_camera(self, config: AirControlConfig):
+        """Open the configured camera, resilient to outages if enabled."""
+        if config.camera.resilient:
+            return ResilientCamera(config.camera)
+        return Camera(config.camera)
+        
+    @staticmethod
+    def _create_resources(config: AirControlConfig) -> Optional[ResourceGovernor]:
+        """Create the resource governor if enabled."""
+        if config.resources.enabled:
+            return ResourceGovernor(config.resources)
+        return None
+            
+    def _stage(self, name: str) -> ContextManager:
+        """Context of a pipeline stage for the resource governor."""
+        return self.resources.stage(name) if self.resources else nullcontext()
+        
+    @staticmethod
+    def _create_gestures(config: AirControlConfig) -> Dict[str, object]:
+        """Create the gesture detectors, raising ValueError for invalid rules or bindings.
+        
+        Returns:
+            The detectors by attribute name
+        """
+        # Compile declarative gesture rules
+        gesture_rules = None
+        if config.gestures.rules:
+            gesture_rules = GestureRules(config.gestures.rules, config.gestures.aspect)
+        for action, rule in config.gestures.bindings.items():
+            if action not in EventTranslator.GESTURES:
+                raise ValueError(f"Unknown gesture action in bindings: {action!r}")
+            if not gesture_rules or rule not in gesture_rules.names:
+                raise ValueError(f"Gesture binding {action!r} refers to unknown rule {rule!r}")
+                
+        # Load the learned gesture classifier
+        gesture_classifier = None
+        if config.gestures.classifier_path:
+            gesture_classifier = KNNGestureClassifier.load(os.path.expanduser(config.gestures.classifier_path))
+        for action, gesture in config.gestures.classifier_bindings.items():
+            if action not in EventTranslator.GESTURES:
+                raise ValueError(f"Unknown gesture action in classifier_bindings: {action!r}")
+            if action in config.gestures.bindings:
+                raise ValueError(f"Gesture action {action!r} is bound to both a rule and the classifier")
+            if not gesture_classifier or gesture not in gesture_classifier.classes:
+                raise ValueError(f"Classifier binding {action!r} refers to unknown gesture {gesture!r}")
+                
+        # Initialize predictive click onset for the left and right click
+        predictive_clicks = None
+        if config.click_prediction.enabled:
+            prediction = config.click_prediction
+            predictive_clicks = tuple(
+                PredictiveClick(config.mouse.click_threshold, prediction.window, prediction.lead,
+                                prediction.cancel_window, prediction.min_confidence, prediction.min_speed)
+                for _ in range(2)
+            )
+        return {
+            "gesture_rules": gesture_rules,
+            "gesture_classifier": gesture_classifier,
+            "click_gesture": ClickGesture(config.mouse.click_threshold),
+            "drag_gesture": DragGesture(config.mouse.fist_detection_threshold),
+            "predictive_clicks": predictive_clicks,
+            "_click_position": None,
+        }
+                
+    @staticmethod
+    def _create_motion(config: AirControlConfig) -> Dict[str, object]:
+        """Create the motion gestures over a history of recent frames.
         
-        # Initialize coordinate transformer
-        screen_width, screen_height = self.mouse.get_screen_dimensions()
-        self.coordinate_transformer = CoordinateTransformer(
-            screen_width,
-            screen_height,
-            self.config.mouse.speed_multiplier
+        Returns:
+            The history and detectors by attribute name
+        """
+        if not config.motion.enabled:
+            return {"landmark_history": None}
+        motion = config.motion
+        return {
+            "landmark_history": LandmarkHistory(motion.window, motion.track_landmark, motion.aspect, motion.min_step),
+            "swipe_gesture": SwipeGesture(motion.swipe_min_distance, motion.swipe_min_straightness),
+            "circle_gesture": CircleScrollGesture(motion.circle_min_turn, motion.circle_step),
+        }
+        
+    @staticmethod
+    def _create_transformer(config: AirControlConfig, mouse: MouseController) -> Dict[str, object]:
+        """Create the coordinate transformer for the mouse's screen.
+        
+        With a calibrated region, the region is mapped onto all monitors
+        and, if enabled, inference is cropped to it.
+        
+        Returns:
+            The transformer and the inference region by attribute name
+        """
+        screen_width, screen_height = mouse.get_screen_dimensions()
+        region = config.region
+        active_region = None
+        if not region.enabled:
+            transformer = CoordinateTransformer(screen_width, screen_height, config.mouse.speed_multiplier)
+        else:
+            monitors = region.monitors or detect_monitors() or [(0, 0, screen_width, screen_height)]
+            transformer = RegionTransformer(region.corners, monitors, region.curve)
+            if region.crop_inference:
+                x0, y0, x1, y1 = transformer.bounds()
+                margin = region.crop_margin * max(x1 - x0, y1 - y0)
+                active_region = (x0 - margin, y0 - margin, x1 + margin, y1 + margin)
+        return {"coordinate_transformer": transformer, "active_region": active_region}
+        
+    @staticmethod
+    def _create_governor(config: AirControlConfig) -> Optional[QualityGovernor]:
+        """Create the adaptive quality governor if enabled.
+        
+        The governor applies no level until _install_governor() connects it.
+        """
+        if config.governor.enabled:
+            return QualityGovernor(config.governor, lambda level: None)
+        return None
+        
+    def _install_governor(self, governor: Optional[QualityGovernor]) -> None:
+        """Put a governor in charge of quality and apply its current level."""
+        self.governor = governor
+        if governor:
+            governor.apply = self.apply_quality
+            self.apply_quality(governor.level)
+            
+    def _build_publisher(self) -> None:
+        """Create the landmark publisher for local subscribers if enabled."""
+        if self.publisher:
+            self.publisher.close()
+        self.publisher = None
+        if self.config.publisher.enabled:
+            self.publisher = LandmarkPublisher(self.config.publisher.path, self.config.publisher.slot_count)
+            
+    def _build_memory_profiler(self) -> None:
+        """Start memory profiling of the pipeline stages if enabled."""
+        if self.memory_profiler:
+            self.memory_profiler.close()
+        self.memory_profiler = None
+        if self.config.memory_profile.enabled:
+            self.memory_profiler = MemoryProfiler(self.config.memory_profile)
+            self.memory_profiler.attach(self.timeline)
+            
+    def _build_tracer(self) -> None:
+        """Start trace export of the pipeline stages if enabled."""
+        if self.tracer:
+            self.tracer.close()
+        self.tracer = None
+        if self.config.tracing.enabled:
+            self.tracer = TraceRecorder(self.config.tracing)
+            self.tracer.attach(self.timeline)
+            
+    def apply_config(self, config: AirControlConfig) -> List[str]:
+        """Apply a new configuration to the running controller.
+        
+        Only components whose configuration changed are rebuilt: the camera
+        and the MediaPipe graph are kept unless their own sections changed,
+        and smoothing changes are applied to the existing mouse controller.
+        
+        All changed components are created before any of them is swapped
+        in, so if any section is invalid or a component cannot be created,
+        nothing is changed. A reconfigured camera is reopened last, after
+        the old one released the device; if that fails, the old camera is
+        reopened. The publisher, memory profiler and tracer own the ring
+        file, tracemalloc and the flush signal, so they are replaced after
+        the swap; one that fails to start is logged and left disabled.
+        
+        Args:
+            config: New configuration
+            
+        Returns:
+            Names of the rebuilt or updated components
+            
+        Raises:
+            Exception: Whatever creating a changed component raised, e.g.
+                ValueError for invalid gesture rules, governor levels,
+                resource stages or region
+        """
+        old = self.config
+        changed = {f.name for f in fields(config) if getattr(config, f.name) != getattr(old, f.name)}
+        mouse_fields = {f.name for f in fields(config.mouse)
+                        if getattr(config.mouse, f.name) != getattr(old.mouse, f.name)}
+        rebuilt: List[str] = []
+        
+        # Create every changed component without touching the running ones
+        updates: Dict[str, object] = {}
+        created: List[object] = []
+        try:
+            if changed & {"gestures", "click_prediction"} or mouse_fields & {"click_threshold", "fist_detection_threshold"}:
+                updates.update(self._create_gestures(config))
+                rebuilt.append("gestures")
+            if "motion" in changed:
+                updates.update(self._create_motion(config))
+                rebuilt.append("motion")
+            if "governor" in changed:
+                updates["governor"] = self._create_governor(config)
+                rebuilt.append("governor")
+            if "resources" in changed:
+                updates["resources"] = self._create_resources(config)
+                rebuilt.append("resources")
+            if "backend" in mouse_fields:
+                updates["mouse"] = MouseController(config.mouse)
+                rebuilt.append("mouse")
+            if mouse_fields & {"backend", "speed_multiplier"} or "region" in changed:
+                updates.update(self._create_transformer(config, updates.get("mouse", self.mouse)))
+                rebuilt.append("coordinates")
+            if "hand_tracking" in changed or ("governor" in changed and not config.governor.enabled):
+                # A disabled governor leaves its last quality level on the tracker
+                updates["hand_tracker"] = create_hand_tracker(config.hand_tracking)
+                created.append(updates["hand_tracker"])
+                rebuilt.append("hand_tracker")
+            if "camera" in changed and self._owns_camera:
+                # The device can only be opened once the old camera let go of it
+                self.camera.release()
+                try:
+                    camera = self._open_camera(config)
+                    # cv2.VideoCapture does not raise for a missing device; a
+                    # resilient camera keeps retrying it in the background
+                    if isinstance(camera, Camera) and not camera.cap.isOpened():
+                        camera.release()
+                        raise RuntimeError(f"Cannot open camera {config.camera.camera_id}")
+                    updates["camera"] = camera
+                except Exception:
+                    self.camera = self._open_camera(old)
+                    raise
+                rebuilt.append("camera")
+        except Exception:
+            for component in created:
+                component.close()
+            raise
+            
+        # Swap the new components in
+        replaced = {name: getattr(self, name, None) for name in updates}
+        self._set(updates)
+        self.config = config
+        if "mouse" in updates:
+            self.mouse.timeline = self.timeline
+        elif mouse_fields:
+            self.mouse.config = config.mouse
+            if "smoothing_factor" in mouse_fields:
+                self.mouse.smoother.smoothing_factor = config.mouse.smoothing_factor
+                rebuilt.append("smoothing")
+        if "hand_tracker" in updates:
+            self.hand_tracker.timeline = self.timeline
+            self.preview_interval = 1
+        self.hand_tracker.active_region = self.active_region
+        if "governor" in updates:
+            self._install_governor(self.governor)
+        elif "hand_tracker" in updates and self.governor:
+            self.apply_quality(self.governor.level)
+            
+        # Release what was replaced
+        if "mouse" in replaced:
+            replaced["mouse"].end_drag()
+        if "hand_tracker" in replaced:
+            replaced["hand_tracker"].close()
+        if "resources" in updates:
+            # Undo the old settings before the new ones take over
+            if replaced["resources"]:
+                replaced["resources"].close()
+            if self.resources:
+                self.resources.start()
+            
+        builders = (
+            ("publisher", self._build_publisher, "publisher"),
+            ("memory_profile", self._build_memory_profiler, "memory_profiler"),
+            ("tracing", self._build_tracer, "tracer"),
         )
+        for section, build, name in builders:
+            if section in changed:
+                try:
+                    build()
+                except Exception:
+                    logger.exception("Cannot start the %s, leaving it disabled", name.replace("_", " "))
+                    setattr(self, name, None)
+                    continue
+                rebuilt.append(name)
+        return rebuilt
+        
+    def watch_config(self, path: str, interval: float = 1.0) -> None:
+        """Reload the configuration whenever a JSON config file changes.
+        
+        The file is checked at the start of each frame, at most every
+        `interval` seconds; changes are applied with apply_config().
+        
+        Args:
+            path: Path to the JSON config file
+            interval: Minimum seconds between file checks
+        """
+        self.config_watcher = ConfigWatcher(path, interval)
+        
+    def _reload_config(self) -> None:
+        """Apply a changed config file, keeping the running components if it fails."""
+        config = self.config_watcher.poll()
+        if config is None:
+            return
+        try:
+            rebuilt = self.apply_config(config)
+        except Exception as e:
+            logger.error("Ignoring config %s that cannot be applied: %s", self.config_watcher.path, e,
+                         exc_info=not isinstance(e, (ValueError, TypeError)))
+            return
+        logger.info("Reloaded %s, rebuilt: %s", self.config_watcher.path, ", ".join(rebuilt) or "nothing")
+            
+    def apply_quality(self, level: QualityLevel) -> None:
+        """Apply a quality level to the tracker and preview.
+        
+        Args:
+            level: Quality level to apply
+        """
+        self.hand_tracker.apply_quality(level)
+        self.preview_interval = max(1, level.preview_interval)
         
     def process_frame(self) -> bool:
         """Process a single frame from the camera.
@@ -45,40 +402,235 @@ class AirControl:
         Returns:
             bool: True if processing should continue, False if should stop
         """
+        if self.config_watcher:
+            self._reload_config()
+            
         # Read frame from camera
-        success, frame = self.camera.read_frame()
+        timing = self.timeline.begin(self._frame_count + 1)
+        with self._stage("capture"):
+            success, frame, timing.capture_time = self.camera.read_timestamped()
         if not success:
-            return False
+            # No frame to time; a resilient camera keeps recovering while it is alive
+            self.timeline.discard()
+            return getattr(self.camera, "alive", False)
+        self.timeline.mark("capture")
+        self._frame_count += 1
             
         # Process frame for hand landmarks
-        hand_landmarks, annotated_frame = self.hand_tracker.process_frame(frame)
+        with self._stage("inference"):
+            hand_landmarks, annotated_frame = self.hand_tracker.process_frame(frame)
+        
+            state = self.detect_gestures(hand_landmarks)
+            self.timeline.mark("gestures")
+        if self.publisher:
+            self.publisher.publish(self._frame_count, hand_landmarks, state)
+            self.timeline.mark("publish")
+        if state:
+            with self._stage("actuation"):
+                self.handle_mouse(state)
         
-        if hand_landmarks:
-            # Get index finger tip coordinates
-            index_tip = hand_landmarks.landmark[self.hand_tracker.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-            screen_x, screen_y = self.coordinate_transformer.landmark_to_screen(index_tip)
+        keep_running = True
+        if self.config.show_preview and self._frame_count % self.preview_interval == 0:
+            # Display frame
+            cv2.imshow('AirControl', annotated_frame)
+        
+            # Check for exit key
+            keep_running = cv2.waitKey(1) & 0xFF != ord('q')
+            self.timeline.mark("display")
             
-            # Detect gestures
-            left_click, right_click = self.click_gesture.detect(hand_landmarks)
-            is_drag = self.drag_gesture.detect(hand_landmarks)
+        if self.governor:
+            # From capture, so frames waiting in the camera count against the budget
+            self.governor.observe((time.perf_counter() - timing.capture_time) * 1000)
             
-            # Handle mouse actions
-            if is_drag:
-                self.mouse.start_drag(screen_x, screen_y)
+        self.last_frame = annotated_frame
+        self.timeline.end()
+        if self.resources:
+            self.resources.end_frame()
+        return keep_running
+        
+    def detect_gestures(self, hand_landmarks) -> Optional[GestureState]:
+        """Derive pointer position and gesture state from hand landmarks.
+        
+        Args:
+            hand_landmarks: Hand landmarks from the tracker, None if no hand
+            
+        Returns:
+            Gesture state for the frame, None if no hand was detected
+        """
+        timestamp = self.timeline.current.glass_time if self.timeline.current else None
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        # Convert once, the history, the rules and the classifier share the array
+        points = None
+        if hand_landmarks and (self.landmark_history is not None or self.gesture_rules
+                               or self.gesture_classifier is not None):
+            points = landmarks_to_array(hand_landmarks)
+        if self.landmark_history is not None:
+            self.landmark_history.push(timestamp, points)
+            
+        if not hand_landmarks:
+            if self.predictive_clicks:
+                for predictor in self.predictive_clicks:
+                    predictor.reset()
+                self._click_position = None
+            return None
+            
+        # Get index finger tip coordinates
+        index_tip = hand_landmarks.landmark[self.hand_tracker.mp_hands.HandLandmark.INDEX_FINGER_TIP]
+        screen_x, screen_y = self.coordinate_transformer.landmark_to_screen(index_tip)
+        
+        # Detect gestures
+        if self.predictive_clicks:
+            left_click, right_click = (
+                predictor.update(timestamp, distance)
+                for predictor, distance in zip(self.predictive_clicks, self.click_gesture.distances(hand_landmarks))
+            )
+            # Hold the cursor still from click onset until release
+            if any(predictor.locked for predictor in self.predictive_clicks):
+                if self._click_position is None:
+                    self._click_position = (screen_x, screen_y)
+                screen_x, screen_y = self._click_position
             else:
-                self.mouse.end_drag()
-                self.mouse.move(screen_x, screen_y)
+                self._click_position = None
+        else:
+            left_click, right_click = self.click_gesture.detect(hand_landmarks)
+        is_drag = self.drag_gesture.detect(hand_landmarks)
+        
+        # Evaluate declarative rules, bound rules replace built-in detectors
+        active_rules = frozenset()
+        if self.gesture_rules:
+            results = self.gesture_rules.detect(points)
+            active_rules = frozenset(name for name, active in results.items() if active)
+            bindings = self.config.gestures.bindings
+            if "left_click" in bindings:
+                left_click = results[bindings["left_click"]]
+            if "right_click" in bindings:
+                right_click = results[bindings["right_click"]]
+            if "drag" in bindings:
+                is_drag = results[bindings["drag"]]
+                
+        # Classify the pose, bound classes replace built-in detectors
+        if self.gesture_classifier is not None:
+            label = self.gesture_classifier.predict(points)
+            bindings = self.config.gestures.classifier_bindings
+            if "left_click" in bindings:
+                left_click = label == bindings["left_click"]
+            if "right_click" in bindings:
+                right_click = label == bindings["right_click"]
+            if "drag" in bindings:
+                is_drag = label == bindings["drag"]
                 
-                if left_click:
-                    self.mouse.click()
-                elif right_click:
-                    self.mouse.click(right=True)
+        # Motion gestures
+        swipe, scroll = None, 0
+        if self.landmark_history is not None:
+            swipe = self.swipe_gesture.detect(self.landmark_history)
+            scroll = self.circle_gesture.detect(self.landmark_history)
+        return GestureState(screen_x, screen_y, left_click, right_click, is_drag, active_rules, swipe, scroll)
         
-        # Display frame
-        cv2.imshow('AirControl', annotated_frame)
+    def handle_mouse(self, state: GestureState) -> None:
+        """Perform the mouse actions for a frame's gesture state.
+        
+        Args:
+            state: Gesture state from detect_gestures
+        """
+        if state.drag:
+            self.mouse.start_drag(state.screen_x, state.screen_y)
+        else:
+            self.mouse.end_drag()
+            self.mouse.move(state.screen_x, state.screen_y)
+            
+            if state.left_click:
+                self.mouse.click()
+            elif state.right_click:
+                self.mouse.click(right=True)
+            if state.scroll:
+                self.mouse.scroll(state.scroll)
+                
+    async def events(self) -> AsyncIterator[Event]:
+        """Stream timestamped landmark, pointer and gesture events.
         
-        # Check for exit key
-        return cv2.waitKey(1) & 0xFF != ord('q')
+        Capture and inference run in dedicated executor threads, with the
+        next frame captured while the current one is being processed.
+        Events are buffered according to `config.events`; the mouse is only
+        driven when `config.events.actuate_mouse` is set. Leaving the loop
+        stops the pipeline once the frame in flight is done, call cleanup()
+        afterwards to release the camera.
+        
+        Usage:
+            async for event in controller.events():
+                if isinstance(event, GestureEvent) and event.pressed:
+                    ...
+                    
+        Yields:
+            LandmarksEvent, PointerEvent and GestureEvent instances
+        """
+        loop = asyncio.get_running_loop()
+        buffer = EventBuffer(self.config.events.max_queue_size, self.config.events.overflow)
+        translator = EventTranslator()
+        capture_executor = ThreadPoolExecutor(1, thread_name_prefix="aircontrol-capture")
+        inference_executor = ThreadPoolExecutor(1, thread_name_prefix="aircontrol-inference")
+        
+        def read():
+            with self._stage("capture"):
+                return self.camera.read_timestamped()
+                
+        def process(frame, timestamp: float, frame_id: int) -> List[Event]:
+            self.timeline.begin(frame_id, timestamp)
+            with self._stage("inference"):
+                hand_landmarks, _ = self.hand_tracker.process_frame(frame)
+                state = self.detect_gestures(hand_landmarks)
+                self.timeline.mark("gestures")
+            if self.publisher:
+                self.publisher.publish(frame_id, hand_landmarks, state)
+                self.timeline.mark("publish")
+            if state and self.config.events.actuate_mouse:
+                with self._stage("actuation"):
+                    self.handle_mouse(state)
+            self.timeline.end()
+            if self.resources:
+                self.resources.end_frame()
+            return translator.translate(hand_landmarks, state, timestamp, frame_id)
+            
+        async def produce() -> None:
+            try:
+                pending_read = loop.run_in_executor(capture_executor, read)
+                while True:
+                    success, frame, timestamp = await pending_read
+                    if not success:
+                        if not getattr(self.camera, "alive", False):
+                            break
+                        pending_read = loop.run_in_executor(capture_executor, read)
+                        continue
+                    if self.config_watcher:
+                        # Nothing is in flight between a read and the next one
+                        await loop.run_in_executor(inference_executor, self._reload_config)
+                    self._frame_count += 1
+                    pending_read = loop.run_in_executor(capture_executor, read)
+                    
+                    for event in await loop.run_in_executor(
+                            inference_executor, process, frame, timestamp, self._frame_count):
+                        await buffer.put(event)
+            finally:
+                await buffer.put(None)
+                
+        producer = asyncio.ensure_future(produce())
+        try:
+            while True:
+                event = await buffer.get()
+                if event is None:
+                    break
+                yield event
+            await producer
+        finally:
+            producer.cancel()
+            
+            def shutdown() -> None:
+                capture_executor.shutdown(wait=True)
+                inference_executor.shutdown(wait=True)
+                
+            # A read or frame still in flight must finish before cleanup()
+            # can release the camera and tracker it uses
+            await loop.run_in_executor(None, shutdown)
         
     def run(self) -> None:
         """Run the main processing loop."""
@@ -91,4 +643,18 @@ class AirControl:
     def cleanup(self) -> None:
         """Clean up resources."""
         self.camera.release()
-        cv2.destroyAllWindows()
+        self.hand_tracker.close()
+        if self.publisher:
+            self.publisher.close()
+        if self.memory_profiler:
+            self.memory_profiler.snapshot()
+            self.memory_profiler.close()
+            self.memory_profiler = None
+        if self.tracer:
+            self.tracer.close()
+            self.tracer = None
+        if self.resources:
+            self.resources.log_report()
+            self.resources.close()
+        if self.config.show_preview:
+            cv2.destroyAllWindows()
@@ -1,6 +1,7 @@
 """Configuration management for AirControl."""
-from dataclasses import dataclass
-from typing import Optional
+import json
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional
 
 @dataclass
 class HandTrackingConfig:
@@ -9,6 +10,24 @@ class HandTrackingConfig:
     max_num_hands: int = 1
     min_detection_confidence: float = 0.65
     min_tracking_confidence: float = 0.65
+    model_complexity: int = 1
+    inference_scale: float = 1.0
+    roi_padding: Optional[float] = None
+    detection_interval: int = 1
+    optical_flow: bool = False
+    flow_window_size: int = 21
+    flow_pyramid_levels: int = 3
+    flow_max_fb_error: float = 1.5
+    flow_min_tracked_fraction: float = 0.8
+    # Handedness score below which a detection is not propagated with flow,
+    # a heuristic for uncertain detections as the presence score is not exposed
+    redetect_confidence: float = 0.8
+    backend: str = "solutions"
+    model_asset_path: Optional[str] = None
+    synthetic_frames: int = 3000
+    synthetic_seed: Optional[int] = None
+    # Simulated inference time of the synthetic backend at full quality
+    synthetic_latency_ms: float = 0.0
 
 @dataclass
 class MouseConfig:
@@ -17,18 +36,277 @@ class MouseConfig:
     speed_multiplier: float = 1.5
     click_threshold: float = 0.025
     fist_detection_threshold: float = 0.6
+    backend: str = "pyautogui"
+
+@dataclass
+class CaptureMode:
+    """Capture format requested from or granted by a camera driver.
+    
+    `fourcc` is a four-character pixel format code such as "MJPG" or
+    "YUYV"; fields left as None keep the driver's choice.
+    """
+    width: Optional[int] = None
+    height: Optional[int] = None
+    fps: Optional[float] = None
+    fourcc: Optional[str] = None
+
+def default_capture_modes() -> List[CaptureMode]:
+    """Return the modes tried when probing, preferred modes first."""
+    return [
+        CaptureMode(1280, 720, 60, "MJPG"),
+        CaptureMode(1280, 720, 30, "MJPG"),
+        CaptureMode(1280, 720, 30, "YUYV"),
+        CaptureMode(640, 480, 60, "MJPG"),
+        CaptureMode(640, 480, 30, "MJPG"),
+        CaptureMode(640, 480, 30, "YUYV"),
+    ]
 
 @dataclass
 class CameraConfig:
-    """Configuration for camera parameters."""
+    """Configuration for camera parameters.
+    
+    With `probe` enabled, the candidate `probe_modes` are measured and the
+    fastest one that delivers `min_fps` at `min_width` x `min_height` is
+    used; the choice is cached per device in `probe_cache_path`.
+    
+    With `resilient` enabled, frames are read on a background thread that
+    reopens the device with exponential backoff after read failures or
+    when no frame arrives for `stall_timeout` seconds. The controller
+    stops only after an outage longer than `max_outage` seconds.
+    """
     camera_id: int = 0
     width: Optional[int] = None
     height: Optional[int] = None
     fps: Optional[int] = None
+    use_driver_timestamps: bool = False
+    fourcc: Optional[str] = None
+    buffer_size: Optional[int] = None
+    probe: bool = False
+    probe_modes: List[CaptureMode] = field(default_factory=default_capture_modes)
+    probe_frames: int = 30
+    min_fps: Optional[float] = None
+    min_width: Optional[int] = None
+    min_height: Optional[int] = None
+    probe_cache_path: Optional[str] = "~/.cache/air_control/camera_modes.json"
+    resilient: bool = False
+    stall_timeout: float = 1.0
+    reopen_backoff: float = 0.05
+    reopen_backoff_max: float = 2.0
+    max_outage: Optional[float] = None
+    
+    def __post_init__(self):
+        # Modes loaded from JSON arrive as dicts
+        self.probe_modes = [CaptureMode(**mode) if isinstance(mode, dict) else mode for mode in self.probe_modes]
+
+@dataclass
+class QualityLevel:
+    """A single step on the quality ladder used by the governor.
+    
+    Levels are ordered from highest quality (index 0) to cheapest.
+    """
+    inference_scale: float = 1.0
+    model_complexity: int = 1
+    roi_padding: Optional[float] = None
+    preview_interval: int = 1
+    detection_interval: int = 1
+
+def default_quality_levels() -> List[QualityLevel]:
+    """Return the default quality ladder, best quality first."""
+    return [
+        QualityLevel(),
+        QualityLevel(inference_scale=0.75),
+        QualityLevel(inference_scale=0.75, model_complexity=0, roi_padding=0.5, preview_interval=2),
+        QualityLevel(inference_scale=0.5, model_complexity=0, roi_padding=0.35, preview_interval=2,
+                     detection_interval=2),
+        QualityLevel(inference_scale=0.5, model_complexity=0, roi_padding=0.25, preview_interval=4,
+                     detection_interval=3),
+    ]
+
+@dataclass
+class GovernorConfig:
+    """Configuration for the adaptive quality governor."""
+    enabled: bool = False
+    latency_budget_ms: float = 33.0
+    degrade_ratio: float = 1.0
+    upgrade_ratio: float = 0.7
+    degrade_frames: int = 10
+    upgrade_frames: int = 90
+    cooldown_frames: int = 30
+    smoothing: float = 0.2
+    initial_level: int = 0
+    levels: List[QualityLevel] = field(default_factory=default_quality_levels)
+
+    def __post_init__(self):
+        # Levels loaded from JSON arrive as dicts
+        self.levels = [QualityLevel(**level) if isinstance(level, dict) else level for level in self.levels]
+
+@dataclass
+class EventStreamConfig:
+    """Configuration for the asynchronous event stream."""
+    max_queue_size: int = 64
+    overflow: str = "drop_oldest"
+    actuate_mouse: bool = False
+
+@dataclass
+class PublisherConfig:
+    """Configuration for publishing landmarks to local subscribers."""
+    enabled: bool = False
+    path: Optional[str] = None
+    slot_count: int = 16
+
+@dataclass
+class MemoryProfileConfig:
+    """Configuration for allocation and memory profiling."""
+    enabled: bool = False
+    traceback_depth: int = 1
+    snapshot_interval: float = 300.0
+    top_n: int = 10
+    group_by: str = "lineno"
+    max_reports: int = 100
+    output_path: Optional[str] = None
+
+@dataclass
+class TracingConfig:
+    """Configuration for Chrome trace-event export of pipeline spans."""
+    enabled: bool = False
+    buffer_size: int = 100000
+    output_path: str = "air_control-trace-{pid}-{time}.json"
+    flush_signal: Optional[str] = "SIGUSR1"
+    flush_at_exit: bool = True
+
+@dataclass
+class GestureConfig:
+    """Configuration for declarative and learned gestures.
+    
+    `rules` maps gesture names to rule definitions (see gestures/rules.py).
+    `bindings` maps the actions "left_click", "right_click" and "drag" to a
+    rule that replaces the built-in detector for that action.
+    `classifier_path` is a k-NN model saved by tools/train_gestures.py, and
+    `classifier_bindings` maps actions to the trained class that triggers
+    them in the same way.
+    """
+    rules: Dict[str, Any] = field(default_factory=dict)
+    bindings: Dict[str, str] = field(default_factory=dict)
+    aspect: float = 4 / 3
+    classifier_path: Optional[str] = None
+    classifier_bindings: Dict[str, str] = field(default_factory=dict)
+
+@dataclass
+class MotionConfig:
+    """Configuration for motion gestures (swipes and circle scrolling).
+    
+    Distances are in palm sizes for swipes and in normalized image units
+    for `min_step`; angles are in radians.
+    """
+    enabled: bool = False
+    window: int = 15
+    track_landmark: int = 9
+    min_step: float = 0.005
+    swipe_min_distance: float = 1.5
+    swipe_min_straightness: float = 0.8
+    circle_min_turn: float = 2.5
+    circle_step: float = 0.785
+    aspect: float = 4 / 3
+
+@dataclass
+class ClickPredictionConfig:
+    """Configuration for predictive click onset (see gestures/predictive.py)."""
+    enabled: bool = False
+    window: int = 4
+    lead: float = 0.033
+    cancel_window: float = 0.1
+    min_confidence: float = 0.9
+    min_speed: float = 0.1
+
+@dataclass
+class ResourceConfig:
+    """Configuration for CPU resources used by the pipeline stages.
+    
+    `stage_affinity` maps the stages "capture", "inference" and
+    "actuation" to the CPU cores they may run on, `stage_nice` to their
+    scheduling niceness. `cpu_limit` caps the average CPU use of the
+    process in cores by throttling the frame rate.
+    """
+    enabled: bool = False
+    opencv_threads: Optional[int] = None
+    stage_affinity: Dict[str, List[int]] = field(default_factory=dict)
+    stage_nice: Dict[str, int] = field(default_factory=dict)
+    cpu_limit: Optional[float] = None
+    report_interval: float = 30.0
+
+@dataclass
+class RegionConfig:
+    """Configuration for the calibrated active region (see tools/calibrate.py).
+    
+    `corners` are the top-left, top-right, bottom-right and bottom-left
+    corners of the reachable zone in normalized image coordinates; that
+    zone is mapped onto the whole virtual desktop. `curve` holds response
+    curve values at evenly spaced inputs (empty for linear). `monitors`
+    lists [x, y, width, height] per monitor; empty to detect them. With
+    `crop_inference`, the hand tracker runs inference only on the region
+    widened by `crop_margin`, unless `roi_padding` is narrowing it to the
+    hand it follows.
+    """
+    enabled: bool = False
+    corners: List[List[float]] = field(default_factory=lambda: [[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0]])
+    curve: List[float] = field(default_factory=list)
+    monitors: List[List[int]] = field(default_factory=list)
+    crop_inference: bool = False
+    crop_margin: float = 0.15
 
 @dataclass
 class AirControlConfig:
     """Main configuration class for AirControl."""
-    hand_tracking: HandTrackingConfig = HandTrackingConfig()
-    mouse: MouseConfig = MouseConfig()
-    camera: CameraConfig = CameraConfig()
+    hand_tracking: HandTrackingConfig = field(default_factory=HandTrackingConfig)
+    mouse: MouseConfig = field(default_factory=MouseConfig)
+    camera: CameraConfig = field(default_factory=CameraConfig)
+    governor: GovernorConfig = field(default_factory=GovernorConfig)
+    events: EventStreamConfig = field(default_factory=EventStreamConfig)
+    publisher: PublisherConfig = field(default_factory=PublisherConfig)
+    memory_profile: MemoryProfileConfig = field(default_factory=MemoryProfileConfig)
+    tracing: TracingConfig = field(default_factory=TracingConfig)
+    gestures: GestureConfig = field(default_factory=GestureConfig)
+    motion: MotionConfig = field(default_factory=MotionConfig)
+    click_prediction: ClickPredictionConfig = field(default_factory=ClickPredictionConfig)
+    resources: ResourceConfig = field(default_factory=ResourceConfig)
+    region: RegionConfig = field(default_factory=RegionConfig)
+    show_preview: bool = True
+
+def config_from_dict(data: Dict[str, Any]) -> AirControlConfig:
+    """Build a configuration from parsed JSON.
+    
+    Each section ("mouse", "camera", "hand_tracking", ...) is optional;
+    missing sections and fields keep their defaults.
+    
+    Args:
+        data: Dictionary of configuration sections
+        
+    Returns:
+        AirControlConfig object
+        
+    Raises:
+        ValueError: If a section is unknown
+        TypeError: If a section contains an unknown field
+    """
+    config = AirControlConfig()
+    sections = {f.name: f for f in fields(AirControlConfig)}
+    for name, value in data.items():
+        if name not in sections:
+            raise ValueError(f"Unknown configuration section: {name!r}")
+        section_type = sections[name].default_factory
+        if isinstance(section_type, type) and isinstance(value, dict):
+            value = section_type(**value)
+        setattr(config, name, value)
+    return config
+
+def load_config(path: str) -> AirControlConfig:
+    """Load a configuration from a JSON file.
+    
+    Args:
+        path: Path to the JSON config file
+        
+    Returns:
+        AirControlConfig object
+    """
+    with open(path, 'r') as f:
+        return config_from_dict(json.load(f))
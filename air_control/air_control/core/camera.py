@@ -1,29 +1,274 @@
 """Camera handling functionality."""
-from typing import Optional, Tuple
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
 
-from ..config import CameraConfig
+from ..config import CameraConfig, CaptureMode
+
+logger = logging.getLogger(__name__)
+
+def encode_fourcc(code: str) -> int:
+    """Convert a four-character code such as "MJPG" to OpenCV's integer form."""
+    return cv2.VideoWriter_fourcc(*code.ljust(4)[:4])
+
+def decode_fourcc(value: float) -> Optional[str]:
+    """Convert OpenCV's integer FOURCC to its four characters, None if unset."""
+    value = int(value)
+    if value <= 0:
+        return None
+    return value.to_bytes(4, "little").decode("ascii", errors="replace").rstrip("\x00 ")
+
+@dataclass
+class ProbeResult:
+    """Measured behaviour of one capture mode."""
+    requested: CaptureMode
+    granted: CaptureMode
+    fps: float
+    read_ms: float
+    read_p95_ms: float
+    frames: int
+
+def apply_mode(cap, mode: CaptureMode, buffer_size: Optional[int] = None) -> CaptureMode:
+    """Request a capture mode and report what the driver granted.
+    
+    The FOURCC is set before the resolution, as many drivers only offer
+    high resolutions and frame rates in compressed formats.
+    
+    Args:
+        cap: cv2.VideoCapture or a compatible object
+        mode: Mode to request
+        buffer_size: Number of frames the driver may queue, None to keep
+            the driver's default
+            
+    Returns:
+        The granted mode
+    """
+    if mode.fourcc:
+        cap.set(cv2.CAP_PROP_FOURCC, encode_fourcc(mode.fourcc))
+    if mode.width:
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, mode.width)
+    if mode.height:
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, mode.height)
+    if mode.fps:
+        cap.set(cv2.CAP_PROP_FPS, mode.fps)
+    if buffer_size:
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+    return granted_mode(cap)
+
+def granted_mode(cap) -> CaptureMode:
+    """Read the mode a capture is currently delivering."""
+    return CaptureMode(
+        int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or None,
+        int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or None,
+        cap.get(cv2.CAP_PROP_FPS) or None,
+        decode_fourcc(cap.get(cv2.CAP_PROP_FOURCC)),
+    )
+
+def measure_mode(cap, frames: int = 30, warmup: int = 5) -> Tuple[float, float, float, int]:
+    """Measure delivered frame rate and read latency of the current mode.
+    
+    Args:
+        cap: Opened capture
+        frames: Number of frames to time
+        warmup: Frames read and discarded first, while the driver settles
+        
+    Returns:
+        Tuple of delivered frames per second, mean and 95th percentile read
+        time in milliseconds, and the number of frames read
+    """
+    for _ in range(warmup):
+        if not cap.read()[0]:
+            return 0.0, 0.0, 0.0, 0
+            
+    stamps = np.empty(frames + 1)
+    stamps[0] = time.perf_counter()
+    count = 0
+    for count in range(1, frames + 1):
+        success, _ = cap.read()
+        stamps[count] = time.perf_counter()
+        if not success:
+            count -= 1
+            break
+    if count < 2:
+        return 0.0, 0.0, 0.0, count
+    reads = np.diff(stamps[:count + 1]) * 1000
+    # The first read may return a frame already queued, so the rate is
+    # measured between the ends of the reads
+    fps = (count - 1) / (stamps[count] - stamps[1])
+    return float(fps), float(reads.mean()), float(np.percentile(reads, 95)), count
+
+def probe_modes(cap, modes: List[CaptureMode], frames: int = 30,
+                buffer_size: Optional[int] = None) -> List[ProbeResult]:
+    """Apply each candidate mode and measure what it delivers.
+    
+    Args:
+        cap: Opened capture
+        modes: Candidate modes
+        frames: Frames timed per mode
+        buffer_size: Driver queue length applied with every mode
+        
+    Returns:
+        One result per candidate, in candidate order
+    """
+    results = []
+    for mode in modes:
+        granted = apply_mode(cap, mode, buffer_size)
+        fps, read_ms, read_p95_ms, count = measure_mode(cap, frames)
+        results.append(ProbeResult(mode, granted, fps, read_ms, read_p95_ms, count))
+        logger.debug("Probed %s: granted %s, %.1f fps, %.1f ms per read", mode, granted, fps, read_ms)
+    return results
+
+def select_mode(results: List[ProbeResult], min_fps: Optional[float] = None,
+                min_width: Optional[int] = None, min_height: Optional[int] = None) -> Optional[ProbeResult]:
+    """Pick the fastest mode that meets the requirements.
+    
+    Modes are ranked by delivered frame rate, then by resolution, then by
+    read latency. When no mode meets the requirements, the fastest mode
+    is returned anyway.
+    
+    Args:
+        results: Probe results
+        min_fps: Minimum delivered frames per second
+        min_width: Minimum granted width
+        min_height: Minimum granted height
+        
+    Returns:
+        The chosen result, None if no mode delivered frames
+    """
+    working = [r for r in results if r.frames >= 2]
+    if not working:
+        return None
+        
+    def meets(result: ProbeResult) -> bool:
+        return ((min_fps is None or result.fps >= min_fps)
+                and (min_width is None or (result.granted.width or 0) >= min_width)
+                and (min_height is None or (result.granted.height or 0) >= min_height))
+        
+    def rank(result: ProbeResult):
+        # Frame rates within 5% count as equal, probing is not more precise
+        return (round(np.log(result.fps) / np.log(1.05)),
+                (result.granted.width or 0) * (result.granted.height or 0),
+                -result.read_ms)
+        
+    candidates = [r for r in working if meets(r)]
+    if not candidates:
+        logger.warning("No capture mode meets the requirements, using the fastest one")
+        candidates = working
+    return max(candidates, key=rank)
 
 class Camera:
     """Handles video capture and frame processing."""
     
-    def __init__(self, config: CameraConfig):
+    def __init__(self, config: CameraConfig, capture_factory: Callable = cv2.VideoCapture):
         """Initialize the camera.
         
         Args:
             config: Configuration for camera settings
+            capture_factory: Callable opening a capture for a camera id;
+                cv2.VideoCapture, or a fake backend for testing
         """
         self.config = config
-        self.cap = cv2.VideoCapture(config.camera_id)
+        self.cap = capture_factory(config.camera_id)
+        self.probe_results: List[ProbeResult] = []
+        
+        if config.probe:
+            self.mode = self.negotiate()
+        else:
+            requested = CaptureMode(config.width, config.height, config.fps, config.fourcc)
+            self.mode = apply_mode(self.cap, requested, config.buffer_size)
+            self._check_granted(requested, self.mode)
+            
+    def _cache_key(self) -> str:
+        """Identify the device and the probing request in the mode cache."""
+        try:
+            backend = self.cap.getBackendName()
+        except Exception:
+            # Unopened OpenCV captures have no backend
+            backend = "unknown"
+        request = json.dumps([
+            [asdict(mode) for mode in self.config.probe_modes],
+            self.config.min_fps, self.config.min_width, self.config.min_height, self.config.buffer_size,
+        ], sort_keys=True)
+        return f"{backend}:{self.config.camera_id}:{request}"
         
-        if config.width:
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.width)
-        if config.height:
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.height)
-        if config.fps:
-            self.cap.set(cv2.CAP_PROP_FPS, config.fps)
+    def _load_cache(self) -> Dict[str, Dict]:
+        """Read the mode cache, empty if missing or unreadable."""
+        if not self.config.probe_cache_path:
+            return {}
+        try:
+            with open(os.path.expanduser(self.config.probe_cache_path)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+            
+    def _save_cache(self, cache: Dict[str, Dict]) -> None:
+        """Write the mode cache atomically."""
+        path = os.path.expanduser(self.config.probe_cache_path)
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(cache, f, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Cannot write camera mode cache %s: %s", path, e)
+            
+    def negotiate(self) -> CaptureMode:
+        """Choose a capture mode, probing only if none is cached for the device.
+        
+        A cached mode is verified by applying it; if the driver grants
+        something else, the device is probed again.
+        
+        Returns:
+            The granted mode
+        """
+        cached = self._load_cache().get(self._cache_key())
+        if cached:
+            mode = CaptureMode(**cached["mode"])
+            granted = apply_mode(self.cap, mode, self.config.buffer_size)
+            if (granted.width, granted.height) == (mode.width, mode.height):
+                logger.info("Using cached capture mode %s", granted)
+                return granted
+            logger.info("Cached capture mode %s is no longer granted, probing again", mode)
+            
+        self.probe_results = probe_modes(self.cap, self.config.probe_modes, self.config.probe_frames,
+                                         self.config.buffer_size)
+        best = select_mode(self.probe_results, self.config.min_fps, self.config.min_width, self.config.min_height)
+        if best is None:
+            logger.warning("No capture mode delivered frames, keeping the driver default")
+            return granted_mode(self.cap)
+            
+        granted = apply_mode(self.cap, best.requested, self.config.buffer_size)
+        logger.info("Negotiated capture mode %s: %.1f fps, %.1f ms per read", granted, best.fps, best.read_ms)
+        self.remember_mode(best)
+        return granted
+        
+    def remember_mode(self, result: ProbeResult) -> None:
+        """Store a probed mode in the cache for this device and request.
+        
+        Args:
+            result: Probe result of the chosen mode
+        """
+        if not self.config.probe_cache_path:
+            return
+        cache = self._load_cache()
+        cache[self._cache_key()] = {"mode": asdict(result.requested), "granted": asdict(result.granted),
+                                    "fps": result.fps, "read_ms": result.read_ms, "time": time.time()}
+        self._save_cache(cache)
+        
+    def _check_granted(self, requested: CaptureMode, granted: CaptureMode) -> None:
+        """Warn about requested settings the driver did not grant."""
+        for name in ("width", "height", "fps", "fourcc"):
+            wanted, actual = getattr(requested, name), getattr(granted, name)
+            if wanted and actual and (wanted != actual if name == "fourcc" else abs(wanted - actual) > 0.5):
+                logger.warning("Camera granted %s=%s instead of %s", name, actual, wanted)
             
     def read_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
         """Read a frame from the camera.
@@ -33,11 +278,233 @@ class Camera:
                 - Boolean indicating if frame was successfully read
                 - Frame data if successful, None otherwise
         """
+        success, frame, _ = self.read_timestamped()
+        return success, frame
+        
+    def read_timestamped(self) -> Tuple[bool, Optional[np.ndarray], float]:
+        """Read a frame from the camera together with its capture time.
+        
+        The capture time is on the time.perf_counter() clock. With
+        `use_driver_timestamps` the driver's buffer timestamp is used when
+        it reports one; V4L2 stamps buffers with CLOCK_MONOTONIC, the same
+        clock perf_counter uses on Linux. Otherwise the time the read
+        returned is used.
+        
+        Returns:
+            Tuple containing:
+                - Boolean indicating if frame was successfully read
+                - Frame data if successful, None otherwise
+                - Capture time in seconds
+        """
         success, frame = self.cap.read()
+        capture_time = time.perf_counter()
         if not success:
-            return False, None
-        return True, frame
+            return False, None, capture_time
+            
+        if self.config.use_driver_timestamps:
+            driver_ms = self.cap.get(cv2.CAP_PROP_POS_MSEC)
+            if 0 < driver_ms <= capture_time * 1000:
+                capture_time = driver_ms / 1000
+        return True, frame, capture_time
     
     def release(self) -> None:
         """Release the camera resource."""
         self.cap.release()
+
+@dataclass
+class Outage:
+    """A period without frames from the camera."""
+    start: float
+    reason: str
+    end: Optional[float] = None
+    
+    @property
+    def duration(self) -> float:
+        """Length of the outage in seconds, up to now if it is ongoing."""
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+class ResilientCamera:
+    """Camera that survives disconnects and stalled drivers.
+    
+    Frames are read on a background thread and handed to the consumer as
+    they arrive. A failed read starts an outage: the device is released
+    and reopened with exponential backoff until frames flow again. A read
+    or open that hangs for longer than `stall_timeout` is abandoned: a new
+    reader thread takes over with a fresh capture, and the stuck thread
+    exits once its call returns. Tracker and mouse state are untouched, so
+    processing resumes with the first new frame.
+    
+    read_timestamped() waits at most `stall_timeout` for a frame and
+    returns failure while the camera is recovering; `alive` tells whether
+    the caller should keep reading.
+    """
+    
+    def __init__(self, config: CameraConfig, capture_factory: Callable = cv2.VideoCapture):
+        """Initialize the camera and start reading.
+        
+        Args:
+            config: Configuration for camera settings
+            capture_factory: Callable opening a capture for a camera id
+        """
+        self.config = config
+        self.capture_factory = capture_factory
+        self.outages: List[Outage] = []
+        self.opens = 0
+        self.frames = 0
+        self.alive = True
+        
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._frame: Optional[np.ndarray] = None
+        self._frame_time = 0.0
+        self._frame_seq = 0
+        self._consumed_seq = 0
+        self._generation = 0
+        self._due = time.perf_counter() + config.stall_timeout
+        self._start_reader()
+        
+    @property
+    def in_outage(self) -> bool:
+        """Whether the camera is currently without frames."""
+        return bool(self.outages) and self.outages[-1].end is None
+        
+    def _start_reader(self) -> None:
+        """Start a reader thread for the current generation."""
+        self._due = time.perf_counter() + self.config.stall_timeout
+        self._reader = threading.Thread(target=self._read_loop, args=(self._generation,),
+                                        name=f"aircontrol-camera-{self._generation}", daemon=True)
+        self._reader.start()
+        
+    def _begin_outage(self, reason: str) -> None:
+        """Record the start of an outage if none is ongoing. Call with the lock held."""
+        if not self.in_outage:
+            self.outages.append(Outage(time.perf_counter(), reason))
+            logger.warning("Camera outage: %s", reason)
+            
+    def _read_loop(self, generation: int) -> None:
+        """Read frames until stopped or superseded by a newer reader."""
+        backoff = self.config.reopen_backoff
+        camera: Optional[Camera] = None
+        while not self._stop.is_set() and generation == self._generation:
+            if camera is None:
+                self._due = time.perf_counter() + self.config.stall_timeout
+                self.opens += 1
+                try:
+                    camera = Camera(self.config, self.capture_factory)
+                    if not camera.cap.isOpened():
+                        camera.release()
+                        camera = None
+                except Exception as e:
+                    logger.debug("Cannot open camera %s: %s", self.config.camera_id, e)
+                    camera = None
+                if camera is None:
+                    # Also covers a device that was never available
+                    with self._cond:
+                        if generation != self._generation:
+                            break
+                        self._begin_outage("open failed")
+                    self._due = time.perf_counter() + backoff + self.config.stall_timeout
+                    self._stop.wait(backoff)
+                    backoff = min(backoff * 2, self.config.reopen_backoff_max)
+                    continue
+                if generation != self._generation:
+                    break
+                    
+            self._due = time.perf_counter() + self.config.stall_timeout
+            success, frame, capture_time = camera.read_timestamped()
+            with self._cond:
+                if generation != self._generation:
+                    break
+                if success:
+                    backoff = self.config.reopen_backoff
+                    if self.in_outage:
+                        self.outages[-1].end = time.perf_counter()
+                        logger.info("Camera recovered after %.3fs", self.outages[-1].duration)
+                    self._frame, self._frame_time = frame, capture_time
+                    self._frame_seq += 1
+                    self.frames += 1
+                    self._cond.notify_all()
+                    continue
+                self._begin_outage("read failed")
+            camera.release()
+            camera = None
+            
+        if camera is not None:
+            camera.release()
+            
+    def _check_stall(self) -> None:
+        """Abandon a reader stuck in a read or open. Call with the lock held."""
+        if time.perf_counter() > self._due:
+            self._begin_outage("stalled")
+            self._generation += 1
+            self._start_reader()
+            
+    def read_timestamped(self) -> Tuple[bool, Optional[np.ndarray], float]:
+        """Return the next frame, waiting at most `stall_timeout` for it.
+        
+        Returns:
+            Tuple containing:
+                - Boolean indicating if a frame was returned
+                - Frame data if successful, None otherwise
+                - Capture time in seconds
+        """
+        deadline = time.perf_counter() + self.config.stall_timeout
+        with self._cond:
+            while self._frame_seq == self._consumed_seq and self.alive:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(min(remaining, 0.05))
+                self._check_stall()
+            if self._frame_seq != self._consumed_seq:
+                self._consumed_seq = self._frame_seq
+                return True, self._frame, self._frame_time
+                
+            if (self.alive and self.in_outage and self.config.max_outage is not None
+                    and self.outages[-1].duration > self.config.max_outage):
+                logger.error("Camera outage exceeded %.1fs, giving up", self.config.max_outage)
+                self.alive = False
+            return False, None, time.perf_counter()
+            
+    def read_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Read the next frame.
+        
+        Returns:
+            Tuple containing:
+                - Boolean indicating if frame was successfully read
+                - Frame data if successful, None otherwise
+        """
+        success, frame, _ = self.read_timestamped()
+        return success, frame
+        
+    def report(self) -> Dict[str, float]:
+        """Outage statistics.
+        
+        Returns:
+            Dictionary with frame and open counts, the number of outages,
+            their total and longest duration, and whether one is ongoing
+        """
+        with self._cond:
+            durations = [outage.duration for outage in self.outages]
+            return {
+                "frames": self.frames,
+                "opens": self.opens,
+                "outages": len(durations),
+                "outage_total_s": sum(durations),
+                "outage_longest_s": max(durations, default=0.0),
+                "in_outage": self.in_outage,
+            }
+            
+    def release(self) -> None:
+        """Stop reading and release the device."""
+        with self._cond:
+            self.alive = False
+            self._stop.set()
+            self._generation += 1
+            self._cond.notify_all()
+        # A reader stuck in the driver is left behind and exits on its own
+        self._reader.join(self.config.stall_timeout)
+        if self.outages:
+            report = self.report()
+            logger.info("Camera had %d outages, %.3fs in total, longest %.3fs",
+                        report["outages"], report["outage_total_s"], report["outage_longest_s"])
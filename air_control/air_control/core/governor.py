@@ -0,0 +1,135 @@
+"""Adaptive quality governor that holds a per-frame latency budget."""
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Optional
+
+from ..config import GovernorConfig, QualityLevel
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class GovernorDecision:
+    """Record of a single quality change made by the governor."""
+    frame: int
+    latency_ms: float
+    from_level: int
+    to_level: int
+    reason: str
+
+class QualityGovernor:
+    """Steps quality knobs down and up to keep frame latency within budget.
+    
+    The governor is fed one latency measurement per frame. It keeps an
+    exponentially smoothed estimate and only changes level after the
+    estimate has stayed past a threshold for a number of consecutive
+    frames, with separate thresholds for degrading and upgrading and a
+    cooldown after every change. An upgrade that has to be reverted soon
+    after doubles the wait before that level is tried again, so the
+    governor does not oscillate between two neighbouring levels.
+    """
+    
+    def __init__(self, config: GovernorConfig, apply: Callable[[QualityLevel], None]):
+        """Initialize the governor.
+        
+        Args:
+            config: Configuration for the governor
+            apply: Callback invoked with the new quality level on every change
+        """
+        if not config.levels:
+            raise ValueError("GovernorConfig.levels must contain at least one level")
+            
+        self.config = config
+        self.apply = apply
+        self.level_index = max(0, min(config.initial_level, len(config.levels) - 1))
+        self.smoothed_ms: Optional[float] = None
+        self.frame = 0
+        self.decisions: Deque[GovernorDecision] = deque(maxlen=256)
+        self._over_frames = 0
+        self._under_frames = 0
+        self._cooldown = 0
+        self._upgrade_backoff: Dict[int, int] = {}
+        self._last_upgrade_frame: Optional[int] = None
+        
+        self.apply(self.level)
+        
+    @property
+    def level(self) -> QualityLevel:
+        """Currently active quality level."""
+        return self.config.levels[self.level_index]
+        
+    def observe(self, latency_ms: float) -> Optional[QualityLevel]:
+        """Record the latency of one frame and adjust quality if needed.
+        
+        Args:
+            latency_ms: Latency of the frame from capture to the end of processing in milliseconds
+            
+        Returns:
+            The new quality level if it changed, None otherwise
+        """
+        self.frame += 1
+        if self.smoothed_ms is None:
+            self.smoothed_ms = latency_ms
+        else:
+            alpha = self.config.smoothing
+            self.smoothed_ms = alpha * latency_ms + (1 - alpha) * self.smoothed_ms
+            
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return None
+            
+        budget = self.config.latency_budget_ms
+        if self.smoothed_ms > budget * self.config.degrade_ratio:
+            self._over_frames += 1
+            self._under_frames = 0
+        elif self.smoothed_ms < budget * self.config.upgrade_ratio:
+            self._under_frames += 1
+            self._over_frames = 0
+        else:
+            self._over_frames = 0
+            self._under_frames = 0
+            
+        if (self._over_frames >= self.config.degrade_frames and
+                self.level_index < len(self.config.levels) - 1):
+            return self._change(self.level_index + 1, "over budget")
+        if self.level_index > 0:
+            backoff = self._upgrade_backoff.get(self.level_index - 1, 1)
+            if self._under_frames >= self.config.upgrade_frames * backoff:
+                return self._change(self.level_index - 1, "under budget")
+        return None
+        
+    def _change(self, new_index: int, reason: str) -> QualityLevel:
+        """Switch to a new level, log the decision and apply it."""
+        if new_index < self.level_index:
+            self._last_upgrade_frame = self.frame
+        elif (self._last_upgrade_frame is not None and
+                self.frame - self._last_upgrade_frame <= self.config.upgrade_frames):
+            # The last upgrade did not hold, back off before probing it again
+            self._upgrade_backoff[self.level_index] = min(
+                self._upgrade_backoff.get(self.level_index, 1) * 2, 64)
+            self._last_upgrade_frame = None
+            
+        decision = GovernorDecision(
+            frame=self.frame,
+            latency_ms=self.smoothed_ms,
+            from_level=self.level_index,
+            to_level=new_index,
+            reason=reason,
+        )
+        self.decisions.append(decision)
+        logger.info(
+            "Quality %s: smoothed latency %.1f ms vs budget %.1f ms, level %d -> %d (%s)",
+            "down" if new_index > self.level_index else "up",
+            self.smoothed_ms,
+            self.config.latency_budget_ms,
+            self.level_index,
+            new_index,
+            self.config.levels[new_index],
+        )
+        
+        self.level_index = new_index
+        self._over_frames = 0
+        self._under_frames = 0
+        self._cooldown = self.config.cooldown_frames
+        self.apply(self.level)
+        return self.level
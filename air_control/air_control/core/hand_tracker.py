@@ -1,15 +1,26 @@
 """Core hand tracking functionality."""
-from typing import Optional, Tuple
+import logging
+from typing import List, Optional, Tuple
 
 import cv2
 import mediapipe as mp
 import numpy as np
 
-from ..config import HandTrackingConfig
+from ..config import HandTrackingConfig, QualityLevel
 from ..utils.coordinates import CoordinateTransformer
+from .optical_flow import LandmarkPropagator
+from .timing import FrameTimeline
+
+logger = logging.getLogger(__name__)
 
 class HandTracker:
-    """Handles hand tracking and landmark detection."""
+    """Handles hand tracking and landmark detection.
+    
+    MediaPipe runs every `detection_interval` frames. In between, the last
+    landmarks are either held or, with `optical_flow` enabled, propagated
+    with Lucas-Kanade flow; a failed flow check or a detection with an
+    uncertain handedness score forces a new detection on the next frame.
+    """
     
     def __init__(self, config: HandTrackingConfig):
         """Initialize the hand tracker.
@@ -20,13 +31,94 @@ class HandTracker:
         self.config = config
         self.mp_hands = mp.solutions.hands
         self.mp_drawing = mp.solutions.drawing_utils
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=config.static_image_mode,
-            max_num_hands=config.max_num_hands,
-            min_detection_confidence=config.min_detection_confidence,
-            min_tracking_confidence=config.min_tracking_confidence
+        
+        # Quality knobs, adjustable at runtime through apply_quality
+        self.model_complexity = config.model_complexity
+        self.inference_scale = config.inference_scale
+        self.roi_padding = config.roi_padding
+        self.detection_interval = max(1, config.detection_interval)
+        # Normalized (x0, y0, x1, y1) crop used when there is no hand ROI
+        self.active_region: Optional[Tuple[float, float, float, float]] = None
+        
+        self.hands = self._create_hands()
+        self._last_landmarks = None
+        self._frames_since_detection = 0
+        self.timeline: Optional[FrameTimeline] = None
+        
+        self.propagator = None
+        if config.optical_flow:
+            self.propagator = LandmarkPropagator(
+                win_size=config.flow_window_size,
+                max_level=config.flow_pyramid_levels,
+                max_fb_error=config.flow_max_fb_error,
+                min_tracked_fraction=config.flow_min_tracked_fraction
+            )
+            if self.detection_interval == 1:
+                # Flow only runs between detections
+                logger.warning("optical_flow has no effect with detection_interval=1 unless the quality "
+                               "governor raises the interval; set detection_interval to 2 or more")
+        
+    def _create_hands(self):
+        """Create the MediaPipe Hands graph for the current settings."""
+        return self.mp_hands.Hands(
+            static_image_mode=self.config.static_image_mode,
+            max_num_hands=self.config.max_num_hands,
+            model_complexity=self.model_complexity,
+            min_detection_confidence=self.config.min_detection_confidence,
+            min_tracking_confidence=self.config.min_tracking_confidence
         )
         
+    def apply_quality(self, level: QualityLevel) -> None:
+        """Apply a quality level to the tracker.
+        
+        The MediaPipe graph is only rebuilt when the model complexity changes.
+        
+        Args:
+            level: Quality level to apply
+        """
+        self.inference_scale = level.inference_scale
+        self.roi_padding = level.roi_padding
+        self.detection_interval = max(1, level.detection_interval)
+        
+        if level.model_complexity != self.model_complexity:
+            self.model_complexity = level.model_complexity
+            self.hands.close()
+            self.hands = self._create_hands()
+            self._last_landmarks = None
+            
+    def _inference_region(self, frame_shape: Tuple[int, ...]) -> Optional[Tuple[int, int, int, int]]:
+        """Compute the pixel region to run inference on.
+        
+        Args:
+            frame_shape: Shape of the full frame
+            
+        Returns:
+            (x0, y0, x1, y1) crop around the last detected hand, else the
+            active region if one is set, or None for the full frame
+        """
+        height, width = frame_shape[:2]
+        if self.roi_padding is None or self._last_landmarks is None:
+            if self.active_region is None:
+                return None
+            x0, y0, x1, y1 = self.active_region
+            x0, y0 = int(max(0.0, x0) * width), int(max(0.0, y0) * height)
+            x1, y1 = int(min(1.0, x1) * width), int(min(1.0, y1) * height)
+            if x1 - x0 < 2 or y1 - y0 < 2:
+                return None
+            return x0, y0, x1, y1
+            
+        xs = [lm.x for lm in self._last_landmarks.landmark]
+        ys = [lm.y for lm in self._last_landmarks.landmark]
+        pad = self.roi_padding * max(max(xs) - min(xs), max(ys) - min(ys))
+        
+        x0 = int(max(0.0, min(xs) - pad) * width)
+        y0 = int(max(0.0, min(ys) - pad) * height)
+        x1 = int(min(1.0, max(xs) + pad) * width)
+        y1 = int(min(1.0, max(ys) + pad) * height)
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            return None
+        return x0, y0, x1, y1
+        
     def process_frame(self, frame: np.ndarray) -> Tuple[Optional[mp.framework.formats.landmark_pb2.NormalizedLandmarkList], np.ndarray]:
         """Process a video frame and detect hand landmarks.
         
@@ -38,17 +130,142 @@ class HandTracker:
                 - Hand landmarks if detected, None otherwise
                 - Processed frame with landmarks drawn
         """
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(frame_rgb)
+        self._frames_since_detection += 1
+        if self._frames_since_detection < self.detection_interval:
+            # Reuse or propagate the last result between detections
+            hand_landmarks = self._last_landmarks
+            if hand_landmarks is not None and self.propagator:
+                hand_landmarks = self.propagator.propagate(frame)
+                self._mark("optical_flow")
+            if hand_landmarks is not None or self._last_landmarks is None:
+                self._last_landmarks = hand_landmarks
+                if hand_landmarks is not None:
+                    self.mp_drawing.draw_landmarks(
+                        frame,
+                        hand_landmarks,
+                        self.mp_hands.HAND_CONNECTIONS
+                    )
+                    self._mark("drawing")
+                return hand_landmarks, frame
+            # Flow failed the forward-backward check, re-detect on this frame
+        self._frames_since_detection = 0
+        
+        region = self._inference_region(frame.shape)
+        image = frame
+        if region:
+            x0, y0, x1, y1 = region
+            image = frame[y0:y1, x0:x1]
+        if self.inference_scale < 1.0:
+            image = cv2.resize(image, None, fx=self.inference_scale, fy=self.inference_scale,
+                               interpolation=cv2.INTER_AREA)
+            
+        frame_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        self._mark("color_convert")
+        multi_hand_landmarks, score = self._detect(frame_rgb)
+        self._mark("inference")
         
-        if results.multi_hand_landmarks:
+        if multi_hand_landmarks:
+            if region:
+                for hand_landmarks in multi_hand_landmarks:
+                    self._to_frame_coordinates(hand_landmarks, region, frame.shape)
+            self._last_landmarks = multi_hand_landmarks[0]
+            # Seed the flow from the frame before anything is drawn on it
+            if self.propagator:
+                self.propagator.reset(frame, self._last_landmarks)
+                
             # Draw landmarks on frame
-            for hand_landmarks in results.multi_hand_landmarks:
+            for hand_landmarks in multi_hand_landmarks:
                 self.mp_drawing.draw_landmarks(
                     frame,
                     hand_landmarks,
                     self.mp_hands.HAND_CONNECTIONS
                 )
-            return results.multi_hand_landmarks[0], frame
+            self._mark("drawing")
             
+            if score is not None and score < self.config.redetect_confidence:
+                # Uncertain detection, do not propagate from this result
+                self._frames_since_detection = self.detection_interval
+            return self._last_landmarks, frame
+            
+        self._last_landmarks = None
+        if self.propagator:
+            self.propagator.clear()
         return None, frame
+        
+    def _detect(self, frame_rgb: np.ndarray) -> Tuple[List[mp.framework.formats.landmark_pb2.NormalizedLandmarkList], Optional[float]]:
+        """Run the landmark model on an RGB image.
+        
+        Args:
+            frame_rgb: RGB image to run inference on
+            
+        Returns:
+            Tuple containing:
+                - Detected hand landmarks, empty if no hand was found
+                - Handedness score of the first hand, None if unavailable
+        """
+        results = self.hands.process(frame_rgb)
+        if not results.multi_hand_landmarks:
+            return [], None
+            
+        # The hand presence score is not part of the results, MediaPipe only
+        # uses it against min_tracking_confidence. The handedness score
+        # serves as a heuristic instead: it is the certainty of the left or
+        # right classification, which drops for blurred, partial or
+        # unusually posed hands, not a probability that a hand is present.
+        score = None
+        if results.multi_handedness:
+            score = results.multi_handedness[0].classification[0].score
+        return list(results.multi_hand_landmarks), score
+        
+    def reset(self) -> None:
+        """Forget all tracking state, e.g. before processing a new video."""
+        self.hands.close()
+        self.hands = self._create_hands()
+        self._last_landmarks = None
+        self._frames_since_detection = 0
+        if self.propagator:
+            self.propagator.clear()
+            
+    def close(self) -> None:
+        """Release the landmark model."""
+        self.hands.close()
+        
+    def _mark(self, stage: str) -> None:
+        """Record the end of a stage on the frame timeline."""
+        if self.timeline:
+            self.timeline.mark(stage)
+            
+    @staticmethod
+    def _to_frame_coordinates(hand_landmarks, region: Tuple[int, int, int, int],
+                              frame_shape: Tuple[int, ...]) -> None:
+        """Map landmarks normalized to a crop back to full-frame coordinates in place."""
+        height, width = frame_shape[:2]
+        x0, y0, x1, y1 = region
+        sx = (x1 - x0) / width
+        sy = (y1 - y0) / height
+        for lm in hand_landmarks.landmark:
+            lm.x = x0 / width + lm.x * sx
+            lm.y = y0 / height + lm.y * sy
+            lm.z = lm.z * sx
+
+def create_hand_tracker(config: HandTrackingConfig) -> HandTracker:
+    """Create the hand tracker for the backend selected in the configuration.
+    
+    Args:
+        config: Configuration for hand tracking
+        
+    Returns:
+        HandTracker for the "solutions" backend, TasksHandTracker for "tasks"
+        or a SyntheticHandTracker replaying generated landmarks for "synthetic"
+    """
+    if config.backend == "solutions":
+        return HandTracker(config)
+    if config.backend == "tasks":
+        from .landmarker import TasksHandTracker
+        return TasksHandTracker(config)
+    if config.backend == "synthetic":
+        from ..utils.synthetic import SyntheticHandGenerator, SyntheticHandTracker
+        generator = SyntheticHandGenerator(seed=config.synthetic_seed)
+        return SyntheticHandTracker(generator.generate(config.synthetic_frames), config.synthetic_latency_ms,
+                                    config.inference_scale, config.model_complexity)
+    raise ValueError(f"Unknown hand tracking backend: {config.backend!r}")
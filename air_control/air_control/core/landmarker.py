@@ -0,0 +1,146 @@
+"""Hand tracking backend built on the MediaPipe Tasks HandLandmarker."""
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import mediapipe as mp
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+
+from ..config import HandTrackingConfig, QualityLevel
+from .hand_tracker import HandTracker
+
+class TasksHandTracker(HandTracker):
+    """Hand tracker running the Tasks HandLandmarker in LIVE_STREAM mode.
+    
+    Frames are submitted with `detect_async` and results arrive on a
+    MediaPipe thread through a callback, so `process_frame` never waits
+    for inference. Each call returns the most recent result available,
+    which usually belongs to an earlier frame; `result_timestamp_ms` holds
+    the timestamp of the frame it was computed from. Results are converted
+    to the same NormalizedLandmarkList the legacy backend returns.
+    
+    ROI cropping and optical-flow propagation are not applied, because a
+    result cannot be matched to the crop or image of the current frame.
+    """
+    
+    def __init__(self, config: HandTrackingConfig):
+        """Initialize the tracker.
+        
+        Args:
+            config: Configuration for hand tracking
+        """
+        if not config.model_asset_path:
+            raise ValueError("HandTrackingConfig.model_asset_path is required for the tasks backend")
+            
+        self._lock = threading.Lock()
+        self._latest: Tuple[List[landmark_pb2.NormalizedLandmarkList], Optional[float]] = ([], None)
+        self._last_timestamp_ms = 0
+        self._pending: "OrderedDict[int, Tuple[int, Optional[float]]]" = OrderedDict()
+        self.result_timestamp_ms: Optional[int] = None
+        
+        super().__init__(config)
+        self.propagator = None
+        
+    def _create_hands(self):
+        """Create the HandLandmarker task in LIVE_STREAM mode."""
+        vision = mp.tasks.vision
+        options = vision.HandLandmarkerOptions(
+            base_options=mp.tasks.BaseOptions(model_asset_path=self.config.model_asset_path),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_hands=self.config.max_num_hands,
+            min_hand_detection_confidence=self.config.min_detection_confidence,
+            min_hand_presence_confidence=self.config.min_detection_confidence,
+            min_tracking_confidence=self.config.min_tracking_confidence,
+            result_callback=self._on_result
+        )
+        return vision.HandLandmarker.create_from_options(options)
+        
+    def apply_quality(self, level: QualityLevel) -> None:
+        """Apply a quality level to the tracker.
+        
+        The HandLandmarker has a single model, so the level's model
+        complexity is ignored and the task is never rebuilt; rebuilding
+        would only drop the results in flight.
+        
+        Args:
+            level: Quality level to apply
+        """
+        self.inference_scale = level.inference_scale
+        self.roi_padding = level.roi_padding
+        self.detection_interval = max(1, level.detection_interval)
+        
+    def _on_result(self, result, output_image, timestamp_ms: int) -> None:
+        """Store the latest result; called on a MediaPipe thread."""
+        multi_hand_landmarks = []
+        for hand in result.hand_landmarks:
+            hand_landmarks = landmark_pb2.NormalizedLandmarkList()
+            for lm in hand:
+                hand_landmarks.landmark.add(x=lm.x, y=lm.y, z=lm.z)
+            multi_hand_landmarks.append(hand_landmarks)
+            
+        # HandLandmarkerResult has no presence score, only landmarks and
+        # handedness; as in the legacy backend, the handedness certainty is
+        # the heuristic for an uncertain detection
+        score = None
+        if result.handedness:
+            score = result.handedness[0][0].score
+            
+        with self._lock:
+            self._latest = (multi_hand_landmarks, score)
+            self.result_timestamp_ms = timestamp_ms
+            
+    def _inference_region(self, frame_shape: Tuple[int, ...]) -> Optional[Tuple[int, int, int, int]]:
+        """Always run on the full frame."""
+        return None
+        
+    def _detect(self, frame_rgb: np.ndarray) -> Tuple[List[mp.framework.formats.landmark_pb2.NormalizedLandmarkList], Optional[float]]:
+        """Submit an RGB image for inference and return the latest result.
+        
+        Args:
+            frame_rgb: RGB image to run inference on
+            
+        Returns:
+            Tuple containing:
+                - Most recently detected hand landmarks, empty if none
+                - Handedness score of the first hand, None if unavailable
+        """
+        # LIVE_STREAM mode requires strictly increasing timestamps
+        timestamp_ms = max(int(time.monotonic() * 1000), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=np.ascontiguousarray(frame_rgb))
+        self.hands.detect_async(image, timestamp_ms)
+        
+        with self._lock:
+            latest = self._latest
+            result_timestamp_ms = self.result_timestamp_ms
+            
+        timing = self.timeline.current if self.timeline else None
+        if timing is not None:
+            # Attribute the result to the frame it was computed from
+            self._pending[timestamp_ms] = (timing.frame_id, timing.capture_time)
+            while len(self._pending) > 64:
+                self._pending.popitem(last=False)
+            if result_timestamp_ms in self._pending:
+                timing.source_frame_id, timing.source_capture_time = self._pending[result_timestamp_ms]
+        return latest
+        
+    def wait_for_result(self, timeout: float = 1.0) -> bool:
+        """Block until the result of the last submitted frame has arrived.
+        
+        Args:
+            timeout: Maximum seconds to wait
+            
+        Returns:
+            True if the result arrived, False on timeout
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if self.result_timestamp_ms == self._last_timestamp_ms:
+                    return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.0002)
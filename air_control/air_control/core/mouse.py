@@ -1,25 +1,96 @@
 """Mouse control functionality."""
-from typing import Tuple
+from typing import Optional, Tuple
 
 import pyautogui
 
 from ..config import MouseConfig
 from ..utils.smoothing import MovementSmoother
+from .timing import FrameTimeline
+
+class NullMouseBackend:
+    """Mouse backend that records actions instead of performing them.
+    
+    Implements the subset of the pyautogui API used by MouseController,
+    for headless runs, benchmarks and latency measurements.
+    """
+    
+    def __init__(self, screen_width: int = 1920, screen_height: int = 1080):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.position = (0.0, 0.0)
+        self.moves = 0
+        self.clicks = 0
+        self.right_clicks = 0
+        self.scrolled = 0
+        self.button_down = False
+        
+    def size(self) -> Tuple[int, int]:
+        """Return the simulated screen size."""
+        return self.screen_width, self.screen_height
+        
+    def moveTo(self, x: float, y: float) -> None:
+        """Record a pointer move."""
+        self.position = (x, y)
+        self.moves += 1
+        
+    def click(self) -> None:
+        """Record a left click."""
+        self.clicks += 1
+        
+    def rightClick(self) -> None:
+        """Record a right click."""
+        self.right_clicks += 1
+        
+    def scroll(self, clicks: int) -> None:
+        """Record a scroll, positive is up."""
+        self.scrolled += clicks
+        
+    def mouseDown(self, x: float, y: float) -> None:
+        """Record a button press at a position."""
+        self.position = (x, y)
+        self.button_down = True
+        
+    def mouseUp(self) -> None:
+        """Record a button release."""
+        self.button_down = False
+
+def create_mouse_backend(name: str):
+    """Create the mouse backend selected in the configuration.
+    
+    Args:
+        name: "pyautogui" or "null"
+        
+    Returns:
+        Object providing the pyautogui mouse functions
+    """
+    if name == "pyautogui":
+        pyautogui.FAILSAFE = False
+        return pyautogui
+    if name == "null":
+        return NullMouseBackend()
+    raise ValueError(f"Unknown mouse backend: {name!r}")
 
 class MouseController:
     """Handles mouse movement and actions."""
     
-    def __init__(self, config: MouseConfig):
+    def __init__(self, config: MouseConfig, backend=None):
         """Initialize the mouse controller.
         
         Args:
             config: Configuration for mouse control
+            backend: Mouse backend, defaults to the one named in the config
         """
         self.config = config
+        self.backend = backend or create_mouse_backend(config.backend)
         self.smoother = MovementSmoother(config.smoothing_factor)
-        self.screen_width, self.screen_height = pyautogui.size()
+        self.screen_width, self.screen_height = self.backend.size()
         self.dragging = False
-        pyautogui.FAILSAFE = False
+        self.timeline: Optional[FrameTimeline] = None
+        
+    def _mark(self, stage: str) -> None:
+        """Record the end of a stage on the frame timeline."""
+        if self.timeline:
+            self.timeline.mark(stage)
         
     def move(self, x: float, y: float) -> None:
         """Move mouse to specified coordinates.
@@ -29,7 +100,9 @@ class MouseController:
             y: Y coordinate
         """
         smooth_x, smooth_y = self.smoother.smooth(x, y)
-        pyautogui.moveTo(smooth_x, smooth_y)
+        self._mark("smoothing")
+        self.backend.moveTo(smooth_x, smooth_y)
+        self._mark("mouse")
         
     def click(self, right: bool = False) -> None:
         """Perform mouse click.
@@ -38,10 +111,20 @@ class MouseController:
             right: If True, perform right click instead of left click
         """
         if right:
-            pyautogui.rightClick()
+            self.backend.rightClick()
         else:
-            pyautogui.click()
+            self.backend.click()
+        self._mark("click")
             
+    def scroll(self, amount: int) -> None:
+        """Scroll the wheel.
+        
+        Args:
+            amount: Scroll steps, positive scrolls up
+        """
+        self.backend.scroll(amount)
+        self._mark("scroll")
+        
     def start_drag(self, x: float, y: float) -> None:
         """Start dragging from specified coordinates.
         
@@ -51,13 +134,15 @@ class MouseController:
         """
         if not self.dragging:
             smooth_x, smooth_y = self.smoother.smooth(x, y)
-            pyautogui.mouseDown(smooth_x, smooth_y)
+            self._mark("smoothing")
+            self.backend.mouseDown(smooth_x, smooth_y)
+            self._mark("mouse")
             self.dragging = True
             
     def end_drag(self) -> None:
         """End dragging operation."""
         if self.dragging:
-            pyautogui.mouseUp()
+            self.backend.mouseUp()
             self.dragging = False
             
     def get_screen_dimensions(self) -> Tuple[int, int]:
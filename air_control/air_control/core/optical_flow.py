@@ -0,0 +1,100 @@
+"""Optical-flow propagation of hand landmarks between detections."""
+from typing import Optional, Tuple
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from ..utils.landmarks import array_to_landmarks, landmarks_to_array
+
+class LandmarkPropagator:
+    """Moves the last detected landmarks forward with pyramidal Lucas-Kanade flow.
+    
+    Each frame is converted to grayscale once and kept as the previous
+    image for the next frame; OpenCV builds the image pyramids internally.
+    Points are tracked forward and then back again, and propagation is
+    rejected when too few of them return close to where they started.
+    """
+    
+    def __init__(self, win_size: int = 21, max_level: int = 3,
+                 max_fb_error: float = 1.5, min_tracked_fraction: float = 0.8):
+        """Initialize the propagator.
+        
+        Args:
+            win_size: Side of the Lucas-Kanade search window in pixels
+            max_level: Number of pyramid levels above the base image
+            max_fb_error: Largest accepted forward-backward error in pixels
+            min_tracked_fraction: Fraction of landmarks that must pass the check
+        """
+        self.win_size = (win_size, win_size)
+        self.max_level = max_level
+        self.max_fb_error = max_fb_error
+        self.min_tracked_fraction = min_tracked_fraction
+        self.criteria = (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03)
+        
+        self._prev_gray: Optional[np.ndarray] = None
+        self._prev_points: Optional[np.ndarray] = None
+        self._prev_z: Optional[np.ndarray] = None
+        self._frame_size: Tuple[int, int] = (0, 0)
+        
+    def reset(self, frame: np.ndarray, hand_landmarks: mp.framework.formats.landmark_pb2.NormalizedLandmarkList) -> None:
+        """Seed the propagator with freshly detected landmarks.
+        
+        Args:
+            frame: Frame the landmarks were detected on
+            hand_landmarks: Detected hand landmarks
+        """
+        height, width = frame.shape[:2]
+        points = landmarks_to_array(hand_landmarks)
+        self._frame_size = (width, height)
+        self._prev_points = (points[:, :2] * (width, height)).astype(np.float32).reshape(-1, 1, 2)
+        self._prev_z = points[:, 2]
+        self._prev_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        
+    def clear(self) -> None:
+        """Drop the tracked state so the next frame requires a detection."""
+        self._prev_gray = None
+        self._prev_points = None
+        
+    def propagate(self, frame: np.ndarray) -> Optional[mp.framework.formats.landmark_pb2.NormalizedLandmarkList]:
+        """Propagate the tracked landmarks onto a new frame.
+        
+        Args:
+            frame: Next video frame
+            
+        Returns:
+            Propagated hand landmarks, or None if the flow was unreliable and
+            a new detection is required
+        """
+        if self._prev_gray is None:
+            return None
+            
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        points, status, _ = cv2.calcOpticalFlowPyrLK(
+            self._prev_gray, gray, self._prev_points, None,
+            winSize=self.win_size, maxLevel=self.max_level, criteria=self.criteria
+        )
+        back_points, back_status, _ = cv2.calcOpticalFlowPyrLK(
+            gray, self._prev_gray, points, None,
+            winSize=self.win_size, maxLevel=self.max_level, criteria=self.criteria
+        )
+        
+        fb_error = np.linalg.norm((self._prev_points - back_points).reshape(-1, 2), axis=1)
+        good = (status.ravel() == 1) & (back_status.ravel() == 1) & (fb_error < self.max_fb_error)
+        if good.mean() < self.min_tracked_fraction:
+            self.clear()
+            return None
+            
+        # Landmarks that failed the check move with the rest of the hand
+        if not good.all():
+            shift = np.median((points - self._prev_points)[good], axis=0)
+            points[~good] = self._prev_points[~good] + shift
+            
+        self._prev_gray = gray
+        self._prev_points = points
+        
+        width, height = self._frame_size
+        normalized = np.empty((len(points), 3), dtype=np.float32)
+        normalized[:, :2] = points.reshape(-1, 2) / (width, height)
+        normalized[:, 2] = self._prev_z
+        return array_to_landmarks(normalized)
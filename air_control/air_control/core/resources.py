@@ -0,0 +1,217 @@
+"""Per-stage CPU affinity, niceness, thread counts and CPU budget."""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+import cv2
+
+from ..config import ResourceConfig
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("capture", "inference", "actuation")
+
+def _thread_id() -> int:
+    """Kernel id of the calling thread, as used by sched_setaffinity and setpriority."""
+    get_native_id = getattr(threading, "get_native_id", None)
+    return get_native_id() if get_native_id else 0
+
+class ResourceGovernor:
+    """Applies the resource configuration and measures CPU time per stage.
+    
+    Stages are entered with `stage(name)`. On entry the calling thread is
+    pinned to the stage's cores and given its niceness; thread CPU time
+    spent inside the stage is accumulated. Affinity can be changed freely,
+    but unprivileged processes can only raise niceness, so a thread shared
+    by several stages (the synchronous run loop) keeps the highest value
+    applied. With events(), capture and inference have their own threads.
+    Settings the OS refuses are logged once and show up in the report.
+    
+    Nothing is changed until start(). close() puts back the OpenCV thread
+    count and each thread's original affinity and niceness, as far as the
+    OS allows: lowering niceness again needs CAP_SYS_NICE or RLIMIT_NICE.
+    """
+    
+    def __init__(self, config: ResourceConfig):
+        """Initialize the governor.
+        
+        Args:
+            config: Configuration for resources
+            
+        Raises:
+            ValueError: If the config names unknown stages
+        """
+        unknown = (set(config.stage_affinity) | set(config.stage_nice)) - set(STAGES)
+        if unknown:
+            raise ValueError(f"Unknown stages in resource config: {sorted(unknown)}")
+        self.config = config
+        self.started = False
+            
+        self.cpu_time: Dict[str, float] = dict.fromkeys(STAGES, 0.0)
+        self.wall_time: Dict[str, float] = dict.fromkeys(STAGES, 0.0)
+        self.entries: Dict[str, int] = dict.fromkeys(STAGES, 0)
+        # Settings in effect for each stage, by thread name
+        self.effective: Dict[str, Dict[str, Dict]] = {stage: {} for stage in STAGES}
+        self.throttled = 0.0
+        self._failed: Dict[str, str] = {}
+        self._thread_settings: Dict[int, tuple] = {}
+        # Affinity and niceness of each thread before it was first changed
+        self._original: Dict[int, Tuple[Optional[Set[int]], Optional[int]]] = {}
+        self._original_opencv_threads: Optional[int] = None
+        self._lock = threading.Lock()
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._window_wall = self._start_wall
+        self._window_cpu = self._start_cpu
+        self._next_report = self._start_wall + config.report_interval
+        
+    def start(self) -> None:
+        """Apply the process-wide settings; stages apply theirs from now on."""
+        if self.config.opencv_threads is not None:
+            self._original_opencv_threads = cv2.getNumThreads()
+            cv2.setNumThreads(self.config.opencv_threads)
+        self.started = True
+        
+    def close(self) -> None:
+        """Restore the OpenCV thread count and the settings of every changed thread."""
+        self.started = False
+        if self._original_opencv_threads is not None:
+            cv2.setNumThreads(self._original_opencv_threads)
+            self._original_opencv_threads = None
+        with self._lock:
+            original, self._original = self._original, {}
+            self._thread_settings.clear()
+        for tid, (cores, nice) in original.items():
+            try:
+                if cores is not None and hasattr(os, "sched_setaffinity"):
+                    os.sched_setaffinity(tid, cores)
+                if nice is not None and os.getpriority(os.PRIO_PROCESS, tid) != nice:
+                    os.setpriority(os.PRIO_PROCESS, tid, nice)
+            except ProcessLookupError:
+                # The thread has exited
+                pass
+            except OSError as e:
+                logger.warning("Cannot restore the settings of thread %d: %s", tid, e)
+                
+    def _apply(self, stage: str) -> None:
+        """Pin the calling thread and set its niceness for a stage."""
+        if not self.started:
+            return
+        cores = self.config.stage_affinity.get(stage)
+        nice = self.config.stage_nice.get(stage)
+        tid = _thread_id()
+        if self._thread_settings.get(tid) == (stage, cores, nice):
+            return
+            
+        with self._lock:
+            if tid and tid not in self._original:
+                self._original[tid] = (
+                    os.sched_getaffinity(tid) if hasattr(os, "sched_getaffinity") else None,
+                    os.getpriority(os.PRIO_PROCESS, tid) if hasattr(os, "getpriority") else None,
+                )
+        if cores and hasattr(os, "sched_setaffinity"):
+            try:
+                os.sched_setaffinity(tid, cores)
+            except OSError as e:
+                self._fail(f"affinity:{stage}", f"Cannot pin {stage} to cores {cores}: {e}")
+        if nice is not None and hasattr(os, "setpriority") and tid:
+            try:
+                if os.getpriority(os.PRIO_PROCESS, tid) != nice:
+                    os.setpriority(os.PRIO_PROCESS, tid, nice)
+            except OSError as e:
+                self._fail(f"nice:{stage}", f"Cannot set {stage} niceness to {nice}: {e}")
+                
+        self._thread_settings[tid] = (stage, cores, nice)
+        self.effective[stage][threading.current_thread().name] = {
+            "cores": sorted(os.sched_getaffinity(tid)) if hasattr(os, "sched_getaffinity") else None,
+            "nice": os.getpriority(os.PRIO_PROCESS, tid) if hasattr(os, "getpriority") and tid else None,
+        }
+        
+    def _fail(self, key: str, message: str) -> None:
+        """Log a refused setting once."""
+        if key not in self._failed:
+            self._failed[key] = message
+            logger.warning(message)
+            
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Run a block as a pipeline stage.
+        
+        Args:
+            name: "capture", "inference" or "actuation"
+        """
+        self._apply(name)
+        start_cpu, start_wall = time.thread_time(), time.perf_counter()
+        try:
+            yield
+        finally:
+            cpu, wall = time.thread_time() - start_cpu, time.perf_counter() - start_wall
+            with self._lock:
+                self.cpu_time[name] += cpu
+                self.wall_time[name] += wall
+                self.entries[name] += 1
+                
+    def end_frame(self) -> None:
+        """Throttle to the CPU limit and log the periodic report.
+        
+        Call once per frame, outside the stages. When the process used
+        more than `cpu_limit` cores on average over the last second, this
+        sleeps until the average is back at the limit.
+        """
+        now = time.perf_counter()
+        if self.config.cpu_limit:
+            cpu = time.process_time()
+            delay = (cpu - self._window_cpu) / self.config.cpu_limit - (now - self._window_wall)
+            if delay > 0:
+                time.sleep(delay)
+                self.throttled += delay
+                now = time.perf_counter()
+            if now - self._window_wall >= 1.0:
+                self._window_wall, self._window_cpu = now, cpu
+                
+        if self.config.report_interval and now >= self._next_report:
+            self._next_report = now + self.config.report_interval
+            self.log_report()
+            
+    def report(self) -> Dict:
+        """Effective settings and measured CPU use.
+        
+        Returns:
+            Dictionary with the OpenCV thread count, the per-stage settings
+            in effect on each thread, CPU and wall milliseconds per stage
+            entry, total process CPU use in cores, time spent throttling,
+            and settings the OS refused
+        """
+        wall = time.perf_counter() - self._start_wall
+        stages = {}
+        for stage in STAGES:
+            entries = self.entries[stage]
+            stages[stage] = {
+                "entries": entries,
+                "cpu_s": self.cpu_time[stage],
+                "cpu_ms_per_entry": self.cpu_time[stage] / entries * 1000 if entries else 0.0,
+                "wall_ms_per_entry": self.wall_time[stage] / entries * 1000 if entries else 0.0,
+                "threads": self.effective[stage],
+            }
+        return {
+            "opencv_threads": cv2.getNumThreads(),
+            "cpu_count": os.cpu_count(),
+            "stages": stages,
+            "process_cores": (time.process_time() - self._start_cpu) / wall if wall > 0 else 0.0,
+            "cpu_limit": self.config.cpu_limit,
+            "throttled_s": self.throttled,
+            "refused": list(self._failed.values()),
+        }
+        
+    def log_report(self) -> None:
+        """Log a one-line summary of the report."""
+        report = self.report()
+        stages = ", ".join(
+            f"{stage} {info['cpu_ms_per_entry']:.2f}ms cpu/{info['wall_ms_per_entry']:.2f}ms wall"
+            for stage, info in report["stages"].items() if info["entries"]
+        )
+        logger.info("Resources: %.2f cores, %d OpenCV threads, throttled %.1fs; %s",
+                    report["process_cores"], report["opencv_threads"], report["throttled_s"], stages)
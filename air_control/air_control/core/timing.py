@@ -0,0 +1,109 @@
+"""Per-frame timestamps propagated through the pipeline stages."""
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+@dataclass
+class FrameTiming:
+    """Capture time and stage completion times of a single frame.
+    
+    All times come from time.perf_counter(). `source_frame_id` and
+    `source_capture_time` identify the frame the landmarks were computed
+    from, which differs from the frame itself when a backend returns
+    results asynchronously.
+    """
+    frame_id: int
+    capture_time: Optional[float] = None
+    stages: Dict[str, float] = field(default_factory=dict)
+    source_frame_id: Optional[int] = None
+    source_capture_time: Optional[float] = None
+    
+    @property
+    def glass_time(self) -> Optional[float]:
+        """Capture time of the frame the landmarks came from."""
+        if self.source_capture_time is not None:
+            return self.source_capture_time
+        return self.capture_time
+        
+    def since_capture(self, stage: str) -> Optional[float]:
+        """Time from capture to the end of a stage.
+        
+        Args:
+            stage: Name of the stage
+            
+        Returns:
+            Elapsed seconds, None if the stage or capture time is missing
+        """
+        if stage not in self.stages or self.glass_time is None:
+            return None
+        return self.stages[stage] - self.glass_time
+
+class FrameTimeline:
+    """Records stage timestamps for the frame currently in flight.
+    
+    Stages call `mark(name)` when they finish; the span of a stage runs
+    from the previous mark (or the start of the frame) to its own mark.
+    Stage listeners receive `(timing, stage, start, end)` for each mark
+    and frame listeners receive the completed FrameTiming.
+    """
+    
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        """Initialize the timeline.
+        
+        Args:
+            clock: Monotonic clock returning seconds
+        """
+        self.clock = clock
+        self.current: Optional[FrameTiming] = None
+        self.stage_listeners: List[Callable[[FrameTiming, str, float, float], None]] = []
+        self.frame_listeners: List[Callable[[FrameTiming], None]] = []
+        self._last_mark = 0.0
+        
+    def begin(self, frame_id: int, capture_time: Optional[float] = None) -> FrameTiming:
+        """Start timing a new frame.
+        
+        Args:
+            frame_id: Sequence number of the frame
+            capture_time: Capture time if already known
+            
+        Returns:
+            Timing record for the frame
+        """
+        self.current = FrameTiming(frame_id, capture_time)
+        self._last_mark = self.clock()
+        return self.current
+        
+    def mark(self, stage: str) -> None:
+        """Record the end of a stage for the current frame.
+        
+        Args:
+            stage: Name of the stage that just finished
+        """
+        timing = self.current
+        if timing is None:
+            return
+        now = self.clock()
+        start, self._last_mark = self._last_mark, now
+        timing.stages[stage] = now
+        for listener in self.stage_listeners:
+            listener(timing, stage, start, now)
+            
+    def end(self) -> Optional[FrameTiming]:
+        """Finish the current frame and notify frame listeners.
+        
+        Returns:
+            The completed timing record, None if no frame was in flight
+        """
+        timing, self.current = self.current, None
+        if timing is not None:
+            for listener in self.frame_listeners:
+                listener(timing)
+        return timing
+        
+    def discard(self) -> None:
+        """Drop the current frame without notifying frame listeners.
+        
+        Used when a frame was begun but never produced, e.g. when the
+        camera read failed.
+        """
+        self.current = None
@@ -0,0 +1,187 @@
+"""Typed events and buffering for the asynchronous event stream."""
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, FrozenSet, List, Optional
+
+import mediapipe as mp
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+@dataclass(frozen=True)
+class GestureState:
+    """Gesture and pointer state derived from a single frame.
+    
+    `rules` holds the names of the declarative gesture rules that hold.
+    `swipe` is the direction of a swipe completed in this frame and
+    `scroll` the scroll steps from circling, positive is up.
+    """
+    screen_x: int
+    screen_y: int
+    left_click: bool
+    right_click: bool
+    drag: bool
+    rules: FrozenSet[str] = frozenset()
+    swipe: Optional[str] = None
+    scroll: int = 0
+
+@dataclass(frozen=True)
+class Event:
+    """Base class for all events.
+    
+    `timestamp` is the capture time of the frame on the time.perf_counter() clock.
+    """
+    timestamp: float
+    frame_id: int
+
+@dataclass(frozen=True)
+class LandmarksEvent(Event):
+    """Hand landmarks for a frame, None when no hand is visible."""
+    hand_landmarks: Optional[mp.framework.formats.landmark_pb2.NormalizedLandmarkList]
+
+@dataclass(frozen=True)
+class PointerEvent(Event):
+    """Pointer position in screen coordinates, before smoothing."""
+    x: int
+    y: int
+
+@dataclass(frozen=True)
+class GestureEvent(Event):
+    """Press or release of a gesture."""
+    gesture: str
+    pressed: bool
+
+@dataclass(frozen=True)
+class SwipeEvent(Event):
+    """Completed swipe, direction is "left", "right", "up" or "down"."""
+    direction: str
+
+@dataclass(frozen=True)
+class ScrollEvent(Event):
+    """Scroll steps from a circling hand, positive is up."""
+    amount: int
+
+class EventTranslator:
+    """Turns per-frame gesture state into press/release events.
+    
+    Declarative gesture rules produce events under their own names;
+    motion gestures produce SwipeEvent and ScrollEvent.
+    """
+    
+    GESTURES = ("left_click", "right_click", "drag")
+    
+    def __init__(self):
+        self.pressed = dict.fromkeys(self.GESTURES, False)
+        self.active_rules: FrozenSet[str] = frozenset()
+        
+    def translate(self, hand_landmarks: Optional[mp.framework.formats.landmark_pb2.NormalizedLandmarkList],
+                  state: Optional[GestureState], timestamp: float, frame_id: int) -> List[Event]:
+        """Build the events for one frame.
+        
+        Args:
+            hand_landmarks: Hand landmarks for the frame, None if no hand
+            state: Gesture state for the frame, None if no hand
+            timestamp: Capture time of the frame
+            frame_id: Sequence number of the frame
+            
+        Returns:
+            Events for the frame; gestures still pressed when the hand is
+            lost are released
+        """
+        events: List[Event] = [LandmarksEvent(timestamp, frame_id, hand_landmarks)]
+        if state:
+            events.append(PointerEvent(timestamp, frame_id, state.screen_x, state.screen_y))
+            
+        for gesture in self.GESTURES:
+            pressed = bool(state and getattr(state, gesture))
+            if pressed != self.pressed[gesture]:
+                self.pressed[gesture] = pressed
+                events.append(GestureEvent(timestamp, frame_id, gesture, pressed))
+                
+        active_rules = state.rules if state else frozenset()
+        for rule in sorted(active_rules - self.active_rules):
+            events.append(GestureEvent(timestamp, frame_id, rule, True))
+        for rule in sorted(self.active_rules - active_rules):
+            events.append(GestureEvent(timestamp, frame_id, rule, False))
+        self.active_rules = active_rules
+        
+        if state and state.swipe:
+            events.append(SwipeEvent(timestamp, frame_id, state.swipe))
+        if state and state.scroll:
+            events.append(ScrollEvent(timestamp, frame_id, state.scroll))
+        return events
+
+class EventBuffer:
+    """Bounded event queue with a configurable overflow policy.
+    
+    Only samples that a later event supersedes, LandmarksEvent and
+    PointerEvent, are ever dropped. Press/release edges, swipes and
+    scrolls are always delivered; when the buffer is full of them they
+    are queued past `max_size`, so a slow consumer never sees a gesture
+    stuck pressed.
+    
+    - "drop_oldest": discard the oldest queued sample to make room
+    - "drop_newest": discard an incoming sample, or the oldest queued
+      sample to make room for an edge
+    - "block": wait until the consumer makes room
+    """
+    
+    SAMPLES = (LandmarksEvent, PointerEvent)
+    
+    def __init__(self, max_size: int = 64, overflow: str = "drop_oldest"):
+        """Initialize the buffer.
+        
+        Args:
+            max_size: Maximum number of queued events
+            overflow: Policy applied when the buffer is full
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow!r}")
+            
+        self.max_size = max_size
+        self.overflow = overflow
+        self.dropped = 0
+        self._events: Deque[Optional[Event]] = deque()
+        self._changed = asyncio.Condition()
+        
+    def __len__(self) -> int:
+        return len(self._events)
+        
+    def _make_room(self, event: Event) -> bool:
+        """Drop a sample for an incoming event. Returns whether to queue the event."""
+        if self.overflow == "drop_newest" and isinstance(event, self.SAMPLES):
+            self.dropped += 1
+            return False
+        for index, queued in enumerate(self._events):
+            if isinstance(queued, self.SAMPLES):
+                del self._events[index]
+                self.dropped += 1
+                return True
+        if isinstance(event, self.SAMPLES):
+            # Nothing but edges queued, the sample gives way
+            self.dropped += 1
+            return False
+        return True
+        
+    async def put(self, event: Optional[Event]) -> None:
+        """Queue an event, applying the overflow policy when full.
+        
+        Args:
+            event: Event to queue, None marks the end of the stream
+        """
+        async with self._changed:
+            if event is not None and len(self._events) >= self.max_size:
+                if self.overflow == "block":
+                    await self._changed.wait_for(lambda: len(self._events) < self.max_size)
+                elif not self._make_room(event):
+                    return
+            self._events.append(event)
+            self._changed.notify_all()
+        
+    async def get(self) -> Optional[Event]:
+        """Wait for the next event; None marks the end of the stream."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._events)
+            event = self._events.popleft()
+            self._changed.notify_all()
+            return event
@@ -12,21 +12,32 @@ class ClickGesture(BaseGesture):
         super().__init__()
         self.threshold = threshold
     
-    def detect(self, hand_landmarks: mp.framework.formats.landmark_pb2.NormalizedLandmarkList) -> Tuple[bool, bool]:
-        """Detect both left and right click gestures.
+    def distances(self, hand_landmarks: mp.framework.formats.landmark_pb2.NormalizedLandmarkList) -> Tuple[float, float]:
+        """Measure the thumb tip's distance to the index and pinky tips.
         
         Args:
             hand_landmarks: MediaPipe hand landmarks
             
         Returns:
-            Tuple[bool, bool]: (left_click, right_click) detection results
+            Tuple[float, float]: (index_distance, pinky_distance)
         """
         index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
         thumb_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP]
         pinky_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_TIP]
-
+        
         index_distance = self.calculate_distance(index_tip, thumb_tip)
         pinky_distance = self.calculate_distance(pinky_tip, thumb_tip)
-
+        return index_distance, pinky_distance
+        
+    def detect(self, hand_landmarks: mp.framework.formats.landmark_pb2.NormalizedLandmarkList) -> Tuple[bool, bool]:
+        """Detect both left and right click gestures.
+        
+        Args:
+            hand_landmarks: MediaPipe hand landmarks
+            
+        Returns:
+            Tuple[bool, bool]: (left_click, right_click) detection results
+        """
+        index_distance, pinky_distance = self.distances(hand_landmarks)
         return (index_distance < self.threshold,
                 pinky_distance < self.threshold)
@@ -0,0 +1,278 @@
+"""Gesture classification with a k-nearest-neighbour index over normalized landmarks."""
+from typing import List, Optional, Sequence, Tuple, Union
+
+import mediapipe as mp
+import numpy as np
+
+from ..utils.landmarks import MIDDLE_FINGER_MCP, WRIST, landmarks_to_array, normalize_landmarks
+from .base import BaseGesture
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+NO_GESTURE = "none"
+
+def landmark_features(points: np.ndarray, aspect: float = 1.0) -> np.ndarray:
+    """Compute classifier features from landmarks.
+    
+    Features are the normalized x and y coordinates of the 20 non-wrist
+    landmarks. Depth is left out, as MediaPipe's z estimate is too noisy
+    to separate poses.
+    
+    Args:
+        points: Array of shape (..., 21, 3) with normalized x, y, z coordinates
+        aspect: Width / height of the image
+        
+    Returns:
+        Array of shape (..., 40)
+    """
+    normalized = normalize_landmarks(points, aspect)
+    return normalized[..., 1:, :2].reshape(normalized.shape[:-2] + (-1,))
+
+def _hand_features(points: np.ndarray, aspect: float) -> np.ndarray:
+    """Compute landmark_features() of a single hand.
+    
+    Same result as the batched version, but only the x and y columns are
+    transformed and the rotation is built from Python floats, which more
+    than halves the cost of a single (21, 3) array.
+    """
+    xy = (points[:, :2] - points[WRIST, :2]) * np.array([aspect, 1.0], dtype=np.float32)
+    vx, vy = float(xy[MIDDLE_FINGER_MCP, 0]), float(xy[MIDDLE_FINGER_MCP, 1])
+    squared = max(vx * vx + vy * vy, 1e-12)
+    rotation = np.array([[-vy, -vx], [vx, -vy]], dtype=np.float32) / np.float32(squared)
+    return (xy[1:] @ rotation).ravel()
+
+class _BruteForceIndex:
+    """Exact nearest-neighbour search with precomputed norms.
+    
+    Used when SciPy is not installed; answers queries with one matrix
+    product per batch.
+    """
+    
+    def __init__(self, data: np.ndarray):
+        self.data = data
+        self.norms = np.einsum("ij,ij->i", data, data)
+        
+    def query(self, x: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return distances and indices of the k nearest samples for each row of x."""
+        if x.ndim == 1:
+            distances, indices = self.query(x[None], k)
+            return distances[0], indices[0]
+        squared = self.norms[None, :] - 2 * x @ self.data.T + np.einsum("ij,ij->i", x, x)[:, None]
+        k = min(k, len(self.data))
+        if k < len(self.data):
+            indices = np.argpartition(squared, k - 1, axis=1)[:, :k]
+        else:
+            indices = np.broadcast_to(np.arange(k), (len(x), k))
+        nearest = np.take_along_axis(squared, indices, axis=1)
+        order = np.argsort(nearest, axis=1)
+        indices = np.take_along_axis(indices, order, axis=1)
+        distances = np.sqrt(np.maximum(np.take_along_axis(nearest, order, axis=1), 0))
+        return distances, indices
+
+class KNNGestureClassifier:
+    """Classifies hand poses by their nearest labeled training samples.
+    
+    Landmarks are normalized for translation, scale and in-plane rotation
+    (see `normalize_landmarks`), so the model works at any distance from
+    the camera. Features are projected onto their first `n_components`
+    principal components, which keep almost all of the pose variance and
+    keep the KD-tree efficient. Samples are indexed with a SciPy KD-tree
+    when available, otherwise with an exact brute-force index. Neighbours vote weighted by
+    inverse distance; queries farther than `max_distance` from every
+    sample are classified as NO_GESTURE.
+    """
+    
+    def __init__(self, k: int = 5, max_distance: Optional[float] = None, aspect: float = 4 / 3,
+                 n_components: Optional[int] = 8):
+        """Initialize an untrained classifier.
+        
+        Args:
+            k: Number of neighbours that vote
+            max_distance: Reject queries whose nearest sample is farther, in palm units
+            aspect: Width / height of the camera image
+            n_components: Number of principal components kept, None to keep all features
+        """
+        self.k = k
+        self.max_distance = max_distance
+        self.aspect = aspect
+        self.n_components = n_components
+        self.mean: Optional[np.ndarray] = None
+        self.components: Optional[np.ndarray] = None
+        self.classes: List[str] = []
+        self.features: Optional[np.ndarray] = None
+        self.labels: Optional[np.ndarray] = None
+        self.index = None
+        
+    def fit(self, points: np.ndarray, labels: Sequence[str]) -> "KNNGestureClassifier":
+        """Build the index from labeled samples.
+        
+        Args:
+            points: Array of shape (N, 21, 3) with landmarks of each sample
+            labels: Gesture name of each sample, NO_GESTURE for negatives
+            
+        Returns:
+            The classifier
+        """
+        classes, encoded = np.unique(np.asarray(labels, dtype=str), return_inverse=True)
+        self.classes = [str(c) for c in classes]
+        self.labels = encoded.astype(np.int16)
+        
+        features = landmark_features(points, self.aspect)
+        self.mean = features.mean(axis=0)
+        if self.n_components is None:
+            self.components = np.eye(features.shape[1], dtype=np.float32)
+        else:
+            _, _, vt = np.linalg.svd(features - self.mean, full_matrices=False)
+            self.components = vt[:self.n_components].T.astype(np.float32)
+        self.features = self._project(features)
+        self._build_index()
+        return self
+        
+    def _project(self, features: np.ndarray) -> np.ndarray:
+        """Project features onto the kept principal components."""
+        return ((features - self.mean) @ self.components).astype(np.float32)
+        
+    def _build_index(self) -> None:
+        """Create the nearest-neighbour index over the training features."""
+        if cKDTree is not None:
+            self.index = cKDTree(self.features)
+        else:
+            self.index = _BruteForceIndex(self.features)
+        
+    def predict_batch(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Classify many hands at once.
+        
+        Args:
+            points: Array of shape (M, 21, 3)
+            
+        Returns:
+            Tuple containing:
+                - Array of M gesture names
+                - Distance from each query to its nearest sample
+        """
+        if self.index is None:
+            raise RuntimeError("The classifier has not been trained")
+            
+        queries = self._project(landmark_features(points, self.aspect))
+        count, n_classes = len(queries), len(self.classes)
+        k = min(self.k, len(self.features))
+        distances, indices = self.index.query(queries, k=k)
+        distances = np.asarray(distances, dtype=np.float64).reshape(count, k)
+        indices = np.asarray(indices).reshape(count, k)
+        
+        # Inverse-distance weighted votes, one bincount for the whole batch
+        bins = (np.arange(count)[:, None] * n_classes + self.labels[indices]).ravel()
+        votes = np.bincount(bins, 1.0 / (distances.ravel() + 1e-6), count * n_classes)
+        names = np.asarray(self.classes, dtype=object)[votes.reshape(count, n_classes).argmax(axis=1)]
+        if self.max_distance is not None:
+            names[distances[:, 0] > self.max_distance] = NO_GESTURE
+        return names, distances[:, 0]
+        
+    def predict(self, hand_landmarks: Union[mp.framework.formats.landmark_pb2.NormalizedLandmarkList, np.ndarray]) -> str:
+        """Classify a single hand.
+        
+        Pass an array where the frame's landmarks are already converted;
+        converting MediaPipe landmarks costs about as much as the
+        classification itself.
+        
+        Args:
+            hand_landmarks: MediaPipe hand landmarks or an array of shape (21, 3)
+            
+        Returns:
+            Gesture name, NO_GESTURE if no sample is close enough
+        """
+        if self.index is None:
+            raise RuntimeError("The classifier has not been trained")
+        points = hand_landmarks
+        if not isinstance(points, np.ndarray):
+            points = landmarks_to_array(hand_landmarks)
+            
+        # Single-query path without the batch bookkeeping
+        query = self._project(_hand_features(np.asarray(points, dtype=np.float32), self.aspect))
+        k = min(self.k, len(self.features))
+        distances, indices = self.index.query(query, k=k)
+        distances = np.asarray(distances, dtype=np.float64).ravel()
+        indices = np.asarray(indices).ravel()
+        
+        label = NO_GESTURE
+        if self.max_distance is None or distances[0] <= self.max_distance:
+            votes = np.bincount(self.labels[indices], 1.0 / (distances + 1e-6), len(self.classes))
+            label = self.classes[int(votes.argmax())]
+        return label
+        
+    def save(self, path: str) -> None:
+        """Save the model as a compressed .npz file.
+        
+        Args:
+            path: Output file
+        """
+        np.savez_compressed(
+            path,
+            features=self.features.astype(np.float16),
+            labels=self.labels,
+            mean=self.mean.astype(np.float32),
+            components=self.components,
+            classes=np.asarray(self.classes),
+            params=np.array([self.k, -1.0 if self.max_distance is None else self.max_distance, self.aspect])
+        )
+        
+    @classmethod
+    def load(cls, path: str) -> "KNNGestureClassifier":
+        """Load a model saved with save() and rebuild its index.
+        
+        Args:
+            path: Model file
+            
+        Returns:
+            The trained classifier
+        """
+        with np.load(path) as data:
+            k, max_distance, aspect = data["params"].tolist()
+            classifier = cls(int(k), None if max_distance < 0 else max_distance, aspect)
+            classifier.classes = [str(c) for c in data["classes"]]
+            classifier.labels = data["labels"]
+            classifier.mean = data["mean"]
+            classifier.components = data["components"]
+            classifier.n_components = classifier.components.shape[1]
+            classifier.features = data["features"].astype(np.float32)
+        classifier._build_index()
+        return classifier
+
+class KNNGesture(BaseGesture):
+    """Gesture detected by a trained k-NN classifier."""
+    
+    def __init__(self, classifier: KNNGestureClassifier, gesture: str):
+        """Initialize the gesture.
+        
+        Args:
+            classifier: Trained classifier, may be shared between gestures
+            gesture: Class name that counts as this gesture
+        """
+        super().__init__()
+        if gesture not in classifier.classes:
+            raise ValueError(f"Gesture {gesture!r} is not one of the trained classes {classifier.classes}")
+        self.classifier = classifier
+        self.gesture = gesture
+        
+    def detect(self, hand_landmarks: Union[mp.framework.formats.landmark_pb2.NormalizedLandmarkList, np.ndarray],
+               label: Optional[str] = None) -> bool:
+        """Detect if the classifier assigns the landmarks to this gesture.
+        
+        Gestures sharing a classifier can be checked against one
+        classification of the frame: call the classifier's predict() once
+        and pass its result to each of them.
+        
+        Args:
+            hand_landmarks: MediaPipe hand landmarks or an array of shape (21, 3)
+            label: Class of this frame from the shared classifier, None to
+                classify the landmarks here
+            
+        Returns:
+            bool: True if gesture is detected, False otherwise
+        """
+        if label is None:
+            label = self.classifier.predict(hand_landmarks)
+        return label == self.gesture
@@ -0,0 +1,93 @@
+"""Motion gestures built on the landmark history."""
+import math
+from typing import Optional
+
+from ..utils.history import LandmarkHistory
+
+class SwipeGesture:
+    """Detects fast, straight hand movements in one of four directions.
+    
+    A swipe is reported when the tracked landmark moved at least
+    `min_distance` palm sizes within the history window along a nearly
+    straight path. Directions are in image coordinates ("left" means
+    towards x = 0). After a swipe the history is cleared and the gesture
+    re-arms once the hand has stayed within `min_distance` for a full
+    window, so one long movement is reported once.
+    """
+    
+    def __init__(self, min_distance: float = 1.5, min_straightness: float = 0.8):
+        """Initialize the swipe gesture.
+        
+        Args:
+            min_distance: Minimum displacement in palm sizes
+            min_straightness: Minimum ratio of displacement to path length
+        """
+        self.min_distance = min_distance
+        self.min_straightness = min_straightness
+        self.armed = True
+        
+    def detect(self, history: LandmarkHistory) -> Optional[str]:
+        """Check the history for a swipe.
+        
+        Args:
+            history: Recent landmark frames
+            
+        Returns:
+            "left", "right", "up" or "down", None if there is no swipe
+        """
+        if history.count < 2:
+            return None
+        dx, dy = history.displacement
+        distance = math.hypot(dx, dy)
+        threshold = self.min_distance * history.palm_size
+        
+        if not self.armed:
+            self.armed = history.count == history.capacity and distance < threshold
+            return None
+        if threshold <= 0 or distance < threshold or history.straightness < self.min_straightness:
+            return None
+            
+        self.armed = False
+        history.clear()
+        if abs(dx) >= abs(dy):
+            return "right" if dx > 0 else "left"
+        return "down" if dy > 0 else "up"
+
+class CircleScrollGesture:
+    """Turns circular hand movements into scroll steps.
+    
+    The hand is circling when the turning angle summed over the history
+    window exceeds `min_turn`. While it is, every `step` radians of
+    further rotation produce one scroll step: clockwise on screen scrolls
+    down (negative), counter-clockwise scrolls up.
+    """
+    
+    def __init__(self, min_turn: float = 2.5, step: float = math.pi / 4):
+        """Initialize the circle gesture.
+        
+        Args:
+            min_turn: Turning angle over the window that starts scrolling, in radians
+            step: Rotation per scroll step, in radians
+        """
+        self.min_turn = min_turn
+        self.step = step
+        self._accumulated = 0.0
+        
+    def detect(self, history: LandmarkHistory) -> int:
+        """Check the history for circling and return the scroll amount.
+        
+        Args:
+            history: Recent landmark frames
+            
+        Returns:
+            Scroll steps for this frame, 0 when the hand is not circling
+        """
+        if abs(history.turning) < self.min_turn:
+            self._accumulated = 0.0
+            return 0
+            
+        # Image y points down, so a positive turn is clockwise on screen
+        self._accumulated += history.last_turn
+        steps = int(self._accumulated / self.step)
+        self._accumulated -= steps * self.step
+        return -steps
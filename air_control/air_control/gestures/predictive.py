@@ -0,0 +1,112 @@
+"""Predictive click onset from the closing velocity of a pinch."""
+import numpy as np
+
+class PredictiveClick:
+    """Fires a pinch click at its predicted contact time.
+    
+    A straight line is fitted to the fingertip distance over the last
+    `window` timestamped frames. While the fingers close steadily (closing
+    speed of at least `min_speed` and a fit with R² of at least
+    `min_confidence`), the time until the distance crosses the threshold
+    is extrapolated. Once contact is predicted within `lead + cancel_window`
+    seconds the click is pending: the cursor should be locked, and the
+    click is cancelled if the fingers stop closing. When contact is
+    predicted within `lead` seconds the click fires. A distance below the
+    threshold always fires, so prediction only ever makes clicks earlier.
+    The click is released when the fingers open again above the threshold.
+    """
+    
+    def __init__(self, threshold: float = 0.025, window: int = 4, lead: float = 0.033,
+                 cancel_window: float = 0.1, min_confidence: float = 0.9, min_speed: float = 0.1):
+        """Initialize the predictor.
+        
+        Args:
+            threshold: Fingertip distance that counts as contact, in normalized units
+            window: Number of frames used for the fit
+            lead: How long before the predicted contact the click fires, in seconds
+            cancel_window: How long before firing the click is pending, in seconds
+            min_confidence: Minimum R² of the distance fit
+            min_speed: Minimum closing speed in normalized units per second
+        """
+        if window < 3:
+            raise ValueError("Predictive clicks need a window of at least 3 frames")
+        self.threshold = threshold
+        self.window = window
+        self.lead = lead
+        self.cancel_window = cancel_window
+        self.min_confidence = min_confidence
+        self.min_speed = min_speed
+        
+        self.timestamps = np.zeros(window)
+        self.distances = np.zeros(window)
+        self.predicted = 0
+        self.cancelled = 0
+        self.reset()
+        
+    def reset(self) -> None:
+        """Forget the distance history and release the click."""
+        self.count = 0
+        self.head = -1
+        self.pending = False
+        self.pressed = False
+        
+    @property
+    def locked(self) -> bool:
+        """Whether the cursor should stay where the click started."""
+        return self.pending or self.pressed
+        
+    def _fit(self):
+        """Fit distance over time, returning (distance now, speed, R²)."""
+        t = self.timestamps - self.timestamps[self.head]
+        d = self.distances
+        t_mean, d_mean = t.mean(), d.mean()
+        dt, dd = t - t_mean, d - d_mean
+        var_t = float(dt @ dt)
+        var_d = float(dd @ dd)
+        if var_t <= 0 or var_d <= 0:
+            return float(d[self.head]), 0.0, 0.0
+        slope = float(dt @ dd) / var_t
+        r_squared = slope * slope * var_t / var_d
+        return d_mean - slope * t_mean, -slope, r_squared
+        
+    def update(self, timestamp: float, distance: float) -> bool:
+        """Add a frame and decide whether the button is pressed.
+        
+        Args:
+            timestamp: Capture time in seconds
+            distance: Fingertip distance in normalized units
+            
+        Returns:
+            True while the click is pressed
+        """
+        self.head = (self.head + 1) % self.window
+        self.timestamps[self.head] = timestamp
+        self.distances[self.head] = distance
+        self.count = min(self.count + 1, self.window)
+        
+        contact = distance < self.threshold
+        if self.count < self.window:
+            self.pressed = contact
+            return self.pressed
+            
+        current, speed, confidence = self._fit()
+        closing = speed >= self.min_speed and confidence >= self.min_confidence
+        if self.pressed:
+            if distance >= self.threshold and speed <= 0:
+                self.pressed = False
+            return self.pressed
+            
+        pending = False
+        if contact:
+            self.pressed = True
+        elif closing:
+            time_to_contact = (current - self.threshold) / speed
+            if time_to_contact <= self.lead:
+                self.pressed = True
+                self.predicted += 1
+            else:
+                pending = time_to_contact <= self.lead + self.cancel_window
+        if self.pending and not pending and not self.pressed:
+            self.cancelled += 1
+        self.pending = pending
+        return self.pressed
@@ -0,0 +1,367 @@
+"""Declarative gesture rules compiled to vectorized predicates.
+
+Rules are defined in the configuration as JSON objects over named
+landmarks (the names of mp.solutions.hands.HandLandmark, or indices):
+
+    "pinch": {"distance": ["THUMB_TIP", "INDEX_FINGER_TIP"], "lt": 0.3}
+    "fist": {"all": [{"flexion": "INDEX", "gt": 0.5}, {"flexion": "MIDDLE", "gt": 0.5}]}
+    "point": {"all": [{"flexion": "INDEX", "lt": 0.1}, {"not": {"rule": "fist"}}]}
+
+Features, all measured in the image plane after normalize_landmarks (palm
+units, wrist at the origin, palm pointing up):
+
+    distance  [a, b]       distance between two landmarks
+    angle     [a, b, c]    angle at b in degrees
+    flexion   finger       0 for a straight finger, towards 1 when curled;
+                           THUMB, INDEX, MIDDLE, RING or PINKY
+    x, y      landmark     coordinate of a landmark
+
+Each feature is compared with one of "lt", "le", "gt", "ge" or
+"between": [low, high]. Comparisons are combined with "all", "any" and
+"not", and {"rule": name} reuses another rule. Each of these is the only
+key of its object.
+
+At load time every rule is compiled into disjunctive normal form. Equal
+features, comparisons and conjunctions are shared between all rules, so
+per frame the work is one feature array, one comparison per operator and
+two boolean matrix products, whatever the number of rules.
+"""
+import numbers
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Set, Tuple, Union
+
+import mediapipe as mp
+import numpy as np
+
+from ..utils.landmarks import landmarks_to_array, normalize_landmarks
+from .base import BaseGesture
+
+FINGERS = {
+    "THUMB": (1, 2, 3, 4),
+    "INDEX": (5, 6, 7, 8),
+    "MIDDLE": (9, 10, 11, 12),
+    "RING": (13, 14, 15, 16),
+    "PINKY": (17, 18, 19, 20),
+}
+FEATURES = ("distance", "angle", "flexion", "x", "y")
+COMBINATORS = ("all", "any", "not", "rule")
+OPERATORS = ("lt", "le", "gt", "ge")
+MAX_TERMS = 1024
+
+# A literal is (atom index, required value); a term is a conjunction of literals
+Term = FrozenSet[Tuple[int, bool]]
+
+def _landmark(name: Union[str, int]) -> int:
+    """Resolve a landmark name or index."""
+    if isinstance(name, int):
+        if not 0 <= name < 21:
+            raise ValueError(f"Landmark index out of range: {name}")
+        return name
+    if not isinstance(name, str):
+        raise ValueError(f"Landmark must be a name or an index: {name!r}")
+    try:
+        return int(mp.solutions.hands.HandLandmark[name.upper()])
+    except KeyError:
+        raise ValueError(f"Unknown landmark: {name!r}") from None
+
+class GestureRules:
+    """A set of declarative gesture rules evaluated together."""
+    
+    def __init__(self, rules: Dict[str, Dict[str, Any]], aspect: float = 4 / 3):
+        """Compile the rules.
+        
+        Args:
+            rules: Rule definitions by gesture name
+            aspect: Width / height of the camera image
+            
+        Raises:
+            ValueError: If a rule is malformed, refers to an unknown rule or
+                landmark, or is recursive
+        """
+        self.definitions = rules
+        self.aspect = aspect
+        self.names = list(rules)
+        
+        self.features: List[Tuple] = []
+        self._feature_index: Dict[Tuple, int] = {}
+        self.atoms: List[Tuple[int, str, float]] = []
+        self._atom_index: Dict[Tuple[int, str, float], int] = {}
+        self._compiled: Dict[str, List[Term]] = {}
+        
+        for name in self.names:
+            self._compile_rule(name, ())
+        self._build()
+        
+    # Compilation
+    
+    def _compile_rule(self, name: str, stack: Tuple[str, ...]) -> List[Term]:
+        """Compile a named rule to DNF, reusing earlier results."""
+        if name in stack:
+            raise ValueError(f"Recursive gesture rule: {' -> '.join(stack + (name,))}")
+        if name not in self.definitions:
+            raise ValueError(f"Unknown gesture rule: {name!r}")
+        if name not in self._compiled:
+            self._compiled[name] = self._dnf(self.definitions[name], False, stack + (name,))
+        return self._compiled[name]
+        
+    def _dnf(self, node: Dict[str, Any], negate: bool, stack: Tuple[str, ...]) -> List[Term]:
+        """Convert a rule node to a list of conjunctions, pushing negation to the leaves."""
+        if not isinstance(node, dict) or len(node) == 0:
+            raise ValueError(f"Invalid rule node: {node!r}")
+        # A combinator is the only key of its node, anything next to it
+        # would otherwise be ignored
+        if any(key in node for key in COMBINATORS) and len(node) != 1:
+            raise ValueError(f"A rule node with one of {COMBINATORS} must have no other keys: {node!r}")
+            
+        if "not" in node:
+            return self._dnf(node["not"], not negate, stack)
+        if "rule" in node:
+            if not isinstance(node["rule"], str):
+                raise ValueError(f"Expected a rule name: {node!r}")
+            terms = self._compile_rule(node["rule"], stack)
+            return self._negate(terms) if negate else terms
+        if "all" in node or "any" in node:
+            conjunctive = ("all" in node) != negate
+            children = node.get("all", node.get("any"))
+            if not isinstance(children, (list, tuple)):
+                raise ValueError(f"Expected a list of rule nodes: {node!r}")
+            children = [self._dnf(child, negate, stack) for child in children]
+            if not conjunctive:
+                return self._simplify([term for child in children for term in child])
+            terms: List[Term] = [frozenset()]
+            for child in children:
+                terms = self._simplify([a | b for a in terms for b in child])
+            return terms
+            
+        atoms = self._comparison_atoms(node)
+        if not negate:
+            return [frozenset((atom, True) for atom in atoms)]
+        return [frozenset([(atom, False)]) for atom in atoms]
+        
+    def _negate(self, terms: List[Term]) -> List[Term]:
+        """Negate a DNF expression (De Morgan) and convert it back to DNF."""
+        result: List[Term] = [frozenset()]
+        for term in terms:
+            result = self._simplify([r | {(atom, not value)} for r in result for atom, value in term])
+        return result
+        
+    @staticmethod
+    def _simplify(terms: List[Term]) -> List[Term]:
+        """Drop contradictory and duplicate terms and enforce the size limit."""
+        unique: List[Term] = []
+        seen: Set[Term] = set()
+        for term in terms:
+            atoms = [atom for atom, _ in term]
+            if len(atoms) != len(set(atoms)) or term in seen:
+                continue
+            seen.add(term)
+            unique.append(term)
+        if len(unique) > MAX_TERMS:
+            raise ValueError(f"Gesture rule expands to more than {MAX_TERMS} terms")
+        return unique
+        
+    def _comparison_atoms(self, node: Dict[str, Any]) -> List[int]:
+        """Register the feature and comparisons of a leaf node."""
+        kinds = [key for key in node if key in FEATURES]
+        if len(kinds) != 1:
+            raise ValueError(f"Comparison needs exactly one of {FEATURES}: {node!r}")
+        kind = kinds[0]
+        feature = self._feature(kind, node[kind])
+        
+        comparisons = []
+        for key, value in node.items():
+            if key == kind:
+                continue
+            if key == "between":
+                if not isinstance(value, (list, tuple)) or len(value) != 2:
+                    raise ValueError(f"Expected [low, high] for 'between': {node!r}")
+                low, high = value
+                comparisons += [("ge", low), ("le", high)]
+            elif key in OPERATORS:
+                comparisons.append((key, value))
+            else:
+                raise ValueError(f"Unknown operator {key!r} in {node!r}")
+        if not comparisons:
+            raise ValueError(f"Comparison without an operator: {node!r}")
+            
+        atoms = []
+        for op, threshold in comparisons:
+            if isinstance(threshold, bool) or not isinstance(threshold, numbers.Real):
+                raise ValueError(f"Threshold must be a number: {node!r}")
+            key = (feature, op, float(threshold))
+            if key not in self._atom_index:
+                self._atom_index[key] = len(self.atoms)
+                self.atoms.append(key)
+            atoms.append(self._atom_index[key])
+        return atoms
+        
+    def _feature(self, kind: str, args: Any) -> int:
+        """Register a feature and return its column."""
+        if kind in ("distance", "angle") and not isinstance(args, (list, tuple)):
+            raise ValueError(f"Expected a list of landmarks for {kind!r}: {args!r}")
+        if kind == "distance":
+            a, b = sorted(_landmark(arg) for arg in args)
+            key = (kind, a, b)
+        elif kind == "angle":
+            a, b, c = (_landmark(arg) for arg in args)
+            key = (kind,) + (min(a, c), b, max(a, c))
+        elif kind == "flexion":
+            if not isinstance(args, str) or args.upper() not in FINGERS:
+                raise ValueError(f"Unknown finger: {args!r}")
+            key = (kind, args.upper())
+        else:
+            key = (kind, _landmark(args))
+            
+        if key not in self._feature_index:
+            self._feature_index[key] = len(self.features)
+            self.features.append(key)
+        return self._feature_index[key]
+        
+    def _build(self) -> None:
+        """Build the index arrays and matrices used at evaluation time."""
+        def columns(kind: str) -> Tuple[np.ndarray, np.ndarray]:
+            selected = [(i, f[1:]) for i, f in enumerate(self.features) if f[0] == kind]
+            cols = np.array([i for i, _ in selected], dtype=np.intp)
+            args = [a for _, a in selected]
+            return cols, args
+            
+        self._distance_cols, args = columns("distance")
+        self._distance_idx = np.array(args, dtype=np.intp).reshape(-1, 2)
+        self._angle_cols, args = columns("angle")
+        self._angle_idx = np.array(args, dtype=np.intp).reshape(-1, 3)
+        self._flexion_cols, args = columns("flexion")
+        self._flexion_idx = np.array([FINGERS[finger] for finger, in args], dtype=np.intp).reshape(-1, 4)
+        self._x_cols, args = columns("x")
+        self._x_idx = np.array([lm for lm, in args], dtype=np.intp)
+        self._y_cols, args = columns("y")
+        self._y_idx = np.array([lm for lm, in args], dtype=np.intp)
+        
+        self._comparisons = []
+        for op in OPERATORS:
+            atoms = [i for i, (_, atom_op, _) in enumerate(self.atoms) if atom_op == op]
+            if atoms:
+                self._comparisons.append((
+                    getattr(np, {"lt": "less", "le": "less_equal", "gt": "greater", "ge": "greater_equal"}[op]),
+                    np.array(atoms, dtype=np.intp),
+                    np.array([self.atoms[i][0] for i in atoms], dtype=np.intp),
+                    np.array([self.atoms[i][2] for i in atoms], dtype=np.float32),
+                ))
+                
+        # Shared conjunctions: which atoms each needs true or false, and
+        # which rules each contributes to
+        terms: List[Term] = []
+        term_index: Dict[Term, int] = {}
+        membership = []
+        for rule, name in enumerate(self.names):
+            for term in self._compiled[name]:
+                if term not in term_index:
+                    term_index[term] = len(terms)
+                    terms.append(term)
+                membership.append((term_index[term], rule))
+                
+        self._required_true = np.zeros((len(self.atoms), len(terms)), dtype=np.float32)
+        self._required_false = np.zeros((len(self.atoms), len(terms)), dtype=np.float32)
+        for t, term in enumerate(terms):
+            for atom, value in term:
+                (self._required_true if value else self._required_false)[atom, t] = 1
+        self._term_rules = np.zeros((len(terms), len(self.names)), dtype=np.float32)
+        for t, rule in membership:
+            self._term_rules[t, rule] = 1
+        self.term_count = len(terms)
+        
+    # Evaluation
+    
+    def feature_values(self, points: np.ndarray) -> np.ndarray:
+        """Compute the shared feature array.
+        
+        Args:
+            points: Array of shape (M, 21, 3) with normalized landmarks
+            
+        Returns:
+            Array of shape (M, n_features)
+        """
+        p = normalize_landmarks(points, self.aspect)[..., :2]
+        values = np.empty((len(p), len(self.features)), dtype=np.float32)
+        if len(self._distance_cols):
+            d = p[:, self._distance_idx[:, 0]] - p[:, self._distance_idx[:, 1]]
+            values[:, self._distance_cols] = np.sqrt(np.einsum("mfi,mfi->mf", d, d))
+        if len(self._angle_cols):
+            u = p[:, self._angle_idx[:, 0]] - p[:, self._angle_idx[:, 1]]
+            v = p[:, self._angle_idx[:, 2]] - p[:, self._angle_idx[:, 1]]
+            dot = np.einsum("mfi,mfi->mf", u, v)
+            norms = np.sqrt(np.einsum("mfi,mfi->mf", u, u) * np.einsum("mfi,mfi->mf", v, v))
+            values[:, self._angle_cols] = np.degrees(np.arccos(np.clip(dot / np.maximum(norms, 1e-9), -1, 1)))
+        if len(self._flexion_cols):
+            chain = p[:, self._flexion_idx]
+            segments = np.sqrt(np.square(np.diff(chain, axis=2)).sum(axis=-1)).sum(axis=-1)
+            chord = np.sqrt(np.square(chain[:, :, 3] - chain[:, :, 0]).sum(axis=-1))
+            values[:, self._flexion_cols] = 1 - chord / np.maximum(segments, 1e-9)
+        if len(self._x_cols):
+            values[:, self._x_cols] = p[:, self._x_idx, 0]
+        if len(self._y_cols):
+            values[:, self._y_cols] = p[:, self._y_idx, 1]
+        return values
+        
+    def evaluate(self, points: np.ndarray) -> np.ndarray:
+        """Evaluate every rule for a batch of hands.
+        
+        Args:
+            points: Array of shape (M, 21, 3) with normalized landmarks
+            
+        Returns:
+            Boolean array of shape (M, n_rules), columns in the order of `names`
+        """
+        values = self.feature_values(points)
+        atoms = np.empty((len(values), len(self.atoms)), dtype=np.float32)
+        for compare, atom_cols, feature_cols, thresholds in self._comparisons:
+            atoms[:, atom_cols] = compare(values[:, feature_cols], thresholds)
+            
+        # A term holds when none of its literals is violated
+        violations = (1 - atoms) @ self._required_true + atoms @ self._required_false
+        return ((violations == 0).astype(np.float32) @ self._term_rules) > 0
+        
+    def detect(self, hand_landmarks: Union[mp.framework.formats.landmark_pb2.NormalizedLandmarkList, np.ndarray]) -> Dict[str, bool]:
+        """Evaluate every rule for one hand.
+        
+        Args:
+            hand_landmarks: MediaPipe hand landmarks or an array of shape (21, 3)
+            
+        Returns:
+            New dictionary mapping each rule name to whether it holds
+        """
+        points = hand_landmarks
+        if not isinstance(points, np.ndarray):
+            points = landmarks_to_array(hand_landmarks)
+        result = self.evaluate(points[None])[0]
+        return dict(zip(self.names, result.tolist()))
+
+class RuleGesture(BaseGesture):
+    """Gesture defined by a declarative rule."""
+    
+    def __init__(self, rules: GestureRules, name: str):
+        """Initialize the gesture.
+        
+        Args:
+            rules: Compiled rules, may be shared between gestures
+            name: Name of the rule that defines this gesture
+        """
+        super().__init__()
+        if name not in rules.names:
+            raise ValueError(f"Unknown gesture rule: {name!r}")
+        self.rules = rules
+        self.name = name
+        
+    def detect(self, hand_landmarks: mp.framework.formats.landmark_pb2.NormalizedLandmarkList,
+               results: Optional[Mapping[str, bool]] = None) -> bool:
+        """Detect if the rule holds for the given hand landmarks.
+        
+        Args:
+            hand_landmarks: MediaPipe hand landmarks
+            results: This frame's GestureRules.detect() result, shared by
+                all gestures over the same rules; None to evaluate here
+            
+        Returns:
+            bool: True if gesture is detected, False otherwise
+        """
+        if results is None:
+            results = self.rules.detect(hand_landmarks)
+        return results[self.name]
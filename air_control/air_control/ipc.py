@@ -0,0 +1,293 @@
+"""Shared-memory publishing of per-frame landmark and gesture records.
+
+One AirControl process owns the camera and the model and writes a fixed
+layout record per frame into a ring of slots in a memory-mapped file.
+Any number of local processes can open the same file with
+`LandmarkSubscriber` and read the latest record as NumPy views into the
+mapping, without copies and without the publisher knowing about them.
+
+Each slot carries its sequence number before and after the payload.
+The publisher bumps the first, writes the payload, writes the second
+and then advances the header's `write_seq`. A reader that finds both
+numbers equal to the sequence it expects has a consistent record, and
+a record stays valid until the publisher wraps around the ring.
+"""
+import getpass
+import mmap
+import os
+import stat
+import tempfile
+import time
+from typing import Optional
+
+import mediapipe as mp
+import numpy as np
+
+from .events import GestureState
+from .utils.landmarks import NUM_LANDMARKS, landmarks_to_array
+
+MAGIC = b"ACRB"
+VERSION = 1
+HEADER_SIZE = 64
+
+GESTURE_BITS = {
+    "left_click": 1 << 0,
+    "right_click": 1 << 1,
+    "drag": 1 << 2,
+}
+
+FLAG_HAND_PRESENT = 1 << 0
+
+HEADER_DTYPE = np.dtype({
+    "names": ["magic", "version", "slot_count", "slot_size", "write_seq"],
+    "formats": ["S4", "<u4", "<u4", "<u4", "<u8"],
+    "offsets": [0, 4, 8, 12, 16],
+    "itemsize": HEADER_SIZE,
+})
+
+RECORD_DTYPE = np.dtype([
+    ("seq_begin", "<u8"),
+    ("timestamp_ns", "<i8"),
+    ("frame_id", "<u8"),
+    ("flags", "<u4"),
+    ("gestures", "<u4"),
+    ("pointer", "<i4", (2,)),
+    ("landmarks", "<f4", (NUM_LANDMARKS, 3)),
+    ("seq_end", "<u8"),
+])
+
+def _private_dir(path: str) -> str:
+    """Create a directory only the current user can access, or check an existing one.
+    
+    Raises:
+        PermissionError: If the path exists but is not such a directory
+    """
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(path)
+    foreign = hasattr(os, "getuid") and info.st_uid != os.getuid()
+    if not stat.S_ISDIR(info.st_mode) or foreign or info.st_mode & 0o077:
+        raise PermissionError(f"{path} is not a directory private to this user")
+    return path
+
+def default_path() -> str:
+    """Return the default location of the ring file.
+    
+    The ring lives in $XDG_RUNTIME_DIR, or else in a directory of the
+    temp dir that only the current user can access, so other local users
+    can neither read the hand stream nor plant a file in its place.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_dir:
+        user = os.getuid() if hasattr(os, "getuid") else getpass.getuser()
+        runtime_dir = _private_dir(os.path.join(tempfile.gettempdir(), f"air_control-{user}"))
+    return os.path.join(runtime_dir, "air_control.ring")
+
+def _close_mapping(owner) -> None:
+    """Drop an owner's views of its mapping and close it if nothing else uses it."""
+    del owner.header, owner.slots
+    try:
+        owner._mmap.close()
+    except BufferError:
+        # Outstanding record views, the mapping is freed with them
+        pass
+    owner._file.close()
+
+class LandmarkPublisher:
+    """Writes per-frame records into a memory-mapped ring."""
+    
+    def __init__(self, path: Optional[str] = None, slot_count: int = 16):
+        """Create or replace the ring file.
+        
+        The ring is written to a new file readable only by the current
+        user and renamed over `path`, so an existing file or symlink at
+        `path` is replaced rather than written through, and subscribers
+        of a previous ring keep their own mapping.
+        
+        Args:
+            path: Location of the ring file, defaults to default_path()
+            slot_count: Number of records kept before the ring wraps
+        """
+        self.path = path or default_path()
+        self.slot_count = slot_count
+        size = HEADER_SIZE + slot_count * RECORD_DTYPE.itemsize
+        
+        # mkstemp creates the file exclusively with mode 0600
+        fd, temp_path = tempfile.mkstemp(prefix=".air_control-", suffix=".ring",
+                                         dir=os.path.dirname(os.path.abspath(self.path)))
+        self._file = os.fdopen(fd, "r+b")
+        try:
+            self._file.truncate(size)
+            os.replace(temp_path, self.path)
+        except OSError:
+            self._file.close()
+            os.unlink(temp_path)
+            raise
+        self._mmap = mmap.mmap(self._file.fileno(), size)
+        
+        self.header = np.frombuffer(self._mmap, dtype=HEADER_DTYPE, count=1)[0]
+        self.slots = np.frombuffer(self._mmap, dtype=RECORD_DTYPE, count=slot_count, offset=HEADER_SIZE)
+        self.header["magic"] = MAGIC
+        self.header["version"] = VERSION
+        self.header["slot_count"] = slot_count
+        self.header["slot_size"] = RECORD_DTYPE.itemsize
+        self.seq = 0
+        
+    def publish(self, frame_id: int, hand_landmarks: Optional[mp.framework.formats.landmark_pb2.NormalizedLandmarkList],
+                state: Optional[GestureState], timestamp_ns: Optional[int] = None) -> int:
+        """Write the record for one frame.
+        
+        Args:
+            frame_id: Sequence number of the frame
+            hand_landmarks: Hand landmarks for the frame, None if no hand;
+                the slot's landmarks are then NaN
+            state: Gesture state for the frame, None if no hand; the slot's
+                pointer is then (0, 0)
+            timestamp_ns: Capture time from time.monotonic_ns(), defaults to now
+            
+        Returns:
+            Sequence number of the written record
+        """
+        self.seq += 1
+        slot = self.slots[self.seq % self.slot_count]
+        slot["seq_begin"] = self.seq
+        
+        slot["timestamp_ns"] = time.monotonic_ns() if timestamp_ns is None else timestamp_ns
+        slot["frame_id"] = frame_id
+        gestures = 0
+        if state:
+            for name, bit in GESTURE_BITS.items():
+                if getattr(state, name):
+                    gestures |= bit
+            slot["pointer"] = (state.screen_x, state.screen_y)
+        else:
+            slot["pointer"] = 0
+        slot["gestures"] = gestures
+        if hand_landmarks:
+            slot["flags"] = FLAG_HAND_PRESENT
+            slot["landmarks"] = landmarks_to_array(hand_landmarks)
+        else:
+            slot["flags"] = 0
+            slot["landmarks"] = np.nan
+            
+        slot["seq_end"] = self.seq
+        self.header["write_seq"] = self.seq
+        return self.seq
+        
+    def close(self) -> None:
+        """Unmap the ring; subscribers keep their own mappings."""
+        _close_mapping(self)
+
+class LandmarkRecord:
+    """Zero-copy view of a published record.
+    
+    Array attributes are views into the shared mapping. They stay valid
+    until the publisher reuses the slot, which `is_valid()` reports.
+    Without `hand_present` the landmarks are NaN and the pointer is (0, 0),
+    never values left over from an earlier frame.
+    """
+    
+    def __init__(self, slot: np.ndarray, seq: int):
+        self._slot = slot
+        self.seq = seq
+        self.timestamp_ns = int(slot["timestamp_ns"])
+        self.frame_id = int(slot["frame_id"])
+        self.hand_present = bool(slot["flags"] & FLAG_HAND_PRESENT)
+        self.gestures = int(slot["gestures"])
+        self.pointer: np.ndarray = slot["pointer"]
+        self.landmarks: np.ndarray = slot["landmarks"]
+        
+    def gesture(self, name: str) -> bool:
+        """Check whether a gesture was active in this record.
+        
+        Args:
+            name: Gesture name, one of GESTURE_BITS
+            
+        Returns:
+            bool: True if the gesture was active
+        """
+        return bool(self.gestures & GESTURE_BITS[name])
+        
+    def is_valid(self) -> bool:
+        """Check that the slot has not been overwritten since it was read."""
+        return int(self._slot["seq_begin"]) == self.seq
+
+class LandmarkSubscriber:
+    """Reads the latest records from a publisher's ring file."""
+    
+    def __init__(self, path: Optional[str] = None):
+        """Open an existing ring file read-only.
+        
+        Args:
+            path: Location of the ring file, defaults to default_path()
+        """
+        self.path = path or default_path()
+        self._file = open(self.path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        self.header = np.frombuffer(self._mmap, dtype=HEADER_DTYPE, count=1)[0]
+        if bytes(self.header["magic"]) != MAGIC or int(self.header["version"]) != VERSION:
+            raise ValueError(f"{self.path} is not an AirControl ring (version {VERSION})")
+        if int(self.header["slot_size"]) != RECORD_DTYPE.itemsize:
+            raise ValueError(f"{self.path} has an incompatible record layout")
+            
+        self.slot_count = int(self.header["slot_count"])
+        self.slots = np.frombuffer(self._mmap, dtype=RECORD_DTYPE, count=self.slot_count, offset=HEADER_SIZE)
+        self.last_seq = 0
+        self.skipped = 0
+        
+    def latest(self) -> Optional[LandmarkRecord]:
+        """Return the newest record if one arrived since the last call.
+        
+        Slow consumers only ever see the latest record; the records they
+        missed are counted in `skipped`.
+        
+        Returns:
+            The newest record, or None if there is nothing new
+        """
+        for _ in range(3):
+            seq = int(self.header["write_seq"])
+            if seq == self.last_seq:
+                return None
+                
+            slot = self.slots[seq % self.slot_count]
+            if int(slot["seq_end"]) != seq:
+                continue
+            record = LandmarkRecord(slot, seq)
+            if not record.is_valid():
+                continue
+                
+            if self.last_seq:
+                self.skipped += max(0, seq - self.last_seq - 1)
+            self.last_seq = seq
+            return record
+        return None
+        
+    def wait(self, timeout: Optional[float] = None, poll_interval: float = 0.0005) -> Optional[LandmarkRecord]:
+        """Block until a new record is available.
+        
+        Args:
+            timeout: Maximum time to wait in seconds, None to wait forever
+            poll_interval: Sleep between polls in seconds
+            
+        Returns:
+            The newest record, or None on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            record = self.latest()
+            if record is not None:
+                return record
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(poll_interval)
+            
+    def close(self) -> None:
+        """Unmap the ring file.
+        
+        Records still held by the caller keep the mapping alive until they
+        are released.
+        """
+        _close_mapping(self)
@@ -0,0 +1,259 @@
+"""Benchmark history with automatic performance-regression detection.
+
+Runs offline benchmarks of the gesture path and the hand tracking
+backends, repeating each until the 95% bootstrap confidence interval of
+its median is within `--precision` of the median (or `--max-runs` is
+reached). Every run of a benchmark times a batch of frames and records
+the mean milliseconds per frame, so a benchmark's samples are its runs.
+
+Results are appended to a JSON lines history together with a
+fingerprint of the environment (CPU, platform, Python, NumPy, OpenCV and
+MediaPipe versions) and a label, by default the git revision. The
+current results are compared with a baseline from the history: the
+latest entry with `--baseline LABEL`, else the latest entry from the
+same environment. A benchmark has regressed when a one-sided Mann-Whitney
+U test finds it slower at `--alpha` and its median slowed down by more
+than `--threshold`; the exit code is then 1.
+
+Benchmarks:
+    gestures           AirControl.detect_gestures on synthetic landmarks
+    pipeline           detect_gestures and handle_mouse with a null mouse
+    tracker:solutions  HandTracker.process_frame, legacy solutions backend
+    tracker:tasks      TasksHandTracker, waiting for each frame's result;
+                       needs --model
+
+Tracker benchmarks use the frames of `--video`, or a noise frame in
+which no hand is found, which times detection only.
+
+Usage:
+    python -m air_control.tools.bench --history bench.jsonl
+    python -m air_control.tools.bench --bench tracker:solutions --bench tracker:tasks --model hand_landmarker.task --video hand.mp4
+    python -m air_control.tools.bench --history bench.jsonl --baseline v1.2 --threshold 0.05
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from .. import AirControl
+from ..config import AirControlConfig, HandTrackingConfig
+from ..core.hand_tracker import create_hand_tracker
+from ..utils.stats import bootstrap_ci, mann_whitney_greater
+from ..utils.synthetic import StaticFrameSource, SyntheticHandGenerator
+from .latency import load_frames
+
+BENCHMARKS = ("gestures", "pipeline", "tracker:solutions", "tracker:tasks")
+
+def environment() -> Dict[str, object]:
+    """Fingerprint of the machine and library versions results depend on."""
+    cpu = platform.processor()
+    try:
+        with open("/proc/cpuinfo") as f:
+            cpu = next((line.split(":", 1)[1].strip() for line in f if line.startswith("model name")), cpu)
+    except OSError:
+        pass
+    info = {
+        "cpu": cpu,
+        "cpu_count": os.cpu_count(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "mediapipe": getattr(mp, "__version__", None),
+    }
+    info["id"] = hashlib.sha256(json.dumps(info, sort_keys=True).encode()).hexdigest()[:12]
+    return info
+
+def git_revision() -> Optional[str]:
+    """Short git revision of the working directory, None outside a repository."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+def _gesture_benchmark(actuate: bool, frames: int) -> Callable[[], float]:
+    """Benchmark of the gesture path, returning seconds per frame."""
+    config = AirControlConfig()
+    config.mouse.backend = "null"
+    config.show_preview = False
+    config.hand_tracking = HandTrackingConfig(backend="synthetic", synthetic_frames=1)
+    controller = AirControl(config, camera=StaticFrameSource())
+    hands = list(SyntheticHandGenerator(seed=0).generate(frames).landmark_lists())
+    
+    def run() -> float:
+        start = time.perf_counter()
+        for hand_landmarks in hands:
+            state = controller.detect_gestures(hand_landmarks)
+            if actuate and state:
+                controller.handle_mouse(state)
+        return (time.perf_counter() - start) / len(hands)
+    return run
+
+def _tracker_benchmark(backend: str, images: List[np.ndarray], model: Optional[str]) -> Callable[[], float]:
+    """Benchmark of a hand tracking backend, returning seconds per frame."""
+    tracker = create_hand_tracker(HandTrackingConfig(backend=backend, model_asset_path=model))
+    
+    def run() -> float:
+        tracker.reset()
+        start = time.perf_counter()
+        for image in images:
+            tracker.process_frame(image.copy())
+            if backend == "tasks":
+                # Time inference rather than submission
+                tracker.wait_for_result()
+        return (time.perf_counter() - start) / len(images)
+    return run
+
+def measure(run: Callable[[], float], precision: float, min_runs: int, max_runs: int,
+            max_time: float) -> Dict[str, object]:
+    """Repeat a benchmark until the confidence interval of its median is tight.
+    
+    Args:
+        run: Benchmark returning seconds per frame
+        precision: Target half-width of the interval relative to the median
+        min_runs: Runs always made
+        max_runs: Runs made at most
+        max_time: Seconds after which no new run is started
+        
+    Returns:
+        Samples in milliseconds per frame, their median and its interval
+    """
+    run()  # Warm up caches and lazy initialization
+    samples: List[float] = []
+    deadline = time.perf_counter() + max_time
+    while True:
+        samples.append(run() * 1000)
+        if len(samples) < min_runs:
+            continue
+        median = float(np.median(samples))
+        low, high = bootstrap_ci(samples)
+        if (high - low) / 2 <= precision * median or len(samples) >= max_runs or time.perf_counter() > deadline:
+            return {"unit": "ms/frame", "runs": len(samples), "median": median, "ci": [low, high],
+                    "samples": samples}
+
+def load_history(path: str) -> List[Dict]:
+    """Read the entries of a history file, oldest first."""
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def find_baseline(history: List[Dict], label: Optional[str], environment_id: str) -> Optional[Dict]:
+    """Latest entry with the label, or from the same environment without one."""
+    for entry in reversed(history):
+        if label is not None and entry.get("label") == label:
+            return entry
+        if label is None and entry["environment"]["id"] == environment_id:
+            return entry
+    return None
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], alpha: float,
+            threshold: float) -> Dict[str, Dict[str, object]]:
+    """Test each benchmark against its baseline.
+    
+    Args:
+        results: Current benchmark results
+        baseline: Benchmark results of the baseline entry
+        alpha: Significance level of the one-sided test
+        threshold: Smallest relative slowdown of the median that counts
+        
+    Returns:
+        Relative change, p-value and verdict per benchmark in both
+    """
+    comparison = {}
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]
+        change = result["median"] / before["median"] - 1
+        p_slower = mann_whitney_greater(result["samples"], before["samples"])
+        p_faster = mann_whitney_greater(before["samples"], result["samples"])
+        verdict = "unchanged"
+        if p_slower < alpha and change > threshold:
+            verdict = "regression"
+        elif p_faster < alpha and -change > threshold:
+            verdict = "improvement"
+        comparison[name] = {"change": change, "p_slower": p_slower, "p_faster": p_faster, "verdict": verdict}
+    return comparison
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmarks, record them and check for regressions."""
+    parser = argparse.ArgumentParser(description="Benchmark AirControl and detect performance regressions")
+    parser.add_argument("--bench", action="append", choices=BENCHMARKS, help="Benchmark to run, repeatable")
+    parser.add_argument("--history", type=str, default="bench_history.jsonl", help="JSON lines history file")
+    parser.add_argument("--label", type=str, help="Label of this entry, the git revision by default")
+    parser.add_argument("--baseline", type=str, help="Label of the entry to compare with")
+    parser.add_argument("--no-save", action="store_true", help="Do not append the results to the history")
+    parser.add_argument("--frames", type=int, default=2000, help="Synthetic frames per gesture run")
+    parser.add_argument("--video", type=str, help="Video with a visible hand for the tracker benchmarks")
+    parser.add_argument("--tracker-frames", type=int, default=30, help="Frames per tracker run")
+    parser.add_argument("--model", type=str, help="Model asset for the tasks backend")
+    parser.add_argument("--precision", type=float, default=0.02, help="Target CI half-width relative to the median")
+    parser.add_argument("--min-runs", type=int, default=10, help="Minimum runs per benchmark")
+    parser.add_argument("--max-runs", type=int, default=100, help="Maximum runs per benchmark")
+    parser.add_argument("--max-time", type=float, default=60.0, help="Seconds per benchmark before stopping early")
+    parser.add_argument("--alpha", type=float, default=0.01, help="Significance level of the regression test")
+    parser.add_argument("--threshold", type=float, default=0.05, help="Smallest relative slowdown reported")
+    args = parser.parse_args(argv)
+    
+    benches = args.bench or ["gestures", "pipeline", "tracker:solutions"]
+    if "tracker:tasks" in benches and not args.model:
+        parser.error("tracker:tasks needs --model")
+    images = None
+    if any(name.startswith("tracker:") for name in benches):
+        frames = load_frames(args.video, args.tracker_frames, (640, 480))
+        images = [frames[i % len(frames)] for i in range(args.tracker_frames)]
+        
+    results = {}
+    for name in benches:
+        if name.startswith("tracker:"):
+            run = _tracker_benchmark(name.split(":", 1)[1], images, args.model)
+        else:
+            run = _gesture_benchmark(name == "pipeline", args.frames)
+        results[name] = measure(run, args.precision, args.min_runs, args.max_runs, args.max_time)
+        result = results[name]
+        print(f"{name:<18} {result['median']:>9.4f} ms/frame  95% CI [{result['ci'][0]:.4f}, {result['ci'][1]:.4f}]"
+              f"  {result['runs']} runs", flush=True)
+        
+    env = environment()
+    entry = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "label": args.label or git_revision(),
+        "environment": env,
+        "benchmarks": results,
+    }
+    history = load_history(args.history)
+    baseline = find_baseline(history, args.baseline, env["id"])
+    if not args.no_save:
+        with open(args.history, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            
+    if baseline is None:
+        print("No baseline found" + (f" with label {args.baseline!r}" if args.baseline else " for this environment"))
+        return 1 if args.baseline else 0
+    if baseline["environment"]["id"] != env["id"]:
+        changed = [key for key in env if key != "id" and baseline["environment"].get(key) != env[key]]
+        print(f"Warning: baseline was recorded in a different environment ({', '.join(changed)})")
+        
+    comparison = compare(results, baseline["benchmarks"], args.alpha, args.threshold)
+    print(f"\nAgainst {baseline.get('label') or 'unlabeled'} from {baseline['time']}:")
+    for name, result in comparison.items():
+        print(f"{name:<18} {result['change']:>+7.1%}  p={min(result['p_slower'], result['p_faster']):.4f}  "
+              f"{result['verdict']}")
+    regressions = [name for name, result in comparison.items() if result["verdict"] == "regression"]
+    for name in regressions:
+        print(f"{name}: significant regression of {comparison[name]['change']:.1%}", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
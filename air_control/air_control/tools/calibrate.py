@@ -0,0 +1,151 @@
+"""Calibrate the active region the hand comfortably reaches.
+
+In the default sweep mode, move the index finger over the whole area you
+want to use for the cursor for `--duration` seconds; the region is the
+rectangle covering the fingertip positions, minus outliers. With
+`--corners`, hold the fingertip still at the top-left, top-right,
+bottom-right and bottom-left corner in turn; each corner is the median
+position over `--hold` seconds. The resulting `region` section is
+printed and, with `--config`, merged into a config file.
+
+Usage:
+    python -m air_control.tools.calibrate --camera 0 --duration 10 --config config.json
+    python -m air_control.tools.calibrate --corners --hold 2 --crop-inference
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from ..config import CameraConfig, HandTrackingConfig
+from ..core.camera import Camera
+from ..core.hand_tracker import create_hand_tracker
+from ..utils.calibration import order_corners, region_from_samples
+
+INDEX_FINGER_TIP = 8
+CORNER_NAMES = ("top-left", "top-right", "bottom-right", "bottom-left")
+
+def collect(camera, tracker, duration: float, prompt: str, preview: bool = True) -> List[Tuple[float, float]]:
+    """Collect index fingertip positions for a number of seconds.
+    
+    Args:
+        camera: Frame source providing read_frame()
+        tracker: Hand tracker
+        duration: Seconds to collect for
+        prompt: Instruction shown in the preview
+        preview: Whether to show the camera image with the samples
+        
+    Returns:
+        Normalized (x, y) fingertip positions
+    """
+    points: List[Tuple[float, float]] = []
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        success, frame = camera.read_frame()
+        if not success:
+            break
+        hand_landmarks, frame = tracker.process_frame(frame)
+        if hand_landmarks:
+            tip = hand_landmarks.landmark[INDEX_FINGER_TIP]
+            points.append((tip.x, tip.y))
+            
+        if preview:
+            height, width = frame.shape[:2]
+            for x, y in points[-300:]:
+                cv2.circle(frame, (int(x * width), int(y * height)), 2, (0, 255, 0), -1)
+            remaining = max(0.0, end - time.perf_counter())
+            cv2.putText(frame, f"{prompt} ({remaining:.0f}s)", (10, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+            cv2.imshow("AirControl calibration", frame)
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                raise KeyboardInterrupt
+    return points
+
+def merge_region(path: str, region: dict) -> None:
+    """Write the region section into a JSON config file.
+    
+    Other sections are kept. The file is replaced atomically, so a
+    running instance watching it never reads a partial write.
+    
+    Args:
+        path: Path to the JSON config file, created if missing
+        region: Region section
+    """
+    data = {}
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            data = json.load(f)
+    data["region"] = {**data.get("region", {}), **region}
+    
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=4)
+    os.replace(tmp_path, path)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the calibration and print the region section."""
+    parser = argparse.ArgumentParser(description="Calibrate the active hand region")
+    parser.add_argument("--camera", type=int, default=0, help="Camera id")
+    parser.add_argument("--corners", action="store_true", help="Calibrate by holding the four corners")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to sweep")
+    parser.add_argument("--hold", type=float, default=2.0, help="Seconds to hold each corner")
+    parser.add_argument("--trim", type=float, default=0.02, help="Fraction of outlying samples dropped per side")
+    parser.add_argument("--crop-inference", action="store_true", help="Run inference only on the region")
+    parser.add_argument("--config", help="Merge the region into this JSON config file")
+    parser.add_argument("--no-preview", action="store_true", help="Do not show the camera image")
+    args = parser.parse_args(argv)
+    
+    camera = Camera(CameraConfig(camera_id=args.camera))
+    tracker = create_hand_tracker(HandTrackingConfig())
+    preview = not args.no_preview
+    try:
+        success, frame = camera.read_frame()
+        if not success:
+            print(f"Cannot read from camera {args.camera}")
+            return 1
+        aspect = frame.shape[1] / frame.shape[0]
+        
+        if args.corners:
+            corners = []
+            for name in CORNER_NAMES:
+                collect(camera, tracker, 2.0, f"Move to the {name} corner", preview)
+                points = collect(camera, tracker, args.hold, f"Hold the {name} corner", preview)
+                if not points:
+                    print(f"No hand seen at the {name} corner")
+                    return 1
+                corners.append(np.median(points, axis=0))
+            corners = order_corners(corners)
+        else:
+            points = collect(camera, tracker, args.duration, "Sweep the area you want to use", preview)
+            try:
+                corners = region_from_samples(points, args.trim, aspect)
+            except ValueError as e:
+                print(e)
+                return 1
+    except KeyboardInterrupt:
+        print("Calibration cancelled")
+        return 1
+    finally:
+        tracker.close()
+        camera.release()
+        if preview:
+            cv2.destroyAllWindows()
+            
+    region = {
+        "enabled": True,
+        "corners": [[round(x, 4), round(y, 4)] for x, y in corners],
+        "crop_inference": args.crop_inference,
+    }
+    print(json.dumps({"region": region}, indent=4))
+    if args.config:
+        merge_region(args.config, region)
+        print(f"Wrote region to {args.config}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
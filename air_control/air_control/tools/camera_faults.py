@@ -0,0 +1,99 @@
+"""Scheduled camera failure checks for ResilientCamera.
+
+Drives a ResilientCamera over a FakeVideoCapture that fails on a
+CaptureFailureSchedule and checks, per scenario, that every failure is
+recorded as an outage with the expected reason, that reading resumes
+afterwards, and that `max_outage` stops a camera that never comes back,
+including one that is unavailable from the start. Exits with code 1 if
+any scenario fails.
+
+Usage:
+    python -m air_control.tools.camera_faults
+    python -m air_control.tools.camera_faults --scenario never_opens
+"""
+import argparse
+import sys
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from ..config import CameraConfig
+from ..core.camera import ResilientCamera
+from ..utils.synthetic import CaptureFailureSchedule
+
+@dataclass
+class Scenario:
+    """A failure schedule and the behaviour expected from the camera."""
+    name: str
+    windows: List[Tuple[float, float, str]]
+    duration: float
+    reason: str
+    max_outage: Optional[float] = None
+    recovers: bool = True
+
+SCENARIOS = (
+    Scenario("disconnect", [(0.5, 0.5, "error")], 2.0, "read failed"),
+    Scenario("stall", [(0.5, 1.5, "stall")], 3.0, "stalled"),
+    Scenario("unavailable_at_start", [(0.0, 0.6, "error")], 2.0, "open failed"),
+    Scenario("never_opens", [(0.0, 60.0, "error")], 3.0, "open failed", max_outage=0.5, recovers=False),
+)
+
+def run_scenario(scenario: Scenario, stall_timeout: float) -> List[str]:
+    """Read from a camera failing on the scenario's schedule.
+    
+    Args:
+        scenario: Scenario to run
+        stall_timeout: Seconds without a frame before a read counts as stalled
+        
+    Returns:
+        Description of every unmet expectation, empty if the scenario passed
+    """
+    config = CameraConfig(resilient=True, stall_timeout=stall_timeout, max_outage=scenario.max_outage)
+    camera = ResilientCamera(config, capture_factory=CaptureFailureSchedule(scenario.windows))
+    frames_after = 0
+    end = time.perf_counter() + scenario.duration
+    try:
+        while time.perf_counter() < end and camera.alive:
+            success, _, _ = camera.read_timestamped()
+            if success and not camera.in_outage and camera.outages:
+                frames_after += 1
+        report = camera.report()
+        reasons = [outage.reason for outage in camera.outages]
+        alive = camera.alive
+    finally:
+        camera.release()
+        
+    failures = []
+    if scenario.reason not in reasons:
+        failures.append(f"no {scenario.reason!r} outage recorded, got {reasons}")
+    if scenario.recovers:
+        if report["in_outage"] or not frames_after:
+            failures.append("reading did not resume after the outage")
+        if not alive:
+            failures.append("camera gave up although it recovered")
+    elif alive:
+        failures.append(f"camera still alive after a {scenario.duration:g}s outage "
+                        f"with max_outage={scenario.max_outage:g}s")
+    return failures
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the failure scenarios and report the results."""
+    parser = argparse.ArgumentParser(description="Check ResilientCamera against scheduled capture failures")
+    parser.add_argument("--scenario", action="append", choices=[s.name for s in SCENARIOS],
+                        help="Scenario to run, repeatable; all by default")
+    parser.add_argument("--stall-timeout", type=float, default=0.3, help="Camera stall timeout in seconds")
+    args = parser.parse_args(argv)
+    
+    failed = 0
+    for scenario in SCENARIOS:
+        if args.scenario and scenario.name not in args.scenario:
+            continue
+        failures = run_scenario(scenario, args.stall_timeout)
+        print(f"{scenario.name:<22} {'FAIL' if failures else 'PASS'}", flush=True)
+        for failure in failures:
+            print(f"  {failure}")
+        failed += bool(failures)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""Evaluate predictive click onset on recorded pinch sequences.
+
+Replays the thumb-index distance of landmark datasets (as written by the
+extraction tool: `landmarks`, `present` and `timestamps` arrays) through
+PredictiveClick for a range of confidence gates, and compares its clicks
+with the reactive detector, which clicks when the distance falls below
+the threshold. A predicted click counts as correct when the reactive
+click follows within the tolerance; other clicks are false positives.
+With `--synthetic`, generated sequences with slow pinches are used.
+
+Usage:
+    python -m air_control.tools.click_eval data/*.npz
+    python -m air_control.tools.click_eval --synthetic 20000 --confidence 0.8 0.9 0.95
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import ClickPredictionConfig, MouseConfig
+from ..gestures.predictive import PredictiveClick
+from ..utils.synthetic import SyntheticHandGenerator
+
+THUMB_TIP = 4
+INDEX_FINGER_TIP = 8
+
+def pinch_distances(points: np.ndarray) -> np.ndarray:
+    """Thumb-index tip distance per frame, NaN where no hand was detected."""
+    return np.hypot(*(points[:, THUMB_TIP, :2] - points[:, INDEX_FINGER_TIP, :2]).T)
+
+def _onsets(timestamps: np.ndarray, pressed: np.ndarray) -> np.ndarray:
+    """Times at which a pressed signal turns on."""
+    rising = pressed & ~np.concatenate(([False], pressed[:-1]))
+    return timestamps[rising]
+
+def replay(timestamps: np.ndarray, distances: np.ndarray, predictor: PredictiveClick) -> np.ndarray:
+    """Run the predictor over a sequence.
+    
+    Args:
+        timestamps: Capture time of each frame in seconds
+        distances: Pinch distance of each frame, NaN without a hand
+        predictor: Predictor to replay, reset first
+        
+    Returns:
+        Boolean array, True where the click is pressed
+    """
+    predictor.reset()
+    pressed = np.zeros(len(distances), dtype=bool)
+    for i, (timestamp, distance) in enumerate(zip(timestamps, distances)):
+        if np.isnan(distance):
+            predictor.reset()
+        else:
+            pressed[i] = predictor.update(float(timestamp), float(distance))
+    return pressed
+
+def evaluate(sequences: Sequence[Tuple[np.ndarray, np.ndarray]], config: ClickPredictionConfig,
+             threshold: float, tolerance: float) -> Dict[str, float]:
+    """Compare predictive clicks with reactive clicks.
+    
+    Args:
+        sequences: (timestamps, distances) of each sequence
+        config: Predictor settings
+        threshold: Contact distance
+        tolerance: Maximum time from a predicted click to its reactive click
+        
+    Returns:
+        Click counts, latency saved and false positive rate
+    """
+    saved: List[float] = []
+    clicks = false_positives = missed = 0
+    duration = 0.0
+    for timestamps, distances in sequences:
+        predictor = PredictiveClick(threshold, config.window, config.lead, config.cancel_window,
+                                    config.min_confidence, config.min_speed)
+        predicted = _onsets(timestamps, replay(timestamps, distances, predictor))
+        reactive = _onsets(timestamps, np.nan_to_num(distances, nan=np.inf) < threshold)
+        duration += float(timestamps[-1] - timestamps[0]) if len(timestamps) else 0.0
+        clicks += len(predicted)
+        
+        # Match each reactive click to the latest predicted click before it
+        matched = np.zeros(len(predicted), dtype=bool)
+        positions = np.searchsorted(predicted, reactive, side="right") - 1
+        for onset, position in zip(reactive, positions):
+            if position >= 0 and not matched[position] and onset - predicted[position] <= tolerance:
+                matched[position] = True
+                saved.append(onset - predicted[position])
+            else:
+                missed += 1
+        false_positives += int((~matched).sum())
+        
+    saved_ms = np.asarray(saved) * 1000
+    return {
+        "min_confidence": config.min_confidence,
+        "clicks": clicks,
+        "correct": len(saved),
+        "missed": missed,
+        "false_positives": false_positives,
+        "false_positive_rate": false_positives / clicks if clicks else 0.0,
+        "false_positives_per_minute": false_positives / duration * 60 if duration else 0.0,
+        "saved_mean_ms": float(saved_ms.mean()) if len(saved) else 0.0,
+        "saved_median_ms": float(np.median(saved_ms)) if len(saved) else 0.0,
+        "early_fraction": float(np.mean(saved_ms > 0)) if len(saved) else 0.0,
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the evaluation and print a table of the results."""
+    defaults = ClickPredictionConfig()
+    parser = argparse.ArgumentParser(description="Evaluate predictive click onset")
+    parser.add_argument("datasets", nargs="*", help="Landmark .npz datasets")
+    parser.add_argument("--synthetic", type=int, default=0, help="Evaluate on this many synthetic frames")
+    parser.add_argument("--pose-ramp", type=float, default=0.2, help="Pinch closing time of synthetic hands, in seconds")
+    parser.add_argument("--confidence", type=float, nargs="+", default=[0.5, 0.7, 0.8, 0.9, 0.95, 0.99],
+                        help="Confidence gates to evaluate")
+    parser.add_argument("--window", type=int, default=defaults.window, help="Frames used for the fit")
+    parser.add_argument("--lead", type=float, default=defaults.lead, help="Seconds the click fires before contact")
+    parser.add_argument("--cancel-window", type=float, default=defaults.cancel_window, help="Seconds a click is pending")
+    parser.add_argument("--min-speed", type=float, default=defaults.min_speed, help="Minimum closing speed")
+    parser.add_argument("--threshold", type=float, default=MouseConfig().click_threshold, help="Contact distance")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Maximum seconds from predicted to reactive click")
+    parser.add_argument("--json", type=str, help="Also write the results to this file")
+    args = parser.parse_args(argv)
+    
+    sequences = []
+    for path in args.datasets:
+        with np.load(path, allow_pickle=False) as data:
+            sequences.append((data["timestamps"], pinch_distances(data["landmarks"])))
+    if args.synthetic:
+        sequence = SyntheticHandGenerator(seed=0, pose_ramp=args.pose_ramp).generate(args.synthetic)
+        distances = pinch_distances(sequence.landmarks)
+        distances[~sequence.present] = np.nan
+        sequences.append((sequence.timestamps, distances))
+    if not sequences:
+        parser.error("No datasets given and --synthetic not set")
+        
+    results = []
+    print(f"{'confidence':>10} {'clicks':>7} {'correct':>8} {'fp rate':>8} {'fp/min':>7} {'saved ms':>9} {'median':>7}")
+    for confidence in args.confidence:
+        config = ClickPredictionConfig(True, args.window, args.lead, args.cancel_window, confidence, args.min_speed)
+        result = evaluate(sequences, config, args.threshold, args.tolerance)
+        results.append(result)
+        print(f"{confidence:>10.2f} {result['clicks']:>7} {result['correct']:>8} "
+              f"{result['false_positive_rate']:>8.3f} {result['false_positives_per_minute']:>7.2f} "
+              f"{result['saved_mean_ms']:>9.1f} {result['saved_median_ms']:>7.1f}")
+        
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""Offline extraction of landmark datasets from recorded videos.
+
+Runs the hand tracker over every video in a directory with a process
+pool. Each worker owns one tracker (one MediaPipe graph) and processes
+whole videos, resetting the tracker between them, so workers share
+nothing and throughput scales with the number of cores. OpenCV is
+limited to one thread per worker to avoid oversubscribing the CPU.
+
+For every video an `.npz` dataset is written with:
+    landmarks   (N, 21, 3) float32, NaN for frames without a hand
+    present     (N,) bool
+    timestamps  (N,) float64, seconds from the start of the video
+
+`manifest.json` in the output directory maps the SHA-256 of each video's
+content to its dataset. It is updated after every finished video, and
+videos whose hash is already listed are skipped, so an interrupted run
+resumes where it stopped and renamed or copied videos are not processed
+twice.
+
+Usage:
+    python -m air_control.tools.extract recordings/ --output datasets/ [--workers 8]
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from ..config import HandTrackingConfig
+from ..core.hand_tracker import HandTracker
+from ..utils.landmarks import NUM_LANDMARKS, landmarks_to_array
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".webm")
+MANIFEST_NAME = "manifest.json"
+
+# Tracker owned by the current worker process
+_tracker = None
+
+def file_hash(path: str, block_size: int = 1 << 20) -> str:
+    """Compute the SHA-256 of a file's content.
+    
+    Args:
+        path: File to hash
+        block_size: Bytes read at a time
+        
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _write_atomic(path: str, write) -> None:
+    """Write a file through a temporary file so readers never see a partial one."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def load_manifest(output_dir: str) -> Dict[str, Dict]:
+    """Load the manifest of an output directory, empty if there is none."""
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def save_manifest(output_dir: str, manifest: Dict[str, Dict]) -> None:
+    """Atomically replace the manifest of an output directory."""
+    data = json.dumps(manifest, indent=2, sort_keys=True).encode()
+    _write_atomic(os.path.join(output_dir, MANIFEST_NAME), lambda f: f.write(data))
+
+def _init_worker(config: HandTrackingConfig) -> None:
+    """Create the worker's tracker."""
+    global _tracker
+    cv2.setNumThreads(1)
+    _tracker = HandTracker(config)
+
+def extract_video(video_path: str, output_path: str) -> Dict:
+    """Extract landmarks from one video in a worker process.
+    
+    Args:
+        video_path: Video to process
+        output_path: Location of the .npz dataset
+        
+    Returns:
+        Frame count, hand count and processing time of the video
+    """
+    _tracker.reset()
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video {video_path}")
+        
+    landmarks: List[np.ndarray] = []
+    timestamps: List[float] = []
+    missing = np.full((NUM_LANDMARKS, 3), np.nan, dtype=np.float32)
+    start = time.perf_counter()
+    try:
+        while True:
+            success, frame = cap.read()
+            if not success:
+                break
+            timestamps.append(cap.get(cv2.CAP_PROP_POS_MSEC) / 1000)
+            hand_landmarks, _ = _tracker.process_frame(frame)
+            landmarks.append(landmarks_to_array(hand_landmarks) if hand_landmarks else missing)
+    finally:
+        cap.release()
+    seconds = time.perf_counter() - start
+    
+    points = np.stack(landmarks) if landmarks else np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32)
+    present = ~np.isnan(points[:, 0, 0])
+    _write_atomic(output_path, lambda f: np.savez_compressed(
+        f, landmarks=points, present=present, timestamps=np.asarray(timestamps, dtype=np.float64)))
+    return {"frames": len(points), "hands": int(present.sum()), "seconds": seconds}
+
+def find_videos(input_dir: str, extensions=VIDEO_EXTENSIONS) -> List[str]:
+    """List video files below a directory, sorted by path."""
+    videos = []
+    for root, _, files in os.walk(input_dir):
+        for name in files:
+            if name.lower().endswith(extensions):
+                videos.append(os.path.join(root, name))
+    return sorted(videos)
+
+def run(input_dir: str, output_dir: str, config: HandTrackingConfig,
+        workers: Optional[int] = None) -> Dict[str, float]:
+    """Extract every new video in a directory.
+    
+    Args:
+        input_dir: Directory searched recursively for videos
+        output_dir: Directory for datasets and the manifest
+        config: Tracker configuration used by every worker
+        workers: Number of worker processes, defaults to the CPU count
+        
+    Returns:
+        Summary with processed and skipped videos, frames and aggregate fps
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(output_dir)
+    videos = find_videos(input_dir)
+    workers = workers or os.cpu_count() or 1
+    
+    summary = {"videos": len(videos), "processed": 0, "skipped": 0, "failed": 0, "frames": 0}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(config,)) as executor:
+        hashes = dict(zip(videos, executor.map(file_hash, videos)))
+        
+        futures = {}
+        queued = set()
+        for video, digest in hashes.items():
+            entry = manifest.get(digest)
+            if digest in queued or (entry and os.path.exists(os.path.join(output_dir, entry["output"]))):
+                summary["skipped"] += 1
+                continue
+            queued.add(digest)
+            name = f"{os.path.splitext(os.path.basename(video))[0]}-{digest[:12]}.npz"
+            future = executor.submit(extract_video, video, os.path.join(output_dir, name))
+            futures[future] = (digest, {"source": os.path.relpath(video, input_dir), "output": name})
+            
+        for future in as_completed(futures):
+            digest, entry = futures[future]
+            try:
+                entry.update(future.result())
+            except Exception as e:
+                summary["failed"] += 1
+                print(f"{entry['source']}: failed: {e}", file=sys.stderr)
+                continue
+            manifest[digest] = entry
+            save_manifest(output_dir, manifest)
+            
+            summary["processed"] += 1
+            summary["frames"] += entry["frames"]
+            fps = entry["frames"] / entry["seconds"] if entry["seconds"] else 0.0
+            print(f"[{summary['processed'] + summary['failed']}/{len(futures)}] {entry['source']}: "
+                  f"{entry['frames']} frames, {entry['hands']} with a hand, {fps:.1f} fps", file=sys.stderr)
+            
+    summary["seconds"] = time.perf_counter() - start
+    summary["fps"] = summary["frames"] / summary["seconds"] if summary["seconds"] else 0.0
+    return summary
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the extraction."""
+    parser = argparse.ArgumentParser(description="Extract hand landmark datasets from videos")
+    parser.add_argument("input", type=str, help="Directory with recorded videos")
+    parser.add_argument("--output", type=str, required=True, help="Directory for datasets and the manifest")
+    parser.add_argument("--workers", type=int, help="Worker processes, defaults to the CPU count")
+    parser.add_argument("--model-complexity", type=int, default=1, help="MediaPipe model complexity")
+    parser.add_argument("--min-detection-confidence", type=float, default=0.65, help="Detection threshold")
+    args = parser.parse_args(argv)
+    
+    config = HandTrackingConfig(
+        model_complexity=args.model_complexity,
+        min_detection_confidence=args.min_detection_confidence
+    )
+    summary = run(args.input, args.output, config, args.workers)
+    print(json.dumps(summary, indent=2))
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
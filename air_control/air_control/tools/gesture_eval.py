@@ -0,0 +1,339 @@
+"""Accuracy, time-to-detect and pointer quality of the gesture stage.
+
+Replays labeled landmark sequences at full speed through the gesture
+stage of AirControl (detect_gestures with the configured detectors,
+rules, bindings and predictive clicks) and through the movement
+smoother. Datasets are .npz files as written by the extraction tool
+(`landmarks`, `present`, `timestamps`) plus a `labels` array with the
+gesture name of each frame, "none" outside gestures. With
+`--synthetic`, generated sequences labeled from their ground-truth
+intervals are used.
+
+Every labeled interval is an event. A detection is an onset of the
+gesture's signal (a GestureState flag, or a rule name); it matches the
+first unmatched event it falls within, extended by `--early` seconds
+before and `--late` seconds after. Reported per gesture: precision,
+recall, false triggers per minute and the time from the start of the
+event to its detection. For the pointer, lag is the time shift that best
+aligns the smoothed path with the raw one, and jitter is the RMS of the
+second difference of the path in pixels, for the raw and smoothed path.
+
+Reports are JSON; `--baseline` prints the change of every metric
+against a report from another revision or configuration.
+
+Usage:
+    python -m air_control.tools.gesture_eval data/*.npz --output report.json
+    python -m air_control.tools.gesture_eval --synthetic 20000 --config tuned.json --baseline report.json
+"""
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .. import AirControl
+from ..config import AirControlConfig, HandTrackingConfig, load_config
+from ..utils.landmarks import array_to_landmarks
+from ..utils.stats import describe
+from ..utils.synthetic import StaticFrameSource, SyntheticHandGenerator
+
+@dataclass
+class LabeledSequence:
+    """Landmark sequence with labeled gesture intervals (frame ranges, end exclusive)."""
+    name: str
+    timestamps: np.ndarray
+    landmarks: np.ndarray
+    present: np.ndarray
+    intervals: List[Tuple[str, int, int]]
+
+def label_intervals(labels: Sequence[str], none: str = "none") -> List[Tuple[str, int, int]]:
+    """Convert per-frame labels to (gesture, start, end) intervals.
+    
+    Args:
+        labels: Gesture name of each frame
+        none: Name of frames outside every gesture
+        
+    Returns:
+        Runs of equal labels other than `none`
+    """
+    intervals = []
+    start = 0
+    for i in range(1, len(labels) + 1):
+        if i == len(labels) or labels[i] != labels[start]:
+            if labels[start] != none:
+                intervals.append((str(labels[start]), start, i))
+            start = i
+    return intervals
+
+def load_sequence(path: str) -> LabeledSequence:
+    """Load a labeled dataset.
+    
+    Args:
+        path: Path to an .npz dataset with a `labels` array
+        
+    Returns:
+        The labeled sequence
+    """
+    with np.load(path, allow_pickle=False) as data:
+        landmarks = data["landmarks"]
+        present = data["present"] if "present" in data else ~np.isnan(landmarks[:, 0, 0])
+        return LabeledSequence(path, data["timestamps"], landmarks, present,
+                               label_intervals(data["labels"].astype(str)))
+
+def replay(controller: AirControl, sequence: LabeledSequence,
+           gestures: Sequence[str]) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, float]:
+    """Run a sequence through the gesture stage and the smoother.
+    
+    Args:
+        controller: Controller providing the gesture stage
+        sequence: Sequence to replay
+        gestures: Gesture names to record
+        
+    Returns:
+        Tuple containing:
+            - Boolean signal of each gesture per frame
+            - Raw pointer positions (N, 2), NaN without a hand
+            - Smoothed pointer positions (N, 2), NaN without a hand
+            - Seconds spent in the gesture stage and smoother
+    """
+    n_frames = len(sequence.timestamps)
+    signals = {gesture: np.zeros(n_frames, dtype=bool) for gesture in gestures}
+    raw = np.full((n_frames, 2), np.nan)
+    smoothed = np.full((n_frames, 2), np.nan)
+    smoother = controller.mouse.smoother
+    
+    elapsed = 0.0
+    for i, timestamp in enumerate(sequence.timestamps):
+        # Converted per frame, outside the timed stage
+        hand_landmarks = array_to_landmarks(sequence.landmarks[i]) if sequence.present[i] else None
+        controller.timeline.begin(i, float(timestamp))
+        start = time.perf_counter()
+        state = controller.detect_gestures(hand_landmarks)
+        if state is not None:
+            smoothed[i] = smoother.smooth(state.screen_x, state.screen_y)
+        elapsed += time.perf_counter() - start
+        controller.timeline.end()
+        
+        if state is None:
+            continue
+        raw[i] = state.screen_x, state.screen_y
+        for gesture, signal in signals.items():
+            signal[i] = getattr(state, gesture) if gesture in ("left_click", "right_click", "drag") else gesture in state.rules
+    return signals, raw, smoothed, elapsed
+
+def match_events(timestamps: np.ndarray, signal: np.ndarray, intervals: List[Tuple[int, int]],
+                 early: float, late: float) -> Tuple[int, List[float]]:
+    """Match detection onsets to labeled events.
+    
+    Args:
+        timestamps: Capture time of each frame
+        signal: Detector output per frame
+        intervals: Labeled (start, end) frame ranges of the gesture
+        early: Seconds before an event a detection still counts
+        late: Seconds after an event a detection still counts
+        
+    Returns:
+        Number of onsets and the time to detect of each matched event
+    """
+    rising = signal & ~np.concatenate(([False], signal[:-1]))
+    onsets = timestamps[rising]
+    last = len(timestamps) - 1
+    delays = []
+    used = np.zeros(len(onsets), dtype=bool)
+    for start, end in intervals:
+        begin, finish = timestamps[start], timestamps[min(end, last)]
+        candidates = np.flatnonzero(~used & (onsets >= begin - early) & (onsets <= finish + late))
+        if len(candidates):
+            used[candidates[0]] = True
+            delays.append(float(onsets[candidates[0]] - begin))
+    return len(onsets), delays
+
+def pointer_lag(raw: np.ndarray, smoothed: np.ndarray, max_shift: int = 30) -> float:
+    """Shift in frames that best aligns the smoothed path with the raw one.
+    
+    The shift minimizing the mean squared distance is refined to a
+    fraction of a frame by fitting a parabola through its neighbours.
+    
+    Args:
+        raw: Raw positions (N, 2), NaN without a hand
+        smoothed: Smoothed positions (N, 2), NaN without a hand
+        max_shift: Largest shift tried
+        
+    Returns:
+        Lag in frames
+    """
+    errors = []
+    for shift in range(min(max_shift, len(raw) - 1) + 1):
+        diff = smoothed[shift:] - raw[:len(raw) - shift]
+        errors.append(np.nanmean(np.sum(diff ** 2, axis=1)))
+    errors = np.asarray(errors)
+    best = int(np.nanargmin(errors))
+    if 0 < best < len(errors) - 1:
+        left, middle, right = errors[best - 1:best + 2]
+        curvature = left - 2 * middle + right
+        if curvature > 0:
+            return best + 0.5 * (left - right) / curvature
+    return float(best)
+
+def jitter(positions: np.ndarray) -> float:
+    """RMS of the second difference of a path, ignoring gaps."""
+    second = positions[2:] - 2 * positions[1:-1] + positions[:-2]
+    return float(np.sqrt(np.nanmean(np.sum(second ** 2, axis=1)))) if len(second) else 0.0
+
+def evaluate(config: AirControlConfig, sequences: Sequence[LabeledSequence],
+             early: float = 0.15, late: float = 0.1) -> Dict:
+    """Evaluate the gesture stage on labeled sequences.
+    
+    Args:
+        config: Configuration of the gesture stage and smoother
+        sequences: Labeled sequences
+        early: Seconds before an event a detection still counts
+        late: Seconds after an event a detection still counts
+        
+    Returns:
+        JSON-serializable report
+    """
+    gestures = sorted({gesture for sequence in sequences for gesture, _, _ in sequence.intervals})
+    counts = {gesture: {"events": 0, "detections": 0, "delays": []} for gesture in gestures}
+    lags, raw_jitter, smooth_jitter = [], [], []
+    frames, duration, elapsed = 0, 0.0, 0.0
+    
+    for sequence in sequences:
+        # A fresh controller per sequence, so no state carries over
+        controller = AirControl(config, camera=StaticFrameSource())
+        signals, raw, smoothed, seconds = replay(controller, sequence, gestures)
+        controller.cleanup()
+        
+        timestamps = sequence.timestamps
+        frames += len(timestamps)
+        duration += float(timestamps[-1] - timestamps[0]) if len(timestamps) > 1 else 0.0
+        elapsed += seconds
+        for gesture in gestures:
+            intervals = [(start, end) for name, start, end in sequence.intervals if name == gesture]
+            detections, delays = match_events(timestamps, signals[gesture], intervals, early, late)
+            counts[gesture]["events"] += len(intervals)
+            counts[gesture]["detections"] += detections
+            counts[gesture]["delays"].extend(delays)
+            
+        frame_ms = float(np.median(np.diff(timestamps))) * 1000 if len(timestamps) > 1 else 0.0
+        if np.isfinite(smoothed).any():
+            lags.append(pointer_lag(raw, smoothed) * frame_ms)
+            raw_jitter.append(jitter(raw))
+            smooth_jitter.append(jitter(smoothed))
+            
+    report_gestures = {}
+    for gesture, count in counts.items():
+        matched = len(count["delays"])
+        false_triggers = count["detections"] - matched
+        report_gestures[gesture] = {
+            "events": count["events"],
+            "detections": count["detections"],
+            "precision": matched / count["detections"] if count["detections"] else 0.0,
+            "recall": matched / count["events"] if count["events"] else 0.0,
+            "false_triggers": false_triggers,
+            "false_triggers_per_minute": false_triggers / duration * 60 if duration else 0.0,
+            "time_to_detect_ms": describe(count["delays"], scale=1000),
+        }
+    return {
+        "sequences": len(sequences),
+        "frames": frames,
+        "duration_s": duration,
+        "gestures": report_gestures,
+        "pointer": {
+            "smoothing_factor": config.mouse.smoothing_factor,
+            "lag_ms": float(np.mean(lags)) if lags else 0.0,
+            "jitter_raw_px": float(np.mean(raw_jitter)) if raw_jitter else 0.0,
+            "jitter_px": float(np.mean(smooth_jitter)) if smooth_jitter else 0.0,
+        },
+        "frames_per_second": frames / elapsed if elapsed else 0.0,
+    }
+
+def flatten(report: Dict, prefix: str = "") -> Dict[str, float]:
+    """Flatten the numeric values of a report into dotted keys."""
+    values = {}
+    for key, value in report.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            values.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[name] = value
+    return values
+
+def compare(baseline: Dict, report: Dict) -> List[Tuple[str, float, float]]:
+    """Pair up the metrics of two reports.
+    
+    Args:
+        baseline: Earlier report
+        report: Current report
+        
+    Returns:
+        (metric, baseline value, current value) for metrics in both reports
+    """
+    old, new = flatten(baseline), flatten(report)
+    return [(name, old[name], new[name]) for name in new if name in old]
+
+def _print_report(report: Dict) -> None:
+    """Print the report as tables."""
+    print(f"{report['frames']} frames, {report['duration_s'] / 60:.1f} min, "
+          f"{report['frames_per_second']:.0f} frames/s")
+    print(f"{'gesture':>12} {'events':>7} {'precision':>9} {'recall':>7} {'fp/min':>7} {'detect ms p50':>13} {'p90':>7}")
+    for gesture, result in report["gestures"].items():
+        delay = result["time_to_detect_ms"]
+        print(f"{gesture:>12} {result['events']:>7} {result['precision']:>9.3f} {result['recall']:>7.3f} "
+              f"{result['false_triggers_per_minute']:>7.2f} {delay.get('p50', float('nan')):>13.1f} "
+              f"{delay.get('p90', float('nan')):>7.1f}")
+    pointer = report["pointer"]
+    print(f"pointer lag {pointer['lag_ms']:.1f} ms, jitter {pointer['jitter_raw_px']:.2f} px raw, "
+          f"{pointer['jitter_px']:.2f} px smoothed")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the evaluation, print and optionally save the report."""
+    parser = argparse.ArgumentParser(description="Evaluate gesture accuracy, time to detect and pointer quality")
+    parser.add_argument("datasets", nargs="*", help="Labeled .npz datasets")
+    parser.add_argument("--synthetic", type=int, default=0, help="Evaluate on this many synthetic frames")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic generator")
+    parser.add_argument("--pose-ramp", type=float, default=0.08, help="Pose transition time of synthetic hands, in seconds")
+    parser.add_argument("--config", type=str, help="JSON config with the gesture and smoothing settings")
+    parser.add_argument("--early", type=float, default=0.15, help="Seconds before an event a detection counts")
+    parser.add_argument("--late", type=float, default=0.1, help="Seconds after an event a detection counts")
+    parser.add_argument("--output", type=str, help="Write the JSON report to this file")
+    parser.add_argument("--baseline", type=str, help="Compare with this earlier JSON report")
+    args = parser.parse_args(argv)
+    
+    sequences = [load_sequence(path) for path in args.datasets]
+    if args.synthetic:
+        generated = SyntheticHandGenerator(seed=args.seed, pose_ramp=args.pose_ramp).generate(args.synthetic)
+        sequences.append(LabeledSequence("synthetic", generated.timestamps, generated.landmarks,
+                                         generated.present, generated.intervals))
+    if not sequences:
+        parser.error("No datasets given and --synthetic not set")
+        
+    config = load_config(args.config) if args.config else AirControlConfig()
+    config.mouse.backend = "null"
+    config.hand_tracking = HandTrackingConfig(backend="synthetic", synthetic_frames=1)
+    config.show_preview = False
+    
+    report = evaluate(config, sequences, args.early, args.late)
+    _print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+            
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(baseline, report)
+        changed = [(name, old, new) for name, old, new in rows if old != new]
+        print(f"\n{len(rows) - len(changed)} of {len(rows)} metrics unchanged from {args.baseline}")
+        if changed:
+            print(f"{'metric':<45} {'baseline':>10} {'current':>10} {'change':>8}")
+        for name, old, new in changed:
+            change = f"{(new - old) / abs(old) * 100:+.1f}%" if old else ""
+            print(f"{name:<45} {old:>10.3f} {new:>10.3f} {change:>8}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
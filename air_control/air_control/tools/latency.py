@@ -0,0 +1,226 @@
+"""Glass-to-cursor latency measurement.
+
+Replays frames through the full AirControl pipeline from a synthetic
+source that paces them like a camera and stamps each one with its frame
+ID as a strip of black and white blocks. The mouse backend is replaced
+by a null backend, so only the pipeline itself is measured. For every
+frame the ID is decoded again from the processed image and matched to
+the time the source emitted it, which gives the motion-to-actuation
+latency: from the moment a frame's content exists to the moveTo call
+driven by it.
+
+Usage:
+    python -m air_control.tools.latency --video hand.mp4 [--fps 30] [--duration 10]
+"""
+import argparse
+import json
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .. import AirControl
+from ..config import AirControlConfig
+from ..core.timing import FrameTiming
+from ..utils.stats import describe
+
+class FrameIdCodec:
+    """Encodes frame IDs into the top-left corner of a frame."""
+    
+    def __init__(self, bits: int = 24, block: int = 8):
+        """Initialize the codec.
+        
+        Args:
+            bits: Number of ID bits, IDs wrap around after 2**bits frames
+            block: Side of each bit block in pixels
+        """
+        self.bits = bits
+        self.block = block
+        
+    def encode(self, frame: np.ndarray, frame_id: int) -> None:
+        """Stamp a frame ID into a frame in place.
+        
+        Args:
+            frame: BGR frame at least bits * block pixels wide
+            frame_id: ID to encode
+        """
+        for bit in range(self.bits):
+            value = 255 if (frame_id >> bit) & 1 else 0
+            frame[:self.block, bit * self.block:(bit + 1) * self.block] = value
+            
+    def decode(self, frame: np.ndarray) -> int:
+        """Read the frame ID stamped into a frame.
+        
+        Args:
+            frame: BGR frame previously passed to encode()
+            
+        Returns:
+            The decoded frame ID
+        """
+        strip = frame[:self.block, :self.bits * self.block].astype(np.float32)
+        means = strip.reshape(self.block, self.bits, self.block, -1).mean(axis=(0, 2, 3))
+        return int(sum(1 << bit for bit in range(self.bits) if means[bit] > 127))
+
+class SyntheticSource:
+    """Camera-compatible source that delivers frames in real time.
+    
+    Frame k becomes available at start + k / fps, like a camera that
+    exposes at a fixed rate. A read returns the newest available frame,
+    skipping frames the pipeline was too slow to pick up, and reports the
+    frame's emit time as its capture time.
+    """
+    
+    def __init__(self, frames: List[np.ndarray], fps: float, duration: float,
+                 codec: Optional[FrameIdCodec] = None):
+        """Initialize the source.
+        
+        Args:
+            frames: Frames to replay in a loop
+            fps: Rate at which frames become available
+            duration: Seconds after which reads fail
+            codec: Codec used to stamp frame IDs
+        """
+        self.frames = frames
+        self.fps = fps
+        self.duration = duration
+        self.codec = codec or FrameIdCodec()
+        self.emit_times: Dict[int, float] = {}
+        self.skipped = 0
+        self._start: Optional[float] = None
+        self._last_index = -1
+        
+    def read_timestamped(self) -> Tuple[bool, Optional[np.ndarray], float]:
+        """Wait for and return the next frame with its emit time."""
+        now = time.perf_counter()
+        if self._start is None:
+            self._start = now
+        if now - self._start >= self.duration:
+            return False, None, now
+            
+        index = int((now - self._start) * self.fps)
+        if index <= self._last_index:
+            index = self._last_index + 1
+            time.sleep(max(0.0, self._start + index / self.fps - now))
+        self.skipped += index - self._last_index - 1
+        self._last_index = index
+        
+        emit_time = self._start + index / self.fps
+        frame = self.frames[index % len(self.frames)].copy()
+        self.codec.encode(frame, index)
+        self.emit_times[index] = emit_time
+        return True, frame, emit_time
+        
+    def read_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Return the next frame without its timestamp."""
+        success, frame, _ = self.read_timestamped()
+        return success, frame
+        
+    def release(self) -> None:
+        """Nothing to release."""
+
+def load_frames(path: Optional[str], max_frames: int, size: Tuple[int, int]) -> List[np.ndarray]:
+    """Load frames from a video into memory, or make a static test frame.
+    
+    Args:
+        path: Video file to load, None for a synthetic noise frame
+        max_frames: Maximum number of frames to load
+        size: (width, height) of the synthetic frame
+        
+    Returns:
+        List of BGR frames
+    """
+    if path is None:
+        rng = np.random.default_rng(0)
+        width, height = size
+        return [rng.integers(0, 256, (height, width, 3), dtype=np.uint8)]
+        
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < max_frames:
+        success, frame = cap.read()
+        if not success:
+            break
+        frames.append(frame)
+    cap.release()
+    if not frames:
+        raise ValueError(f"Could not read any frames from {path}")
+    return frames
+
+class LatencyRecorder:
+    """Collects per-frame timings from a controller's timeline."""
+    
+    def __init__(self, controller: AirControl, source: SyntheticSource):
+        self.controller = controller
+        self.source = source
+        self.actuation: List[float] = []
+        self.stages: Dict[str, List[float]] = defaultdict(list)
+        self.frames = 0
+        self.id_mismatches = 0
+        controller.timeline.frame_listeners.append(self.on_frame)
+        
+    def on_frame(self, timing: FrameTiming) -> None:
+        """Record one completed frame."""
+        self.frames += 1
+        decoded = self.source.codec.decode(self.controller.last_frame)
+        if self.source.emit_times.get(decoded) != timing.capture_time:
+            # The stamped ID does not belong to this frame's capture time
+            self.id_mismatches += 1
+            return
+            
+        for stage in timing.stages:
+            self.stages[stage].append(timing.since_capture(stage))
+        if "mouse" in timing.stages:
+            self.actuation.append(timing.since_capture("mouse"))
+            
+    def report(self) -> Dict:
+        """Build the latency report in milliseconds."""
+        return {
+            "frames_emitted": len(self.source.emit_times) + self.source.skipped,
+            "frames_processed": self.frames,
+            "frames_skipped": self.source.skipped,
+            "id_mismatches": self.id_mismatches,
+            "motion_to_actuation_ms": describe(self.actuation, scale=1000),
+            "since_capture_ms": {
+                stage: describe(values, scale=1000) for stage, values in self.stages.items()
+            },
+        }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the latency measurement."""
+    parser = argparse.ArgumentParser(description="Measure AirControl glass-to-cursor latency")
+    parser.add_argument("--video", type=str, help="Video with a visible hand to replay")
+    parser.add_argument("--fps", type=float, default=30.0, help="Replay frame rate")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measurement time in seconds")
+    parser.add_argument("--max-frames", type=int, default=300, help="Frames loaded from the video")
+    parser.add_argument("--backend", type=str, default="solutions", help="Hand tracking backend")
+    parser.add_argument("--model", type=str, help="Model asset for the tasks backend")
+    parser.add_argument("--output", type=str, help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+    
+    config = AirControlConfig()
+    config.mouse.backend = "null"
+    config.show_preview = False
+    config.hand_tracking.backend = args.backend
+    config.hand_tracking.model_asset_path = args.model
+    
+    if args.video is None:
+        print("No --video given, no hand will be detected and only stage latencies are reported",
+              file=sys.stderr)
+    source = SyntheticSource(load_frames(args.video, args.max_frames, (640, 480)), args.fps, args.duration)
+    controller = AirControl(config, camera=source)
+    recorder = LatencyRecorder(controller, source)
+    
+    controller.run()
+    
+    report = json.dumps(recorder.report(), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+    print(report)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
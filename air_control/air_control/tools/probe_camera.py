@@ -0,0 +1,78 @@
+"""Probe the capture modes of a camera.
+
+Applies each candidate mode, reports what the driver granted together
+with the delivered frame rate and read latency, and shows the mode
+AirControl would negotiate. The choice is written to the mode cache
+unless `--no-cache` is given, so a start with the same candidates and
+requirements skips probing.
+
+Usage:
+    python -m air_control.tools.probe_camera --camera 0 --min-fps 30
+    python -m air_control.tools.probe_camera --mode 1920x1080@30/MJPG --mode 1280x720@60/MJPG
+"""
+import argparse
+import re
+import sys
+from typing import List, Optional
+
+from ..config import CameraConfig, CaptureMode
+from ..core.camera import Camera, probe_modes, select_mode
+
+def parse_mode(text: str) -> CaptureMode:
+    """Parse a mode written as WIDTHxHEIGHT[@FPS][/FOURCC]."""
+    match = re.fullmatch(r"(\d+)x(\d+)(?:@([\d.]+))?(?:/(\w{4}))?", text)
+    if not match:
+        raise argparse.ArgumentTypeError(f"Expected WIDTHxHEIGHT[@FPS][/FOURCC], got {text!r}")
+    width, height, fps, fourcc = match.groups()
+    return CaptureMode(int(width), int(height), float(fps) if fps else None, fourcc)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Probe the camera and print the results."""
+    parser = argparse.ArgumentParser(description="Probe camera capture modes")
+    parser.add_argument("--camera", type=int, default=0, help="Camera id")
+    parser.add_argument("--mode", type=parse_mode, action="append", help="Candidate mode, repeatable")
+    parser.add_argument("--frames", type=int, default=30, help="Frames timed per mode")
+    parser.add_argument("--buffer-size", type=int, help="Driver queue length")
+    parser.add_argument("--min-fps", type=float, help="Minimum delivered frame rate")
+    parser.add_argument("--min-width", type=int, help="Minimum width")
+    parser.add_argument("--min-height", type=int, help="Minimum height")
+    parser.add_argument("--no-cache", action="store_true", help="Do not write the mode cache")
+    args = parser.parse_args(argv)
+    
+    config = CameraConfig(camera_id=args.camera, buffer_size=args.buffer_size, probe_frames=args.frames,
+                          min_fps=args.min_fps, min_width=args.min_width, min_height=args.min_height)
+    if args.mode:
+        config.probe_modes = args.mode
+    if args.no_cache:
+        config.probe_cache_path = None
+        
+    camera = Camera(config)
+    try:
+        if not camera.cap.isOpened():
+            print(f"Cannot open camera {args.camera}")
+            return 1
+        results = probe_modes(camera.cap, config.probe_modes, config.probe_frames, config.buffer_size)
+        best = select_mode(results, config.min_fps, config.min_width, config.min_height)
+        
+        print(f"{'requested':>22} {'granted':>22} {'fps':>6} {'read ms':>8} {'p95 ms':>7}")
+        for result in results:
+            marker = " *" if result is best else ""
+            print(f"{_format(result.requested):>22} {_format(result.granted):>22} {result.fps:>6.1f} "
+                  f"{result.read_ms:>8.1f} {result.read_p95_ms:>7.1f}{marker}")
+        if best is None:
+            print("No mode delivered frames")
+            return 1
+            
+        camera.remember_mode(best)
+        return 0
+    finally:
+        camera.release()
+
+def _format(mode: CaptureMode) -> str:
+    """Format a mode as WIDTHxHEIGHT@FPS/FOURCC."""
+    fps = f"@{mode.fps:g}" if mode.fps else ""
+    fourcc = f"/{mode.fourcc}" if mode.fourcc else ""
+    return f"{mode.width}x{mode.height}{fps}{fourcc}"
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""Soak test for latency drift and memory growth over long runs.
+
+Drives the full AirControl pipeline with a null mouse backend for
+`--duration` seconds, from a recorded video replayed in a loop through
+the configured hand tracker, or from synthetic landmarks by default.
+Frames are processed as fast as possible unless `--fps` paces them, so
+an unpaced run covers a shift's worth of frames in far less time.
+
+Every `--interval` seconds a sample is taken: frame time percentiles of
+the interval, RSS, garbage collections and their pause times per
+generation, and the number of objects tracked by the collector. Frame
+time runs from capture to the last pipeline stage, so waiting for a
+paced source is not counted. The
+first sample after `--warmup` seconds is the baseline. The run fails
+(exit code 1) when the last sample drifts past a limit: p99 frame time
+above `--max-latency-drift` times the baseline, RSS or object count
+grown by more than `--max-rss-growth` MB or `--max-object-growth`, or
+any single collection pausing longer than `--max-gc-pause` ms.
+
+Usage:
+    python -m air_control.tools.soak --duration 28800 --interval 300 --output soak.jsonl
+    python -m air_control.tools.soak --video hand.mp4 --fps 30 --duration 3600 --config config.json
+"""
+import argparse
+import gc
+import json
+import math
+import sys
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .. import AirControl
+from ..config import AirControlConfig, load_config
+from ..core.timing import FrameTiming
+from ..utils.memprofile import rss_bytes
+from ..utils.synthetic import LoopingFrameSource, StaticFrameSource
+from .latency import load_frames
+
+class FrameTimeHistogram:
+    """Constant-memory frame time distribution with log-spaced buckets.
+    
+    Keeping every frame time of an interval would itself grow memory by
+    millions of entries in an unpaced run; buckets 2% wide bound the
+    percentile error to 2% instead.
+    """
+    
+    def __init__(self, resolution: float = 0.02, min_time: float = 1e-6, max_time: float = 10.0):
+        """Initialize the histogram.
+        
+        Args:
+            resolution: Relative width of a bucket
+            min_time: Lower edge of the first bucket in seconds
+            max_time: Times above this land in the last bucket
+        """
+        self.min_time = min_time
+        self._log_step = math.log1p(resolution)
+        self.edges = min_time * np.exp(self._log_step * np.arange(1, int(math.log(max_time / min_time) / self._log_step) + 2))
+        self.clear()
+        
+    def clear(self) -> None:
+        """Remove all recorded times."""
+        self.counts = np.zeros(len(self.edges), dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        
+    def add(self, seconds: float) -> None:
+        """Record a frame time."""
+        index = int(math.log(max(seconds, self.min_time) / self.min_time) / self._log_step)
+        self.counts[min(index, len(self.counts) - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, p50, p90, p99 and max in milliseconds."""
+        if not self.count:
+            return {"count": 0}
+        cumulative = np.cumsum(self.counts)
+        p50, p90, p99 = (
+            min(float(self.edges[np.searchsorted(cumulative, q * self.count)]), self.max) * 1000
+            for q in (0.5, 0.9, 0.99)
+        )
+        return {"count": self.count, "mean": self.total / self.count * 1000,
+                "p50": p50, "p90": p90, "p99": p99, "max": self.max * 1000}
+
+class GcMonitor:
+    """Times garbage collections through gc.callbacks."""
+    
+    def __init__(self):
+        self.collections = [0, 0, 0]
+        self.pause_time = [0.0, 0.0, 0.0]
+        self.max_pause = 0.0
+        self._start = 0.0
+        gc.callbacks.append(self._on_gc)
+        
+    def _on_gc(self, phase: str, info: Dict) -> None:
+        """Record the duration of a collection."""
+        if phase == "start":
+            self._start = time.perf_counter()
+            return
+        pause = time.perf_counter() - self._start
+        generation = info["generation"]
+        self.collections[generation] += 1
+        self.pause_time[generation] += pause
+        self.max_pause = max(self.max_pause, pause)
+        
+    def take(self) -> Dict:
+        """Counters since the previous call, in milliseconds."""
+        result = {
+            "collections": list(self.collections),
+            "pause_ms": [pause * 1000 for pause in self.pause_time],
+            "max_pause_ms": self.max_pause * 1000,
+        }
+        self.collections = [0, 0, 0]
+        self.pause_time = [0.0, 0.0, 0.0]
+        self.max_pause = 0.0
+        return result
+        
+    def close(self) -> None:
+        """Stop monitoring."""
+        gc.callbacks.remove(self._on_gc)
+
+def soak(controller: AirControl, duration: float, interval: float,
+         on_sample=None) -> List[Dict]:
+    """Run the pipeline and sample its health at intervals.
+    
+    Args:
+        controller: Controller to drive, its camera must not run dry
+        duration: Seconds to run
+        interval: Seconds between samples
+        on_sample: Called with each sample as it is taken
+        
+    Returns:
+        The samples
+    """
+    monitor = GcMonitor()
+    samples: List[Dict] = []
+    frame_times = FrameTimeHistogram()
+    
+    def on_frame(timing: FrameTiming) -> None:
+        # Capture to the last stage; waiting for the source is not processing
+        if timing.capture_time is not None and timing.stages:
+            frame_times.add(max(timing.stages.values()) - timing.capture_time)
+            
+    controller.timeline.frame_listeners.append(on_frame)
+    start = time.perf_counter()
+    next_sample = start + interval
+    frames = 0
+    try:
+        while True:
+            if not controller.process_frame():
+                raise RuntimeError("The pipeline stopped before the end of the soak test")
+            now = time.perf_counter()
+            frames += 1
+            
+            if now >= next_sample or now - start >= duration:
+                rss = rss_bytes()
+                sample = {
+                    "elapsed_s": now - start,
+                    "frames": frames,
+                    "frame_ms": frame_times.summary(),
+                    "rss_mb": rss / 2 ** 20 if rss is not None else None,
+                    "gc": monitor.take(),
+                    "objects": len(gc.get_objects()),
+                }
+                samples.append(sample)
+                if on_sample:
+                    on_sample(sample)
+                frame_times.clear()
+                next_sample = time.perf_counter() + interval
+                if now - start >= duration:
+                    return samples
+    finally:
+        controller.timeline.frame_listeners.remove(on_frame)
+        monitor.close()
+
+def check_drift(samples: List[Dict], warmup: float, max_latency_drift: Optional[float],
+                max_rss_growth: Optional[float], max_object_growth: Optional[int],
+                max_gc_pause: Optional[float]) -> List[str]:
+    """Compare the last sample with the baseline.
+    
+    Args:
+        samples: Samples from soak()
+        warmup: Seconds excluded before the baseline sample
+        max_latency_drift: Largest allowed ratio of p99 frame time to the baseline
+        max_rss_growth: Largest allowed RSS growth in MB
+        max_object_growth: Largest allowed growth of the tracked object count
+        max_gc_pause: Largest allowed single collection pause in ms
+        
+    Returns:
+        Description of every exceeded limit, empty if the run passed
+    """
+    # Only samples whose interval started after the warmup
+    starts = [0.0] + [sample["elapsed_s"] for sample in samples[:-1]]
+    measured = [sample for start, sample in zip(starts, samples) if start >= warmup]
+    if len(measured) < 2:
+        return [f"Need at least two samples after the {warmup:g}s warmup, got {len(measured)}"]
+    baseline, last = measured[0], measured[-1]
+    failures = []
+    
+    if max_latency_drift is not None:
+        ratio = last["frame_ms"]["p99"] / baseline["frame_ms"]["p99"]
+        if ratio > max_latency_drift:
+            failures.append(f"p99 frame time rose from {baseline['frame_ms']['p99']:.2f} ms to "
+                            f"{last['frame_ms']['p99']:.2f} ms ({ratio:.2f}x > {max_latency_drift:g}x)")
+    if max_rss_growth is not None and baseline["rss_mb"] is not None:
+        growth = last["rss_mb"] - baseline["rss_mb"]
+        if growth > max_rss_growth:
+            failures.append(f"RSS grew by {growth:.1f} MB (> {max_rss_growth:g} MB)")
+    if max_object_growth is not None:
+        growth = last["objects"] - baseline["objects"]
+        if growth > max_object_growth:
+            failures.append(f"Tracked objects grew by {growth} (> {max_object_growth})")
+    if max_gc_pause is not None:
+        pause = max(sample["gc"]["max_pause_ms"] for sample in measured)
+        if pause > max_gc_pause:
+            failures.append(f"A garbage collection paused {pause:.1f} ms (> {max_gc_pause:g} ms)")
+    return failures
+
+def _print_sample(sample: Dict) -> None:
+    """Print a one-line summary of a sample."""
+    frame_ms = sample["frame_ms"]
+    rss = f"{sample['rss_mb']:.1f}" if sample["rss_mb"] is not None else "n/a"
+    print(f"{sample['elapsed_s']:>8.0f}s {sample['frames']:>10} frames  "
+          f"p50 {frame_ms['p50']:.2f} ms  p99 {frame_ms['p99']:.2f} ms  rss {rss} MB  "
+          f"gc {sum(sample['gc']['collections'])} ({sample['gc']['max_pause_ms']:.1f} ms max)  "
+          f"objects {sample['objects']}", flush=True)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the soak test and check the drift limits."""
+    parser = argparse.ArgumentParser(description="Soak test the AirControl pipeline")
+    parser.add_argument("--duration", type=float, default=3600.0, help="Seconds to run")
+    parser.add_argument("--interval", type=float, default=60.0, help="Seconds between samples")
+    parser.add_argument("--warmup", type=float, default=60.0, help="Seconds before the baseline sample")
+    parser.add_argument("--video", type=str, help="Recording replayed through the configured hand tracker")
+    parser.add_argument("--max-frames", type=int, default=300, help="Frames loaded from the video")
+    parser.add_argument("--fps", type=float, help="Pace frames at this rate instead of running flat out")
+    parser.add_argument("--config", type=str, help="JSON config of the pipeline under test")
+    parser.add_argument("--max-latency-drift", type=float, default=1.5, help="Allowed p99 frame time ratio")
+    parser.add_argument("--max-rss-growth", type=float, default=50.0, help="Allowed RSS growth in MB")
+    parser.add_argument("--max-object-growth", type=int, default=10000, help="Allowed growth of tracked objects")
+    parser.add_argument("--max-gc-pause", type=float, default=50.0, help="Allowed single GC pause in ms")
+    parser.add_argument("--output", type=str, help="Append samples to this JSON lines file")
+    args = parser.parse_args(argv)
+    
+    config = load_config(args.config) if args.config else AirControlConfig()
+    config.mouse.backend = "null"
+    config.show_preview = False
+    if args.video:
+        source = LoopingFrameSource(load_frames(args.video, args.max_frames, (640, 480)), args.fps)
+    else:
+        config.hand_tracking.backend = "synthetic"
+        source = StaticFrameSource(fps=args.fps)
+    controller = AirControl(config, camera=source)
+    
+    output = open(args.output, "a") if args.output else None
+    
+    def on_sample(sample: Dict) -> None:
+        _print_sample(sample)
+        if output:
+            output.write(json.dumps(sample) + "\n")
+            output.flush()
+            
+    try:
+        samples = soak(controller, args.duration, args.interval, on_sample)
+    finally:
+        controller.cleanup()
+        if output:
+            output.close()
+            
+    failures = check_drift(samples, args.warmup, args.max_latency_drift, args.max_rss_growth,
+                           args.max_object_growth, args.max_gc_pause)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print(f"PASS: {samples[-1]['frames']} frames in {samples[-1]['elapsed_s']:.0f}s within all drift limits")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
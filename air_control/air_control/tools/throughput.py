@@ -0,0 +1,130 @@
+"""Throughput ceilings of the per-frame gesture path.
+
+Streams synthetic landmark frames through the gesture detectors, the
+coordinate transformer, the movement smoother and the full
+detect_gestures/handle_mouse path of AirControl with a null mouse
+backend, and reports frames per second for each. Frames are generated in
+chunks, so millions of frames run in constant memory. `--min-fps` turns
+the run into a CI check that fails when a component gets slower.
+
+Usage:
+    python -m air_control.tools.throughput --frames 1000000 --min-fps click=200000
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from .. import AirControl
+from ..config import AirControlConfig
+from ..gestures.click import ClickGesture
+from ..gestures.drag import DragGesture
+from ..utils.coordinates import CoordinateTransformer
+from ..utils.landmarks import array_to_landmarks
+from ..utils.smoothing import MovementSmoother
+from ..utils.synthetic import StaticFrameSource, SyntheticHandGenerator
+
+INDEX_FINGER_TIP = 8
+COMPONENTS = ("generate", "convert", "coordinates", "click", "drag", "smoothing", "pipeline")
+
+def _components(config: AirControlConfig) -> Dict[str, Callable]:
+    """Build a per-frame callable for each measured component."""
+    click = ClickGesture(config.mouse.click_threshold)
+    drag = DragGesture(config.mouse.fist_detection_threshold)
+    transformer = CoordinateTransformer(1920, 1080, config.mouse.speed_multiplier)
+    smoother = MovementSmoother(config.mouse.smoothing_factor)
+    controller = AirControl(config, camera=StaticFrameSource())
+    
+    def pipeline(hand_landmarks) -> None:
+        state = controller.detect_gestures(hand_landmarks)
+        if state:
+            controller.handle_mouse(state)
+            
+    return {
+        "coordinates": lambda lm: transformer.landmark_to_screen(lm.landmark[INDEX_FINGER_TIP]),
+        "click": click.detect,
+        "drag": drag.detect,
+        "smoothing": lambda lm: smoother.smooth(lm.landmark[INDEX_FINGER_TIP].x, lm.landmark[INDEX_FINGER_TIP].y),
+        "pipeline": pipeline,
+    }
+
+def measure(frames: int, chunk_size: int = 20000, seed: Optional[int] = 0) -> Dict[str, Dict[str, float]]:
+    """Push synthetic frames through every component.
+    
+    Args:
+        frames: Total number of frames
+        chunk_size: Frames generated at a time
+        seed: Seed of the synthetic generator
+        
+    Returns:
+        Frames, seconds and frames per second for each component
+    """
+    config = AirControlConfig()
+    config.mouse.backend = "null"
+    config.show_preview = False
+    config.hand_tracking.backend = "synthetic"
+    config.hand_tracking.synthetic_frames = 2
+    
+    generator = SyntheticHandGenerator(seed=seed)
+    components = _components(config)
+    elapsed = dict.fromkeys(COMPONENTS, 0.0)
+    
+    done = 0
+    while done < frames:
+        count = min(chunk_size, frames - done)
+        start = time.perf_counter()
+        sequence = generator.generate(count)
+        elapsed["generate"] += time.perf_counter() - start
+        
+        start = time.perf_counter()
+        landmark_lists = [array_to_landmarks(points) for points in sequence.landmarks]
+        elapsed["convert"] += time.perf_counter() - start
+        
+        for name, component in components.items():
+            start = time.perf_counter()
+            for hand_landmarks in landmark_lists:
+                component(hand_landmarks)
+            elapsed[name] += time.perf_counter() - start
+        done += count
+        
+    return {
+        name: {"frames": frames, "seconds": seconds, "fps": frames / seconds if seconds else float("inf")}
+        for name, seconds in elapsed.items()
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the throughput measurement."""
+    parser = argparse.ArgumentParser(description="Measure AirControl gesture path throughput")
+    parser.add_argument("--frames", type=int, default=1000000, help="Number of synthetic frames")
+    parser.add_argument("--chunk-size", type=int, default=20000, help="Frames generated at a time")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic generator")
+    parser.add_argument("--min-fps", action="append", default=[], metavar="NAME=FPS",
+                        help="Fail if a component runs slower than this, may be repeated")
+    parser.add_argument("--output", type=str, help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+    
+    limits = {}
+    for limit in args.min_fps:
+        name, _, value = limit.partition("=")
+        limits[name] = float(value)
+        
+    unknown = set(limits) - set(COMPONENTS)
+    if unknown:
+        parser.error(f"Unknown components in --min-fps: {', '.join(sorted(unknown))}")
+        
+    results = measure(args.frames, args.chunk_size, args.seed)
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+    print(report)
+    
+    failures = [name for name, fps in limits.items() if results[name]["fps"] < fps]
+    for name in failures:
+        print(f"{name}: {results[name]['fps']:.0f} fps is below the limit of {limits[name]:.0f} fps",
+              file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""Train a k-NN gesture classifier from labeled landmark datasets.
+
+Datasets are .npz files with a `landmarks` array of shape (N, 21, 3) and
+a `labels` array with the gesture name of each frame; frames labeled
+"none" are negatives and frames without a hand (NaN landmarks) are
+skipped. Datasets written by the extraction tool only need a `labels`
+array added. With `--synthetic`, frames from the synthetic generator are
+used instead, labeled from its ground-truth intervals.
+
+Usage:
+    python -m air_control.tools.train_gestures data/*.npz --output gestures.npz
+    python -m air_control.tools.train_gestures --synthetic 20000 --output gestures.npz
+"""
+import argparse
+import sys
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from ..gestures.knn import KNNGestureClassifier
+from ..utils.synthetic import SyntheticHandGenerator
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Train and save the classifier."""
+    parser = argparse.ArgumentParser(description="Train a k-NN gesture classifier")
+    parser.add_argument("datasets", nargs="*", help="Labeled .npz datasets")
+    parser.add_argument("--synthetic", type=int, default=0, help="Train on this many synthetic frames")
+    parser.add_argument("--output", type=str, required=True, help="Model file to write")
+    parser.add_argument("--k", type=int, default=5, help="Number of voting neighbours")
+    parser.add_argument("--max-distance", type=float, help="Reject queries farther than this, in palm units")
+    parser.add_argument("--aspect", type=float, default=4 / 3, help="Width / height of the camera image")
+    parser.add_argument("--components", type=int, default=8, help="Principal components kept, 0 for all")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Fraction of samples used for validation")
+    args = parser.parse_args(argv)
+    
+    points, labels = [], []
+    for path in args.datasets:
+        with np.load(path, allow_pickle=False) as data:
+            present = ~np.isnan(data["landmarks"][:, 0, 0])
+            points.append(data["landmarks"][present])
+            labels.append(data["labels"][present].astype(str))
+    if args.synthetic:
+        sequence = SyntheticHandGenerator(seed=0).generate(args.synthetic)
+        points.append(sequence.landmarks[sequence.present])
+        labels.append(sequence.labels()[sequence.present].astype(str))
+    if not points:
+        parser.error("No datasets given and --synthetic not set")
+        
+    points = np.concatenate(points)
+    labels = np.concatenate(labels)
+    order = np.random.default_rng(0).permutation(len(points))
+    split = int(len(points) * (1 - args.holdout))
+    train, test = order[:split], order[split:]
+    
+    classifier = KNNGestureClassifier(args.k, args.max_distance, args.aspect, args.components or None).fit(points[train], labels[train])
+    if len(test):
+        start = time.perf_counter()
+        predicted, _ = classifier.predict_batch(points[test])
+        per_frame = (time.perf_counter() - start) / len(test)
+        print(f"Validation accuracy: {np.mean(predicted == labels[test]):.3f} on {len(test)} samples, "
+              f"{per_frame * 1e6:.1f} us per frame batched")
+        for name in classifier.classes:
+            mask = labels[test] == name
+            if mask.any():
+                print(f"  {name}: recall {np.mean(predicted[mask] == name):.3f} ({mask.sum()} samples)")
+                
+    classifier.save(args.output)
+    print(f"Saved {len(train)} samples of {len(classifier.classes)} classes to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
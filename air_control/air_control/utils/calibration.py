@@ -0,0 +1,55 @@
+"""Fitting the reachable hand region from calibration samples."""
+from typing import List, Sequence
+
+import cv2
+import numpy as np
+
+def order_corners(points: Sequence[Sequence[float]]) -> List[List[float]]:
+    """Order four points as top-left, top-right, bottom-right, bottom-left.
+    
+    Args:
+        points: Four (x, y) points in any order
+        
+    Returns:
+        The points in region corner order
+    """
+    pts = np.asarray(points, dtype=np.float64).reshape(4, 2)
+    sums, diffs = pts.sum(axis=1), pts[:, 1] - pts[:, 0]
+    ordered = [pts[np.argmin(sums)], pts[np.argmin(diffs)], pts[np.argmax(sums)], pts[np.argmax(diffs)]]
+    return [[float(x), float(y)] for x, y in ordered]
+
+def region_from_samples(points: Sequence[Sequence[float]], trim: float = 0.02,
+                        aspect: float = 4 / 3) -> List[List[float]]:
+    """Fit the region covered by a sweep of fingertip positions.
+    
+    The `trim` fraction of outermost samples along each axis is dropped,
+    so the odd overreach or tracking glitch does not widen the region, and
+    the smallest rotated rectangle containing the rest is returned. The
+    rectangle is fitted in pixel proportions, so a tilted camera gives a
+    rectangle rather than a skewed parallelogram.
+    
+    Args:
+        points: Normalized (x, y) fingertip positions
+        trim: Fraction of samples trimmed at each end of both axes
+        aspect: Width / height of the camera image
+        
+    Returns:
+        Region corners in normalized coordinates, see order_corners
+        
+    Raises:
+        ValueError: If there are too few samples or they span no area
+    """
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if len(pts) < 10:
+        raise ValueError(f"Need at least 10 samples to fit a region, got {len(pts)}")
+    if trim > 0:
+        low = np.quantile(pts, trim, axis=0)
+        high = np.quantile(pts, 1 - trim, axis=0)
+        pts = pts[np.all((pts >= low) & (pts <= high), axis=1)]
+        
+    scaled = (pts * (aspect, 1.0)).astype(np.float32)
+    rect = cv2.minAreaRect(scaled)
+    if min(rect[1]) <= 1e-3:
+        raise ValueError("Calibration samples do not span an area")
+    corners = cv2.boxPoints(rect) / np.array([aspect, 1.0], dtype=np.float32)
+    return order_corners(np.clip(corners, 0.0, 1.0))
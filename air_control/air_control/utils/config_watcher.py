@@ -0,0 +1,61 @@
+"""Polling watcher that reloads the JSON configuration when it changes."""
+import logging
+import os
+import time
+from typing import Optional, Tuple
+
+from ..config import AirControlConfig, load_config
+
+logger = logging.getLogger(__name__)
+
+class ConfigWatcher:
+    """Detects changes to a config file and loads the new configuration.
+    
+    The file's modification time and size are checked at most every
+    `interval` seconds, so poll() can be called once per frame. A file
+    that fails to load is logged and skipped; the next change is tried
+    again. Polling keeps the reload on the caller's thread, so changes are
+    applied between frames rather than while one is in flight.
+    """
+    
+    def __init__(self, path: str, interval: float = 1.0):
+        """Initialize the watcher.
+        
+        Args:
+            path: Path to the JSON config file
+            interval: Minimum seconds between file checks
+        """
+        self.path = path
+        self.interval = interval
+        self._signature = self._stat()
+        self._next_check = time.monotonic() + interval
+        
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        """Modification time and size of the file, None if it is missing."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+        
+    def poll(self) -> Optional[AirControlConfig]:
+        """Check the file and load it if it changed.
+        
+        Returns:
+            The new configuration, None if the file is unchanged, missing
+            or invalid
+        """
+        now = time.monotonic()
+        if now < self._next_check:
+            return None
+        self._next_check = now + self.interval
+        
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return None
+        self._signature = signature
+        try:
+            return load_config(self.path)
+        except Exception as e:
+            logger.error("Ignoring invalid config %s: %s", self.path, e)
+            return None
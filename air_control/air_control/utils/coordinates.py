@@ -1,9 +1,18 @@
 """Coordinate transformation utilities."""
-from typing import Tuple
+from typing import List, Sequence, Tuple
 
+import cv2
 import mediapipe as mp
 import numpy as np
 
+try:
+    import screeninfo
+except ImportError:
+    screeninfo = None
+
+# Corners of the unit square in the order used for regions: TL, TR, BR, BL
+UNIT_SQUARE = np.array([(0, 0), (1, 0), (1, 1), (0, 1)], dtype=np.float32)
+
 class CoordinateTransformer:
     """Handles coordinate transformations between different spaces."""
     
@@ -36,3 +45,126 @@ class CoordinateTransformer:
         screen_y = max(0, min(screen_y, self.screen_height))
         
         return screen_x, screen_y
+
+def detect_monitors() -> List[Tuple[int, int, int, int]]:
+    """List the monitors of the virtual desktop as (x, y, width, height).
+    
+    Requires the optional `screeninfo` package; returns an empty list
+    when it is not installed or no monitor is found.
+    """
+    if screeninfo is None:
+        return []
+    try:
+        return [(m.x, m.y, m.width, m.height) for m in screeninfo.get_monitors()]
+    except Exception:
+        return []
+
+def build_curve_lut(points: Sequence[float], size: int = 1024) -> np.ndarray:
+    """Build a response curve lookup table.
+    
+    Args:
+        points: Curve values at evenly spaced inputs from 0 to 1; must be
+            non-decreasing. Empty for the identity curve.
+        size: Number of table entries
+        
+    Returns:
+        Table mapping index i (input i / (size - 1)) to the output in [0, 1]
+    """
+    if not points:
+        return np.linspace(0.0, 1.0, size)
+    values = np.asarray(points, dtype=np.float64)
+    if len(values) < 2 or np.any(np.diff(values) < 0):
+        raise ValueError("A response curve needs at least two non-decreasing points")
+    return np.clip(np.interp(np.linspace(0, 1, size), np.linspace(0, 1, len(values)), values), 0.0, 1.0)
+
+class RegionTransformer:
+    """Maps a calibrated region of the camera image onto the virtual desktop.
+    
+    The region is a quadrilateral in normalized image coordinates (the
+    range the user's hand comfortably reaches). A precomputed homography
+    takes it onto the unit square, a lookup-table response curve shapes
+    each axis (for example finer control in the middle, faster towards the
+    edges), and the result is scaled onto the bounding box of all monitors.
+    Points in gaps between monitors of uneven layouts are moved to the
+    nearest monitor. Provides the same landmark_to_screen() as
+    CoordinateTransformer.
+    """
+    
+    def __init__(self, corners: Sequence[Sequence[float]], monitors: Sequence[Sequence[int]],
+                 curve: Sequence[float] = (), lut_size: int = 1024):
+        """Initialize the transformer.
+        
+        Args:
+            corners: Region corners in normalized image coordinates, in the
+                order top-left, top-right, bottom-right, bottom-left
+            monitors: Monitors as (x, y, width, height) in desktop pixels
+            curve: Response curve points, see build_curve_lut
+            lut_size: Number of lookup table entries
+        """
+        if len(corners) != 4:
+            raise ValueError("A region needs exactly four corners")
+        if not monitors:
+            raise ValueError("At least one monitor is required")
+        self.corners = np.asarray(corners, dtype=np.float32)
+        self.homography = cv2.getPerspectiveTransform(self.corners, UNIT_SQUARE)
+        self.lut = build_curve_lut(curve, lut_size)
+        self._lut_scale = lut_size - 1
+        
+        self.monitors = np.asarray(monitors, dtype=np.int64).reshape(-1, 4)
+        x0, y0 = self.monitors[:, :2].min(axis=0)
+        x1, y1 = (self.monitors[:, :2] + self.monitors[:, 2:]).max(axis=0)
+        self.desktop = (int(x0), int(y0), int(x1 - x0), int(y1 - y0))
+        
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """Bounding box (x0, y0, x1, y1) of the region in normalized image coordinates."""
+        x0, y0 = self.corners.min(axis=0)
+        x1, y1 = self.corners.max(axis=0)
+        return float(x0), float(y0), float(x1), float(y1)
+        
+    def map_point(self, x: float, y: float) -> Tuple[int, int]:
+        """Map a normalized image point to desktop pixels.
+        
+        Args:
+            x: Normalized image x
+            y: Normalized image y
+            
+        Returns:
+            Desktop x and y in pixels
+        """
+        h = self.homography
+        w = h[2, 0] * x + h[2, 1] * y + h[2, 2]
+        u = (h[0, 0] * x + h[0, 1] * y + h[0, 2]) / w
+        v = (h[1, 0] * x + h[1, 1] * y + h[1, 2]) / w
+        u = self.lut[int(min(max(u, 0.0), 1.0) * self._lut_scale + 0.5)]
+        v = self.lut[int(min(max(v, 0.0), 1.0) * self._lut_scale + 0.5)]
+        
+        dx, dy, dw, dh = self.desktop
+        px = dx + int(u * (dw - 1))
+        py = dy + int(v * (dh - 1))
+        if len(self.monitors) > 1:
+            px, py = self._snap(px, py)
+        return px, py
+        
+    def _snap(self, px: int, py: int) -> Tuple[int, int]:
+        """Move a desktop point outside every monitor onto the nearest one."""
+        best, best_distance = (px, py), None
+        for mx, my, mw, mh in self.monitors:
+            cx = min(max(px, mx), mx + mw - 1)
+            cy = min(max(py, my), my + mh - 1)
+            distance = (cx - px) ** 2 + (cy - py) ** 2
+            if distance == 0:
+                return px, py
+            if best_distance is None or distance < best_distance:
+                best, best_distance = (int(cx), int(cy)), distance
+        return best
+        
+    def landmark_to_screen(self, landmark: mp.framework.formats.landmark_pb2.NormalizedLandmark) -> Tuple[int, int]:
+        """Convert a normalized landmark to desktop coordinates.
+        
+        Args:
+            landmark: MediaPipe normalized landmark
+            
+        Returns:
+            Tuple containing desktop x and y coordinates
+        """
+        return self.map_point(landmark.x, landmark.y)
@@ -0,0 +1,150 @@
+"""Fixed-size history of recent landmark frames with incremental motion features."""
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .landmarks import MIDDLE_FINGER_MCP, NUM_LANDMARKS, WRIST
+
+class LandmarkHistory:
+    """Ring buffer of the last `window + 1` timestamped landmark frames.
+    
+    All storage is preallocated. Motion features of one tracked landmark
+    over the window (displacement, path length and the signed sum of
+    turning angles) are kept as running sums: each push adds the newest
+    step and subtracts the step leaving the window, so the cost per frame
+    does not depend on the window length. Positions are in normalized
+    image units with x scaled by the aspect ratio, so both axes match.
+    
+    A frame without a hand clears the history, as motion across a dropout
+    is unknown.
+    """
+    
+    def __init__(self, window: int = 15, track: int = MIDDLE_FINGER_MCP, aspect: float = 4 / 3,
+                 min_step: float = 0.005):
+        """Initialize the history.
+        
+        Args:
+            window: Number of steps (frame to frame movements) covered
+            track: Landmark whose motion is measured
+            aspect: Width / height of the camera image
+            min_step: Steps shorter than this do not contribute turning angle,
+                so jitter of a still hand is not mistaken for rotation
+        """
+        if window < 1:
+            raise ValueError("The history window must cover at least one step")
+        self.window = window
+        self.track = track
+        self.aspect = aspect
+        self.min_step = min_step
+        
+        self.capacity = window + 1
+        self.timestamps = np.zeros(self.capacity)
+        self.points = np.zeros((self.capacity, NUM_LANDMARKS, 3), dtype=np.float32)
+        # Length of the step ending at each frame and the turn into it
+        self._steps = np.zeros(self.capacity)
+        self._turns = np.zeros(self.capacity)
+        self.clear()
+        
+    def clear(self) -> None:
+        """Forget all frames."""
+        self.count = 0
+        self.head = -1
+        self.path_length = 0.0
+        self.turning = 0.0
+        self.last_turn = 0.0
+        self._position = (0.0, 0.0)
+        self._segment = (0.0, 0.0)
+        
+    def push(self, timestamp: float, points: Optional[np.ndarray]) -> None:
+        """Add a frame.
+        
+        Args:
+            timestamp: Capture time in seconds
+            points: Array of shape (21, 3) with normalized landmarks, None if
+                no hand was detected
+        """
+        if points is None:
+            self.clear()
+            return
+            
+        self.head = (self.head + 1) % self.capacity
+        slot = self.head
+        self.timestamps[slot] = timestamp
+        self.points[slot] = points
+        x = float(points[self.track, 0]) * self.aspect
+        y = float(points[self.track, 1])
+        
+        step = turn = 0.0
+        if self.count:
+            dx, dy = x - self._position[0], y - self._position[1]
+            step = math.hypot(dx, dy)
+            px, py = self._segment
+            if self.count > 1 and step >= self.min_step and math.hypot(px, py) >= self.min_step:
+                # Signed angle from the previous step to this one
+                turn = math.atan2(px * dy - py * dx, px * dx + py * dy)
+            if step >= self.min_step or self.count == 1:
+                self._segment = (dx, dy)
+        self._position = (x, y)
+        self._steps[slot] = step
+        self._turns[slot] = turn
+        self.path_length += step
+        self.turning += turn
+        self.last_turn = turn
+        
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            # The old oldest frame was overwritten. The step into the new
+            # oldest frame and the turn into the one after it left the window.
+            self.path_length -= self._steps[(slot + 1) % self.capacity]
+            self.turning -= self._turns[(slot + 2) % self.capacity]
+            
+    @property
+    def oldest(self) -> int:
+        """Slot of the oldest frame."""
+        return (self.head - self.count + 1) % self.capacity
+        
+    @property
+    def duration(self) -> float:
+        """Time covered by the history in seconds."""
+        if self.count < 2:
+            return 0.0
+        return float(self.timestamps[self.head] - self.timestamps[self.oldest])
+        
+    @property
+    def displacement(self) -> Tuple[float, float]:
+        """Movement of the tracked landmark from the oldest to the newest frame."""
+        if self.count < 2:
+            return 0.0, 0.0
+        newest = self.points[self.head, self.track]
+        oldest = self.points[self.oldest, self.track]
+        return float(newest[0] - oldest[0]) * self.aspect, float(newest[1] - oldest[1])
+        
+    @property
+    def velocity(self) -> Tuple[float, float]:
+        """Velocity of the tracked landmark over the last step, per second."""
+        if self.count < 2:
+            return 0.0, 0.0
+        previous = (self.head - 1) % self.capacity
+        dt = self.timestamps[self.head] - self.timestamps[previous]
+        if dt <= 0:
+            return 0.0, 0.0
+        delta = self.points[self.head, self.track] - self.points[previous, self.track]
+        return float(delta[0]) * self.aspect / dt, float(delta[1]) / dt
+        
+    @property
+    def straightness(self) -> float:
+        """Displacement divided by path length, 1 for a straight movement."""
+        if self.path_length <= 0:
+            return 0.0
+        return math.hypot(*self.displacement) / self.path_length
+        
+    @property
+    def palm_size(self) -> float:
+        """Wrist to middle finger MCP distance in the newest frame."""
+        if self.count == 0:
+            return 0.0
+        wrist = self.points[self.head, WRIST]
+        mcp = self.points[self.head, MIDDLE_FINGER_MCP]
+        return math.hypot(float(mcp[0] - wrist[0]) * self.aspect, float(mcp[1] - wrist[1]))
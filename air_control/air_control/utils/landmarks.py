@@ -0,0 +1,67 @@
+"""Conversion utilities between MediaPipe landmarks and NumPy arrays."""
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+
+NUM_LANDMARKS = 21
+WRIST = 0
+MIDDLE_FINGER_MCP = 9
+
+def landmarks_to_array(hand_landmarks: landmark_pb2.NormalizedLandmarkList) -> np.ndarray:
+    """Convert hand landmarks to an array.
+    
+    Args:
+        hand_landmarks: MediaPipe hand landmarks
+        
+    Returns:
+        Array of shape (21, 3) with normalized x, y, z coordinates
+    """
+    return np.array(
+        [(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark],
+        dtype=np.float32
+    )
+
+def array_to_landmarks(points: np.ndarray) -> landmark_pb2.NormalizedLandmarkList:
+    """Convert an array of points to hand landmarks.
+    
+    Args:
+        points: Array of shape (21, 3) with normalized x, y, z coordinates
+        
+    Returns:
+        MediaPipe hand landmarks with the same layout as HandTracker output
+    """
+    hand_landmarks = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z in points.tolist():
+        hand_landmarks.landmark.add(x=x, y=y, z=z)
+    return hand_landmarks
+
+def normalize_landmarks(points: np.ndarray, aspect: float = 1.0) -> np.ndarray:
+    """Remove translation, scale and in-plane rotation from hand landmarks.
+    
+    The wrist is moved to the origin, the hand is scaled so the wrist to
+    middle finger MCP distance is one, and rotated so that this segment
+    points up (negative y). Works on a single hand or a batch.
+    
+    Args:
+        points: Array of shape (..., 21, 3) with normalized x, y, z coordinates
+        aspect: Width / height of the image, so x and y are scaled equally
+        
+    Returns:
+        Array of the same shape in palm units
+    """
+    points = np.asarray(points, dtype=np.float32) * np.array([aspect, 1.0, 1.0], dtype=np.float32)
+    points -= points[..., WRIST:WRIST + 1, :]
+    
+    # Rotation taking the palm direction (vx, vy) to (0, -1), divided by
+    # the palm length once more to scale it to one
+    vx, vy = points[..., MIDDLE_FINGER_MCP, 0], points[..., MIDDLE_FINGER_MCP, 1]
+    squared = vx * vx + vy * vy
+    squared = np.maximum(squared, np.float32(1e-12))
+    rotation = np.empty(squared.shape + (2, 2), dtype=np.float32)
+    rotation[..., 0, 0] = rotation[..., 1, 1] = -vy / squared
+    rotation[..., 0, 1] = -vx / squared
+    rotation[..., 1, 0] = vx / squared
+    
+    normalized = np.empty_like(points)
+    normalized[..., :2] = points[..., :2] @ rotation
+    normalized[..., 2] = points[..., 2] / np.sqrt(squared)[..., None]
+    return normalized
@@ -0,0 +1,89 @@
+"""Summary statistics for latency and benchmark samples."""
+import math
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from scipy.stats import mannwhitneyu
+except ImportError:
+    mannwhitneyu = None
+
+def describe(values: Sequence[float], scale: float = 1.0) -> Dict[str, float]:
+    """Summarize a sample distribution.
+    
+    Args:
+        values: Sample values
+        scale: Factor applied to every value, e.g. 1000 for seconds to milliseconds
+        
+    Returns:
+        Dictionary with count, mean, std, min, p50, p90, p99 and max
+    """
+    if len(values) == 0:
+        return {"count": 0}
+        
+    samples = np.asarray(values, dtype=np.float64) * scale
+    p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+    return {
+        "count": int(samples.size),
+        "mean": float(samples.mean()),
+        "std": float(samples.std()),
+        "min": float(samples.min()),
+        "p50": float(p50),
+        "p90": float(p90),
+        "p99": float(p99),
+        "max": float(samples.max()),
+    }
+
+def bootstrap_ci(values: Sequence[float], confidence: float = 0.95, resamples: int = 2000,
+                 seed: Optional[int] = 0) -> Tuple[float, float]:
+    """Percentile bootstrap confidence interval of the median.
+    
+    Args:
+        values: Sample values
+        confidence: Coverage of the interval
+        resamples: Number of bootstrap resamples
+        seed: Seed of the resampling
+        
+    Returns:
+        Lower and upper bound of the interval
+    """
+    samples = np.asarray(values, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    medians = np.median(samples[rng.integers(0, len(samples), (resamples, len(samples)))], axis=1)
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(medians, [tail, 100 - tail])
+    return float(low), float(high)
+
+def mann_whitney_greater(current: Sequence[float], baseline: Sequence[float]) -> float:
+    """One-sided Mann-Whitney U test that `current` tends to be larger.
+    
+    Uses scipy when it is installed, otherwise the normal approximation
+    with tie correction, which is accurate from about eight samples per
+    group.
+    
+    Args:
+        current: Samples of the current run
+        baseline: Samples of the baseline
+        
+    Returns:
+        p-value of the hypothesis that current values are not larger
+    """
+    if mannwhitneyu is not None:
+        return float(mannwhitneyu(current, baseline, alternative="greater").pvalue)
+        
+    x = np.asarray(current, dtype=np.float64)
+    y = np.asarray(baseline, dtype=np.float64)
+    n1, n2 = len(x), len(y)
+    combined = np.concatenate((x, y))
+    values, inverse, counts = np.unique(combined, return_inverse=True, return_counts=True)
+    # Average rank of each distinct value, ranks starting at 1
+    ranks = (np.cumsum(counts) - (counts - 1) / 2)[inverse]
+    u = ranks[:n1].sum() - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - np.sum(counts ** 3 - counts) / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    # Continuity correction towards the null hypothesis
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
@@ -0,0 +1,512 @@
+"""Synthetic hand landmark sequences for headless testing and benchmarking."""
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from .landmarks import NUM_LANDMARKS, array_to_landmarks
+
+# Landmark templates in hand units: wrist at the origin, middle finger MCP
+# one unit above it, image axes (x right, y down)
+OPEN_HAND = np.array([
+    (0.0, 0.0),
+    (-0.35, -0.2), (-0.6, -0.45), (-0.8, -0.65), (-0.95, -0.85),
+    (-0.3, -0.95), (-0.35, -1.35), (-0.38, -1.6), (-0.4, -1.82),
+    (0.0, -1.0), (0.0, -1.45), (0.0, -1.72), (0.0, -1.95),
+    (0.27, -0.95), (0.3, -1.35), (0.32, -1.6), (0.34, -1.8),
+    (0.5, -0.85), (0.58, -1.15), (0.62, -1.35), (0.66, -1.52),
+])
+
+def _pose(**changes: Tuple[float, float]) -> np.ndarray:
+    """Copy of the open hand with some landmarks moved."""
+    pose = OPEN_HAND.copy()
+    for index, point in changes.items():
+        pose[int(index[1:])] = point
+    return pose
+
+# Thumb tip meets index tip
+PINCH = _pose(p3=(-0.55, -0.9), p4=(-0.46, -1.16), p6=(-0.4, -1.3), p7=(-0.45, -1.24), p8=(-0.45, -1.17))
+# Thumb tip meets pinky tip
+PINKY_PINCH = _pose(p2=(-0.35, -0.5), p3=(0.0, -0.65), p4=(0.36, -0.76),
+                    p18=(0.5, -1.05), p19=(0.45, -0.9), p20=(0.37, -0.77))
+# All fingertips curled below their MCP joints, thumb across the fingers
+FIST = _pose(p3=(-0.4, -0.75), p4=(-0.1, -1.05),
+             p6=(-0.35, -1.15), p7=(-0.3, -0.9), p8=(-0.28, -0.8),
+             p10=(0.0, -1.2), p11=(0.02, -0.95), p12=(0.02, -0.85),
+             p14=(0.3, -1.1), p15=(0.3, -0.9), p16=(0.3, -0.82),
+             p18=(0.55, -1.0), p19=(0.52, -0.85), p20=(0.5, -0.75))
+
+POSES = {"left_click": PINCH, "right_click": PINKY_PINCH, "drag": FIST}
+GESTURES = tuple(POSES)
+
+# Depth grows towards the fingertips, like MediaPipe's wrist-relative z
+TEMPLATE_Z = -0.02 * np.linalg.norm(OPEN_HAND, axis=1)
+
+SEGMENT_KINDS = ("idle", "move", "sweep", "left_click", "right_click", "drag")
+SEGMENT_WEIGHTS = (0.2, 0.3, 0.1, 0.2, 0.1, 0.1)
+
+# Wrist positions that keep most of an upright hand inside the image
+WRIST_MIN = np.array([0.1, 0.35])
+WRIST_MAX = np.array([0.9, 0.95])
+
+@dataclass
+class SyntheticSequence:
+    """Generated landmark sequence with ground-truth gesture intervals."""
+    timestamps: np.ndarray
+    landmarks: np.ndarray
+    present: np.ndarray
+    intervals: List[Tuple[str, int, int]] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+        
+    def labels(self, none: str = "none") -> np.ndarray:
+        """Per-frame gesture names from the ground-truth intervals.
+        
+        Args:
+            none: Name used for frames outside every interval
+            
+        Returns:
+            Array of gesture names, one per frame
+        """
+        labels = np.full(len(self), none, dtype=object)
+        for gesture, start, end in self.intervals:
+            labels[start:end] = gesture
+        return labels
+        
+    def landmark_lists(self) -> Iterator[Optional[mp.framework.formats.landmark_pb2.NormalizedLandmarkList]]:
+        """Yield each frame in the structure HandTracker.process_frame returns.
+        
+        Yields:
+            Hand landmarks, or None for frames where the hand dropped out
+        """
+        for points, present in zip(self.landmarks, self.present):
+            yield array_to_landmarks(points) if present else None
+
+class SyntheticHandGenerator:
+    """Generates realistic 21-point hand landmark sequences.
+    
+    A sequence is a random series of segments: holding still, moving to a
+    new position, fast sweeps, and left-click pinches, right-click pinches
+    and fists that ramp in and out while the hand drifts. Hand scale and
+    roll vary between segments, physiological tremor and landmark jitter
+    are added on top, and dropouts remove the hand for a few frames. All
+    frames are computed with array operations, so millions of frames can
+    be generated in seconds.
+    """
+    
+    def __init__(self, fps: float = 30.0, seed: Optional[int] = None,
+                 tremor: float = 0.002, noise: float = 0.001,
+                 dropout_rate: float = 0.0, aspect: float = 4 / 3, pose_ramp: float = 0.08):
+        """Initialize the generator.
+        
+        Args:
+            fps: Frame rate of the generated sequences
+            seed: Seed for reproducible sequences
+            tremor: Amplitude of the 8-12 Hz hand tremor in normalized units
+            noise: Standard deviation of per-landmark jitter in normalized units
+            dropout_rate: Probability per frame that the hand drops out
+            aspect: Width / height of the simulated image
+            pose_ramp: Time for a pose to close or open, in seconds
+        """
+        self.fps = fps
+        self.rng = np.random.default_rng(seed)
+        self.tremor = tremor
+        self.noise = noise
+        self.dropout_rate = dropout_rate
+        self.aspect = aspect
+        self.pose_ramp = pose_ramp
+        
+    def generate(self, n_frames: int, kinds: Tuple[str, ...] = SEGMENT_KINDS,
+                 weights: Optional[Tuple[float, ...]] = None) -> SyntheticSequence:
+        """Generate a sequence.
+        
+        Args:
+            n_frames: Number of frames
+            kinds: Segment kinds to draw from
+            weights: Relative frequency of each kind, uniform if None
+            
+        Returns:
+            The generated sequence
+        """
+        rng = self.rng
+        if weights is None:
+            weights = SEGMENT_WEIGHTS if kinds == SEGMENT_KINDS else (1.0,) * len(kinds)
+        p = np.asarray(weights, dtype=np.float64)
+        p /= p.sum()
+        
+        center = np.empty((n_frames, 2))
+        scale = np.empty(n_frames)
+        roll = np.empty(n_frames)
+        blend = np.zeros((n_frames, len(GESTURES)))
+        intervals = []
+        
+        position = rng.uniform(WRIST_MIN + 0.2, WRIST_MAX - 0.2)
+        hand_scale = rng.uniform(0.08, 0.14)
+        hand_roll = rng.uniform(-0.3, 0.3)
+        start = 0
+        while start < n_frames:
+            kind = kinds[rng.choice(len(kinds), p=p)]
+            if kind == "sweep":
+                length = self._frames(0.1, 0.25)
+                target = np.clip(position + rng.choice([-1, 1], 2) * rng.uniform(0.3, 0.5, 2), WRIST_MIN, WRIST_MAX)
+            elif kind == "idle":
+                length = self._frames(0.3, 1.5)
+                target = position
+            else:
+                length = self._frames(0.3, 1.0)
+                target = np.clip(position + rng.normal(0, 0.12, 2), WRIST_MIN, WRIST_MAX)
+            end = min(start + length, n_frames)
+            
+            # Minimum-jerk profile between the segment's start and end points
+            t = np.linspace(0, 1, length)[:end - start]
+            profile = 10 * t ** 3 - 15 * t ** 4 + 6 * t ** 5
+            center[start:end] = position + profile[:, None] * (target - position)
+            next_scale = np.clip(hand_scale * rng.uniform(0.85, 1.15), 0.06, 0.18)
+            scale[start:end] = hand_scale + profile * (next_scale - hand_scale)
+            next_roll = np.clip(hand_roll + rng.normal(0, 0.1), -0.5, 0.5)
+            roll[start:end] = hand_roll + profile * (next_roll - hand_roll)
+            
+            if kind in POSES:
+                ramp = max(1, int(self.pose_ramp * self.fps))
+                weight = np.minimum(1.0, np.minimum(np.arange(length) + 1, length - np.arange(length)) / ramp)
+                blend[start:end, GESTURES.index(kind)] = weight[:end - start]
+                closed = np.flatnonzero(weight[:end - start] >= 1.0)
+                if closed.size:
+                    intervals.append((kind, start + int(closed[0]), start + int(closed[-1]) + 1))
+                    
+            position, hand_scale, hand_roll = target, next_scale, next_roll
+            start = end
+            
+        landmarks = self._compose(center, scale, roll, blend)
+        present = self._dropouts(n_frames)
+        timestamps = np.arange(n_frames) / self.fps
+        return SyntheticSequence(timestamps, landmarks, present, intervals)
+        
+    def _frames(self, low: float, high: float) -> int:
+        """Draw a segment length in frames from a duration range in seconds."""
+        return max(2, int(self.rng.uniform(low, high) * self.fps))
+        
+    def _compose(self, center: np.ndarray, scale: np.ndarray, roll: np.ndarray,
+                 blend: np.ndarray) -> np.ndarray:
+        """Build the (N, 21, 3) landmark array from per-frame parameters."""
+        n_frames = len(center)
+        offsets = np.stack([POSES[g] - OPEN_HAND for g in GESTURES])
+        shape = OPEN_HAND + np.einsum("ng,gkd->nkd", blend, offsets)
+        
+        cos, sin = np.cos(roll), np.sin(roll)
+        x = cos[:, None] * shape[..., 0] - sin[:, None] * shape[..., 1]
+        y = sin[:, None] * shape[..., 0] + cos[:, None] * shape[..., 1]
+        
+        # Tremor moves the whole hand, noise jitters single landmarks
+        t = np.arange(n_frames) / self.fps
+        freq = self.rng.uniform(8, 12, 2)
+        phase = self.rng.uniform(0, 2 * np.pi, 2)
+        tremor = self.tremor * np.sin(2 * np.pi * freq * t[:, None] + phase)
+        
+        landmarks = np.empty((n_frames, NUM_LANDMARKS, 3), dtype=np.float32)
+        landmarks[..., 0] = center[:, 0, None] + scale[:, None] * x + tremor[:, 0, None]
+        landmarks[..., 1] = center[:, 1, None] + scale[:, None] * self.aspect * y + tremor[:, 1, None]
+        landmarks[..., 2] = scale[:, None] * TEMPLATE_Z
+        if self.noise:
+            landmarks[..., :2] += self.rng.normal(0, self.noise, (n_frames, NUM_LANDMARKS, 2))
+        return landmarks
+        
+    def _dropouts(self, n_frames: int) -> np.ndarray:
+        """Mask of frames where the hand is visible."""
+        present = np.ones(n_frames, dtype=bool)
+        if self.dropout_rate <= 0:
+            return present
+        for start in np.flatnonzero(self.rng.random(n_frames) < self.dropout_rate):
+            present[start:start + self.rng.integers(1, 6)] = False
+        return present
+
+class SyntheticHandTracker:
+    """Drop-in replacement for HandTracker that replays a synthetic sequence.
+    
+    Frames passed to process_frame are returned untouched, so any frame
+    source can drive it. The sequence is replayed in a loop, converting
+    each frame's landmarks when it is returned, so long sequences cost no
+    more than their arrays.
+    
+    With a latency, each frame sleeps for a simulated inference time that
+    follows the quality level like MediaPipe's does: proportional to the
+    inference pixels, so to the square of `inference_scale`, and halved
+    by the lite model (`model_complexity` 0). This lets the quality
+    governor be exercised without a camera.
+    """
+    
+    def __init__(self, sequence: SyntheticSequence, latency_ms: float = 0.0, inference_scale: float = 1.0,
+                 model_complexity: int = 1):
+        """Initialize the tracker.
+        
+        Args:
+            sequence: Sequence to replay
+            latency_ms: Simulated inference time per frame at full quality
+            inference_scale: Initial inference resolution scale
+            model_complexity: Initial model complexity
+        """
+        self.sequence = sequence
+        self.mp_hands = mp.solutions.hands
+        self.timeline = None
+        self.index = 0
+        self.latency_ms = latency_ms
+        self.inference_scale = inference_scale
+        self.model_complexity = model_complexity
+        
+    @property
+    def frame_latency_ms(self) -> float:
+        """Simulated inference time of a frame at the current quality."""
+        return self.latency_ms * self.inference_scale ** 2 * (0.5 if self.model_complexity == 0 else 1.0)
+        
+    def process_frame(self, frame: np.ndarray) -> Tuple[Optional[mp.framework.formats.landmark_pb2.NormalizedLandmarkList], np.ndarray]:
+        """Return the next synthetic landmarks.
+        
+        Args:
+            frame: Video frame, passed through unchanged
+            
+        Returns:
+            Tuple containing:
+                - Hand landmarks, None during dropouts
+                - The frame
+        """
+        if self.latency_ms > 0:
+            time.sleep(self.frame_latency_ms / 1000)
+        index = self.index % len(self.sequence)
+        hand_landmarks = None
+        if self.sequence.present[index]:
+            hand_landmarks = array_to_landmarks(self.sequence.landmarks[index])
+        self.index += 1
+        if self.timeline:
+            self.timeline.mark("inference")
+        return hand_landmarks, frame
+        
+    def apply_quality(self, level) -> None:
+        """Apply the knobs of a quality level the simulated latency depends on."""
+        self.inference_scale = level.inference_scale
+        self.model_complexity = level.model_complexity
+        
+    def reset(self) -> None:
+        """Restart the replay from the first frame."""
+        self.index = 0
+        
+    def close(self) -> None:
+        """Nothing to release."""
+
+class StaticFrameSource:
+    """Camera-compatible source returning the same blank frame.
+    
+    Used together with SyntheticHandTracker when no camera is involved.
+    """
+    
+    def __init__(self, width: int = 640, height: int = 480, fps: Optional[float] = None,
+                 max_frames: Optional[int] = None):
+        """Initialize the source.
+        
+        Args:
+            width: Frame width in pixels
+            height: Frame height in pixels
+            fps: Pace reads at this rate, None to return frames immediately
+            max_frames: Number of frames before reads fail, None for no limit
+        """
+        self.frame = np.zeros((height, width, 3), dtype=np.uint8)
+        self.interval = 1.0 / fps if fps else 0.0
+        self.max_frames = max_frames
+        self.count = 0
+        self._next_time: Optional[float] = None
+        
+    def read_timestamped(self) -> Tuple[bool, Optional[np.ndarray], float]:
+        """Return the blank frame with the current time."""
+        if self.max_frames is not None and self.count >= self.max_frames:
+            return False, None, time.perf_counter()
+        if self.interval:
+            now = time.perf_counter()
+            if self._next_time is None:
+                self._next_time = now
+            time.sleep(max(0.0, self._next_time - now))
+            self._next_time = max(self._next_time + self.interval, now)
+        self.count += 1
+        return True, self.frame, time.perf_counter()
+        
+    def read_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Return the blank frame."""
+        success, frame, _ = self.read_timestamped()
+        return success, frame
+        
+    def release(self) -> None:
+        """Nothing to release."""
+
+class LoopingFrameSource(StaticFrameSource):
+    """Camera-compatible source replaying a list of frames in a loop."""
+    
+    def __init__(self, frames: List[np.ndarray], fps: Optional[float] = None,
+                 max_frames: Optional[int] = None):
+        """Initialize the source.
+        
+        Args:
+            frames: Frames to replay, e.g. loaded from a recording
+            fps: Pace reads at this rate, None to return frames immediately
+            max_frames: Number of frames before reads fail, None for no limit
+        """
+        if not frames:
+            raise ValueError("LoopingFrameSource needs at least one frame")
+        height, width = frames[0].shape[:2]
+        super().__init__(width, height, fps, max_frames)
+        self.frames = frames
+        
+    def read_timestamped(self) -> Tuple[bool, Optional[np.ndarray], float]:
+        """Return the next frame of the loop with the current time."""
+        self.frame = self.frames[self.count % len(self.frames)]
+        return super().read_timestamped()
+
+class FakeVideoCapture:
+    """cv2.VideoCapture stand-in with a table of supported capture modes.
+    
+    Emulates how UVC drivers negotiate: a requested FOURCC and resolution
+    snap to the closest supported mode, the frame rate is capped at what
+    that mode delivers, and reads are paced at the granted rate. Used to
+    test mode probing without a camera.
+    """
+    
+    def __init__(self, camera_id: int = 0, modes: Optional[Dict[Tuple[str, int, int], float]] = None,
+                 decode_ms: Optional[Dict[str, float]] = None,
+                 schedule: Optional["CaptureFailureSchedule"] = None):
+        """Initialize the capture.
+        
+        Args:
+            camera_id: Ignored, for signature compatibility
+            modes: Maximum frame rate of each (fourcc, width, height); the
+                first entry is the driver's default mode
+            decode_ms: Extra read time per FOURCC in milliseconds
+            schedule: Failures to emulate, None for a capture that never fails
+        """
+        self.modes = modes or {("YUYV", 1280, 720): 10.0, ("YUYV", 640, 480): 30.0,
+                               ("MJPG", 1280, 720): 30.0, ("MJPG", 640, 480): 30.0}
+        self.decode_ms = decode_ms or {}
+        self.fourcc, self.width, self.height = next(iter(self.modes))
+        self.fps = self.modes[(self.fourcc, self.width, self.height)]
+        self.buffer_size = 4
+        self.schedule = schedule
+        self.opened = schedule is None or schedule.current() != "error"
+        self._next_time: Optional[float] = None
+        
+    def _negotiate(self, fourcc: str, width: int, height: int, fps: Optional[float]) -> None:
+        """Snap a request to the closest supported mode."""
+        candidates = [m for m in self.modes if m[0] == fourcc] or list(self.modes)
+        self.fourcc, self.width, self.height = min(
+            candidates, key=lambda m: abs(m[1] * m[2] - width * height))
+        limit = self.modes[(self.fourcc, self.width, self.height)]
+        self.fps = min(fps, limit) if fps else limit
+        self._next_time = None
+        
+    def set(self, prop: int, value: float) -> bool:
+        """Request a capture property."""
+        if prop == cv2.CAP_PROP_FOURCC:
+            code = int(value).to_bytes(4, "little").decode("ascii")
+            self._negotiate(code, self.width, self.height, self.fps)
+        elif prop == cv2.CAP_PROP_FRAME_WIDTH:
+            self._negotiate(self.fourcc, int(value), self.height, self.fps)
+        elif prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            self._negotiate(self.fourcc, self.width, int(value), self.fps)
+        elif prop == cv2.CAP_PROP_FPS:
+            self._negotiate(self.fourcc, self.width, self.height, value)
+        elif prop == cv2.CAP_PROP_BUFFERSIZE:
+            self.buffer_size = int(value)
+        else:
+            return False
+        return True
+        
+    def get(self, prop: int) -> float:
+        """Report a granted capture property."""
+        if prop == cv2.CAP_PROP_FOURCC:
+            return float(cv2.VideoWriter_fourcc(*self.fourcc))
+        return float({
+            cv2.CAP_PROP_FRAME_WIDTH: self.width,
+            cv2.CAP_PROP_FRAME_HEIGHT: self.height,
+            cv2.CAP_PROP_FPS: self.fps,
+            cv2.CAP_PROP_BUFFERSIZE: self.buffer_size,
+        }.get(prop, 0.0))
+        
+    def getBackendName(self) -> str:
+        """Name of the emulated backend."""
+        return "FAKE"
+        
+    def isOpened(self) -> bool:
+        """Whether the capture is open."""
+        return self.opened
+        
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Return a blank frame at the granted rate."""
+        if not self.opened:
+            return False, None
+        if self.schedule is not None:
+            failure = self.schedule.current()
+            if failure == "error":
+                return False, None
+            if failure == "stall":
+                # A hung driver: the read returns only when the stall ends
+                time.sleep(max(0.0, self.schedule.current_end() - time.perf_counter()))
+        now = time.perf_counter()
+        if self._next_time is None:
+            self._next_time = now
+        time.sleep(max(0.0, self._next_time - now) + self.decode_ms.get(self.fourcc, 0.0) / 1000)
+        self._next_time = max(self._next_time + 1.0 / self.fps, now)
+        return True, np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        
+    def release(self) -> None:
+        """Close the capture."""
+        self.opened = False
+
+class CaptureFailureSchedule:
+    """Capture factory whose FakeVideoCaptures fail at scheduled times.
+    
+    Each window is (start, duration, kind) in seconds from the creation of
+    the schedule. During an "error" window reads fail and new captures do
+    not open, like an unplugged camera; during a "stall" window reads hang
+    until the window ends, like a wedged USB driver.
+    
+    Usage:
+        schedule = CaptureFailureSchedule([(1.0, 0.5, "error"), (3.0, 2.0, "stall")])
+        camera = ResilientCamera(CameraConfig(), capture_factory=schedule)
+    """
+    
+    def __init__(self, windows: List[Tuple[float, float, str]], **capture_args):
+        """Initialize the schedule.
+        
+        Args:
+            windows: Failure windows as (start, duration, kind)
+            **capture_args: Arguments passed to every FakeVideoCapture
+        """
+        for _, _, kind in windows:
+            if kind not in ("error", "stall"):
+                raise ValueError(f"Unknown failure kind: {kind!r}")
+        self.windows = sorted(windows)
+        self.capture_args = capture_args
+        self.start = time.perf_counter()
+        self.opened = 0
+        
+    def _window(self) -> Optional[Tuple[float, float, str]]:
+        """The failure window containing the current time."""
+        elapsed = time.perf_counter() - self.start
+        for window in self.windows:
+            if window[0] <= elapsed < window[0] + window[1]:
+                return window
+        return None
+        
+    def current(self) -> Optional[str]:
+        """Kind of the ongoing failure, None if the camera works."""
+        window = self._window()
+        return window[2] if window else None
+        
+    def current_end(self) -> float:
+        """perf_counter() time at which the ongoing failure ends."""
+        window = self._window()
+        return self.start + window[0] + window[1] if window else time.perf_counter()
+        
+    def __call__(self, camera_id: int = 0) -> FakeVideoCapture:
+        """Open a capture that follows the schedule."""
+        self.opened += 1
+        return FakeVideoCapture(camera_id, schedule=self, **self.capture_args)
@@ -0,0 +1,145 @@
+"""Chrome trace-event export of per-frame pipeline spans."""
+import atexit
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from ..config import TracingConfig
+from ..core.timing import FrameTiming, FrameTimeline
+
+logger = logging.getLogger(__name__)
+
+class TraceRecorder:
+    """Records pipeline stage spans and writes them as Chrome trace JSON.
+    
+    Every stage mark on the timeline becomes a complete ("X") event with
+    the thread it ran on and the frame sequence number, plus one span per
+    frame. Spans are kept in a bounded ring buffer, so only the most recent
+    `buffer_size` spans are written. The buffer is flushed on `flush()`,
+    on the configured signal and at exit. Open the file in Perfetto
+    (ui.perfetto.dev) or chrome://tracing.
+    """
+    
+    def __init__(self, config: TracingConfig):
+        """Initialize the recorder.
+        
+        Args:
+            config: Configuration for tracing
+        """
+        self.config = config
+        self.pid = os.getpid()
+        # (name, start, end, thread id, frame id)
+        self.spans: Deque[Tuple[str, float, float, int, int]] = deque(maxlen=config.buffer_size)
+        self.thread_names: Dict[int, str] = {}
+        self._frame_start: Dict[int, float] = {}
+        self._timeline: Optional[FrameTimeline] = None
+        self._lock = threading.RLock()
+        
+        # Signal and handler replaced by ours, restored by close()
+        self._signal: Optional[int] = None
+        self._previous_handler = None
+        if config.flush_signal and hasattr(signal, config.flush_signal):
+            try:
+                self._previous_handler = signal.signal(getattr(signal, config.flush_signal), self._on_signal)
+                self._signal = getattr(signal, config.flush_signal)
+            except ValueError:
+                # Signal handlers can only be installed from the main thread
+                logger.warning("Cannot install %s handler outside the main thread", config.flush_signal)
+        if config.flush_at_exit:
+            atexit.register(self.flush)
+            
+    def attach(self, timeline: FrameTimeline) -> None:
+        """Start recording spans from a timeline.
+        
+        Args:
+            timeline: Timeline of the pipeline to trace
+        """
+        self._timeline = timeline
+        timeline.stage_listeners.append(self.on_stage)
+        timeline.frame_listeners.append(self.on_frame)
+        
+    def on_stage(self, timing: FrameTiming, stage: str, start: float, end: float) -> None:
+        """Record the span of a finished stage."""
+        tid = threading.get_ident()
+        if tid not in self.thread_names:
+            self.thread_names[tid] = threading.current_thread().name
+        if timing.frame_id not in self._frame_start:
+            if len(self._frame_start) > 256:
+                # Frames that were started but never ended
+                self._frame_start.clear()
+            self._frame_start[timing.frame_id] = start
+        self.spans.append((stage, start, end, tid, timing.frame_id))
+        
+    def on_frame(self, timing: FrameTiming) -> None:
+        """Record the span of a finished frame."""
+        start = self._frame_start.pop(timing.frame_id, None)
+        if start is not None:
+            self.spans.append(("frame", start, max(timing.stages.values()), threading.get_ident(), timing.frame_id))
+            
+    def trace_events(self) -> List[Dict]:
+        """Build the trace events for the buffered spans."""
+        events: List[Dict] = [
+            {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+            for tid, name in self.thread_names.items()
+        ]
+        for name, start, end, tid, frame_id in list(self.spans):
+            events.append({
+                "name": name,
+                "cat": "frame" if name == "frame" else "stage",
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": self.pid,
+                "tid": tid,
+                "args": {"frame": frame_id},
+            })
+        return events
+        
+    def flush(self, path: Optional[str] = None) -> Optional[str]:
+        """Write the buffered spans to a trace file.
+        
+        Args:
+            path: Output file, defaults to `output_path` from the config with
+                {pid} and {time} filled in
+                
+        Returns:
+            Path of the written file, None if there was nothing to write
+        """
+        with self._lock:
+            if not self.spans:
+                return None
+            path = path or self.config.output_path.format(pid=self.pid, time=time.strftime("%Y%m%d-%H%M%S"))
+            trace = {"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(trace, f)
+            os.replace(tmp_path, path)
+        logger.info("Wrote %d spans to %s", len(trace["traceEvents"]), path)
+        return path
+        
+    def _on_signal(self, signum, frame) -> None:
+        """Flush the buffer when the configured signal arrives."""
+        self.flush()
+        
+    def close(self) -> None:
+        """Detach from the timeline and signal, and flush if configured to flush at exit."""
+        if self._signal is not None and signal.getsignal(self._signal) == self._on_signal:
+            # Unless someone installed a handler after ours
+            try:
+                signal.signal(self._signal, self._previous_handler if self._previous_handler is not None
+                              else signal.SIG_DFL)
+            except ValueError:
+                logger.warning("Cannot restore the %s handler outside the main thread", self.config.flush_signal)
+            self._signal = None
+        if self._timeline is not None:
+            self._timeline.stage_listeners.remove(self.on_stage)
+            self._timeline.frame_listeners.remove(self.on_frame)
+            self._timeline = None
+        if self.config.flush_at_exit:
+            atexit.unregister(self.flush)
+            self.flush()
@@ -0,0 +1,32 @@
+"""Example of consuming AirControl gestures through the async event stream."""
+import asyncio
+
+from air_control import AirControl, AirControlConfig
+from air_control.events import GestureEvent, PointerEvent
+
+async def consume(controller: AirControl):
+    async for event in controller.events():
+        if isinstance(event, GestureEvent):
+            state = "pressed" if event.pressed else "released"
+            print(f"[{event.timestamp:.3f}] {event.gesture} {state}")
+        elif isinstance(event, PointerEvent) and event.frame_id % 30 == 0:
+            print(f"[{event.timestamp:.3f}] pointer at ({event.x}, {event.y})")
+
+def main():
+    # Create configuration
+    config = AirControlConfig()
+    
+    # Keep the mouse untouched, only report events
+    config.events.actuate_mouse = False
+    config.events.overflow = "drop_oldest"
+    
+    controller = AirControl(config)
+    try:
+        asyncio.run(consume(controller))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        controller.cleanup()
+
+if __name__ == "__main__":
+    main()
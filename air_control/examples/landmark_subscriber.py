@@ -0,0 +1,27 @@
+"""Example of reading hand landmarks published by another AirControl process.
+
+Start the publisher first, e.g. with `config.publisher.enabled = True`,
+then run this script in a separate terminal.
+"""
+from air_control.ipc import LandmarkSubscriber
+
+def main():
+    subscriber = LandmarkSubscriber()
+    try:
+        while True:
+            record = subscriber.wait(timeout=1.0)
+            if record is None:
+                print("No data from publisher")
+                continue
+            if record.hand_present:
+                # record.landmarks is a (21, 3) view into shared memory
+                index_tip = record.landmarks[8]
+                print(f"frame {record.frame_id}: index tip at {index_tip[0]:.3f}, {index_tip[1]:.3f}"
+                      f"{' (click)' if record.gesture('left_click') else ''}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        subscriber.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Example of the quality governor reacting to a simulated slow tracker.
+
+The synthetic tracker sleeps for a simulated inference time that shrinks
+with the quality level, so the governor can be driven through a degrade
+and recover cycle without a camera: first the tracker is too slow for the
+budget and quality steps down, then it speeds up and quality returns to
+the top level.
+"""
+from air_control import AirControl, AirControlConfig
+from air_control.config import GovernorConfig, HandTrackingConfig, MouseConfig
+from air_control.utils.synthetic import StaticFrameSource
+
+def run_until(controller: AirControl, done, max_frames: int) -> None:
+    """Process frames until done() holds, failing after max_frames."""
+    for _ in range(max_frames):
+        controller.process_frame()
+        if done():
+            return
+    raise AssertionError(f"Governor did not settle within {max_frames} frames")
+
+def main():
+    config = AirControlConfig()
+    config.show_preview = False
+    config.mouse = MouseConfig(backend="null")
+    # 60 ms per frame at full quality, about twice the budget
+    config.hand_tracking = HandTrackingConfig(backend="synthetic", synthetic_latency_ms=60.0)
+    config.governor = GovernorConfig(enabled=True, latency_budget_ms=33.0, degrade_frames=5,
+                                     upgrade_frames=20, cooldown_frames=5)
+    
+    controller = AirControl(config, camera=StaticFrameSource())
+    governor = controller.governor
+    try:
+        # Overloaded: quality steps down until a level fits the budget
+        run_until(controller, lambda: governor.level_index >= 2, 200)
+        assert governor.decisions[0].reason == "over budget" and governor.decisions[0].to_level == 1
+        print(f"Degraded to level {governor.level_index} after {governor.frame} frames")
+        
+        # Load goes away: quality steps back up to the top level
+        controller.hand_tracker.latency_ms = 5.0
+        run_until(controller, lambda: governor.level_index == 0, 500)
+        assert governor.decisions[-1].reason == "under budget" and governor.decisions[-1].to_level == 0
+        print(f"Recovered to level 0 after {governor.frame} frames")
+    finally:
+        controller.cleanup()
+        
+    for decision in governor.decisions:
+        print(f"frame {decision.frame:>4}: {decision.latency_ms:5.1f} ms, "
+              f"level {decision.from_level} -> {decision.to_level} ({decision.reason})")
+
+if __name__ == "__main__":
+    main()
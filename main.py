@@ -9,12 +9,12 @@ Usage:
 """
 
 import argparse
-import json
 import sys
 from typing import Optional
 
 from air_control import AirControl, AirControlConfig
 from air_control.config import MouseConfig, CameraConfig, HandTrackingConfig
+from air_control.config import load_config as load_config_file
 
 
 class HandTrackingMouseController:
@@ -264,31 +264,21 @@ def load_config(config_file: Optional[str] = None) -> AirControlConfig:
     Returns:
         AirControlConfig object
     """
-    config = AirControlConfig()
-    
     if config_file:
         try:
-            with open(config_file, 'r') as f:
-                data = json.load(f)
-                
-            if 'mouse' in data:
-                config.mouse = MouseConfig(**data['mouse'])
-            if 'camera' in data:
-                config.camera = CameraConfig(**data['camera'])
-            if 'hand_tracking' in data:
-                config.hand_tracking = HandTrackingConfig(**data['hand_tracking'])
-                
+            return load_config_file(config_file)
         except Exception as e:
             print(f"Error loading config file: {e}")
             print("Using default configuration")
     
-    return config
+    return AirControlConfig()
 
 def main():
     """Main entry point for the application."""
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='AirControl - Hand Gesture Mouse Control')
     parser.add_argument('--config', type=str, help='Path to configuration file')
+    parser.add_argument('--watch', action='store_true', help='Apply changes to the configuration file while running')
     args = parser.parse_args()
     
     try:
@@ -305,6 +295,8 @@ def main():
         print("- Make a fist: Drag")
         
         controller = AirControl(config)
+        if args.watch and args.config:
+            controller.watch_config(args.config)
         controller.run()
         
     except KeyboardInterrupt: